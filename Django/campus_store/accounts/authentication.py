@@ -33,3 +33,18 @@ class SessionTokenAuthentication(authentication.BaseAuthentication):
 
         request.session["last_token_id"] = session_token.pk
         return (user, session_token)
+
+
+async def aget_token_user(token_value: str | None):
+    """
+    异步视图使用的令牌校验，返回有效令牌对应的 (用户, 令牌)，否则返回 None。
+    """
+    if not token_value:
+        return None
+    try:
+        session_token = await SessionToken.objects.select_related("user").aget(token=token_value, is_active=True)
+    except SessionToken.DoesNotExist:
+        return None
+    if session_token.is_expired or not session_token.user.is_active:
+        return None
+    return session_token.user, session_token
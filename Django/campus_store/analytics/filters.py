@@ -0,0 +1,17 @@
+import django_filters
+
+from .models import MetricSnapshot
+
+
+class MetricSnapshotFilter(django_filters.FilterSet):
+    """
+    `?key=gmv_24h,orders_24h` 选择指标，`?since=&until=` 按采集时间筛选。
+    """
+
+    key = django_filters.BaseInFilter(field_name="key")
+    since = django_filters.IsoDateTimeFilter(field_name="captured_at", lookup_expr="gte")
+    until = django_filters.IsoDateTimeFilter(field_name="captured_at", lookup_expr="lt")
+
+    class Meta:
+        model = MetricSnapshot
+        fields = ["key"]
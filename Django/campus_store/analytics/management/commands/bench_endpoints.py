@@ -0,0 +1,124 @@
+import statistics
+import time
+from urllib.parse import urlsplit
+from wsgiref.util import setup_testing_defaults
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.db.utils import load_backend
+
+from campus_store.accounts.models import SessionToken
+from campus_store.db.pool import all_pools
+
+User = get_user_model()
+
+DEFAULT_PATHS = ["/api/health/", "/api/storefront/products/"]
+POOLED_ENGINE = "campus_store.db.backends.mysql_pooled"
+
+
+class Command(BaseCommand):
+    help = "在进程内依次以每请求新建连接、线程内长连接、连接池三种方式请求接口，对比延迟与新建连接数"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", action="append", default=[], help="请求路径，可重复")
+        parser.add_argument("--requests", type=int, default=200, help="每种方式每个路径的请求数")
+        parser.add_argument("--username", default="", help="以该用户身份请求（默认取第一个有效用户）")
+        parser.add_argument("--pool-size", type=int, default=4)
+
+    def handle(self, *args, **options):
+        paths = options["path"] or DEFAULT_PATHS
+        user = (
+            User.objects.filter(username=options["username"]).first()
+            if options["username"]
+            else User.objects.filter(is_active=True).order_by("pk").first()
+        )
+        if user is None:
+            raise CommandError("没有可用于请求的用户，请先创建用户或指定 --username")
+        token = SessionToken.issue(user, user_agent="bench_endpoints")
+        handler = WSGIHandler()
+
+        original = connections[DEFAULT_DB_ALIAS].settings_dict
+        modes = [
+            ("每请求新建", {"CONN_MAX_AGE": 0}),
+            ("长连接", {"CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": True}),
+        ]
+        if connections[DEFAULT_DB_ALIAS].vendor == "mysql":
+            modes.append(
+                ("连接池", {"ENGINE": POOLED_ENGINE, "CONN_MAX_AGE": 0, "POOL": {"SIZE": options["pool_size"]}})
+            )
+        else:
+            self.stdout.write("当前不是 MySQL，跳过连接池对比")
+
+        opened = []
+
+        def counter(sender, connection, **kwargs):
+            opened.append(connection.alias)
+
+        connection_created.connect(counter)
+        results = []
+        try:
+            for label, overrides in modes:
+                self._swap_connection({**original, **overrides})
+                for path in paths:
+                    self._request(handler, path, token.token)  # 预热：建立首个连接并填充各类缓存
+                    opened.clear()
+                    start = self._opened(opened)
+                    latencies = []
+                    for _ in range(options["requests"]):
+                        started = time.perf_counter()
+                        status = self._request(handler, path, token.token)
+                        latencies.append(time.perf_counter() - started)
+                        if not status.startswith("200"):
+                            raise CommandError(f"{label} {path} 返回 {status}")
+                    results.append((label, path, latencies, self._opened(opened) - start))
+        finally:
+            connection_created.disconnect(counter)
+            self._swap_connection(original)
+            for pool in all_pools():
+                pool.close_all()
+            token.delete()
+
+        self.stdout.write(f"{'方式':<8}{'路径':<30}{'p50(ms)':>10}{'p95(ms)':>10}{'新建连接':>10}{'p50 降低':>10}")
+        baselines = {}
+        for label, path, latencies, connects in results:
+            p50 = statistics.median(latencies)
+            p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else p50
+            baseline = baselines.setdefault(path, p50)
+            self.stdout.write(
+                f"{label:<8}{path:<30}{p50 * 1000:>10.2f}{p95 * 1000:>10.2f}{connects:>10}"
+                f"{(1 - p50 / baseline) * 100:>9.0f}%"
+            )
+
+    def _opened(self, signalled):
+        # 连接池每次取用都会触发 connection_created，真正新建的连接数以池的统计为准
+        pool = getattr(connections[DEFAULT_DB_ALIAS], "pool", None)
+        return pool.opened if pool is not None else len(signalled)
+
+    def _request(self, handler, path, token):
+        """
+        直接调用 WSGI 入口而非测试客户端：测试客户端会屏蔽请求结束时的连接回收，测不出差别。
+        """
+        parts = urlsplit(path)
+        environ = {
+            "PATH_INFO": parts.path,
+            "QUERY_STRING": parts.query,
+            "HTTP_HOST": "localhost",
+            "HTTP_X_SESSION_TOKEN": token,
+        }
+        setup_testing_defaults(environ)
+        statuses = []
+        body = handler(environ, lambda status, headers, exc_info=None: statuses.append(status))
+        try:
+            for _ in body:
+                pass
+        finally:
+            body.close()
+        return statuses[0]
+
+    def _swap_connection(self, settings_dict):
+        connections[DEFAULT_DB_ALIAS].close()
+        backend = load_backend(settings_dict["ENGINE"])
+        connections[DEFAULT_DB_ALIAS] = backend.DatabaseWrapper(settings_dict, DEFAULT_DB_ALIAS)
@@ -0,0 +1,62 @@
+import statistics
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import resolve
+
+from campus_store import metrics
+from campus_store.db import querystats
+from campus_store.db.middleware import query_stats_middleware
+
+
+class Command(BaseCommand):
+    help = "测量指标与查询统计中间件每个请求增加的耗时（进程内与 mmap 目录两种存储），超出预算时报错"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20000, help="每轮模拟的请求数")
+        parser.add_argument("--rounds", type=int, default=5, help="取各轮中位数")
+        parser.add_argument("--budget-us", type=float, default=50, help="每请求允许增加的微秒数")
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get("/api/storefront/products/", HTTP_HOST="localhost")
+        request.resolver_match = resolve("/api/storefront/products/")
+        response = HttpResponse(b"{}", content_type="application/json")
+
+        def view(request):
+            return response
+
+        chain = metrics.metrics_middleware(query_stats_middleware(view))
+        rows = []
+        with tempfile.TemporaryDirectory() as directory:
+            for label, metrics_dir in [("进程内", ""), ("mmap 目录", directory)]:
+                # 按开启 Server-Timing 的情况计，超预算日志同样属于查询统计的正常开销，一并计入
+                with override_settings(METRICS_DIR=metrics_dir, QUERY_STATS_SERVER_TIMING=True):
+                    metrics._store_pid = None
+                    overhead = self._measure(view, chain, request, options["requests"], options["rounds"])
+                rows.append((label, overhead))
+            metrics._store_pid = None
+        querystats.reset()
+
+        budget = options["budget_us"]
+        for label, overhead in rows:
+            self.stdout.write(f"{label}：每请求增加 {overhead:.1f}µs（预算 {budget:.0f}µs）")
+        if any(overhead > budget for _, overhead in rows):
+            raise CommandError("指标中间件开销超出预算")
+        self.stdout.write(self.style.SUCCESS("指标开销在预算内"))
+
+    def _measure(self, view, chain, request, count, rounds):
+        samples = []
+        for _ in range(rounds):
+            baseline = self._time(view, request, count)
+            instrumented = self._time(chain, request, count)
+            samples.append((instrumented - baseline) / count * 1_000_000)
+        return statistics.median(samples)
+
+    def _time(self, handler, request, count):
+        started = time.perf_counter()
+        for _ in range(count):
+            handler(request)
+        return time.perf_counter() - started
@@ -0,0 +1,45 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections
+from django.utils import timezone
+
+from campus_store.analytics.snapshots import capture_snapshots, prune_snapshots
+
+
+class Command(BaseCommand):
+    help = "采集成交额、订单数、在售商品、新增定制、钱包余额、活跃会话等指标并写入 MetricSnapshot（需定时或常驻运行）"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="按 --interval 持续采集")
+        parser.add_argument("--interval", type=float, default=300.0, help="采集间隔（秒）")
+        parser.add_argument("--window-hours", type=float, default=24.0, help="滚动窗口类指标统计的小时数")
+        parser.add_argument("--retention-days", type=int, default=0, help="删除早于该天数的快照，0 表示不清理")
+
+    def handle(self, *args, **options):
+        window = timedelta(hours=options["window_hours"])
+        while True:
+            started = time.perf_counter()
+            try:
+                self.capture(window, options["retention_days"])
+            except DatabaseError as exc:
+                if not options["loop"]:
+                    raise
+                # 常驻时数据库短暂不可用只跳过本轮；关闭失效连接，下一轮重新连接
+                self.stderr.write(f"采集失败，{options['interval']:.0f}s 后重试：{exc}")
+                close_old_connections()
+            if not options["loop"]:
+                break
+            time.sleep(max(options["interval"] - (time.perf_counter() - started), 0))
+
+    def capture(self, window, retention_days):
+        started = time.perf_counter()
+        now = timezone.now()
+        snapshots = capture_snapshots(now, window)
+        pruned = prune_snapshots(now - timedelta(days=retention_days)) if retention_days else 0
+        elapsed = time.perf_counter() - started
+        summary = "，".join(f"{item.key}={item.value}" for item in snapshots)
+        self.stdout.write(
+            f"{now:%Y-%m-%d %H:%M:%S} 写入 {len(snapshots)} 条快照（{summary}），清理 {pruned} 条，耗时 {elapsed:.2f}s"
+        )
@@ -0,0 +1,195 @@
+import asyncio
+import ssl
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = [
+    "/api/health/",
+    "/api/storefront/stores/",
+    "/api/storefront/products/",
+    "/api/focus/videos/feed/",
+]
+
+
+class ConnectionClosed(Exception):
+    pass
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class KeepAliveClient:
+    """
+    最小的 HTTP/1.1 长连接客户端，只发 GET、读完整个响应体，供压测时复用连接。
+    """
+
+    def __init__(self, base_url, headers, timeout):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise CommandError(f"无效的目标地址：{base_url}")
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.prefix = parts.path.rstrip("/")
+        self.headers = {"Host": parts.netloc, "Connection": "keep-alive", "Accept": "application/json", **headers}
+        self.timeout = timeout
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+        self.reader = self.writer = None
+
+    async def get(self, path):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        lines = [f"GET {self.prefix}{path} HTTP/1.1"] + [f"{name}: {value}" for name, value in self.headers.items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await self.writer.drain()
+        return await asyncio.wait_for(self._read_response(), self.timeout)
+
+    async def _read_response(self):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionClosed
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        size = 0
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                chunk_size = int((await self.reader.readline()).split(b";")[0], 16)
+                await self.reader.readexactly(chunk_size + 2)
+                size += chunk_size
+                if chunk_size == 0:
+                    break
+        elif "content-length" in headers:
+            size = int(headers["content-length"])
+            await self.reader.readexactly(size)
+        else:
+            size = len(await self.reader.read())
+            await self.close()
+            return status, size
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, size
+
+
+class Command(BaseCommand):
+    help = "对一个或多个已启动的服务（如 WSGI 与 ASGI 部署）压测只读接口，对比吞吐与延迟分位数"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            action="append",
+            default=[],
+            help="名称=地址，可重复，如 wsgi=http://127.0.0.1:8000 asgi=http://127.0.0.1:8001",
+        )
+        parser.add_argument("--path", action="append", default=[], help="请求路径，可重复，按顺序轮流请求")
+        parser.add_argument("--concurrency", type=int, default=50, help="并发连接数")
+        parser.add_argument("--duration", type=float, default=10, help="每个目标的压测秒数")
+        parser.add_argument("--warmup", type=float, default=1, help="正式计时前的预热秒数")
+        parser.add_argument("--timeout", type=float, default=10, help="单个请求超时秒数")
+        parser.add_argument("--token", default="", help="以该会话令牌访问（X-SESSION-TOKEN）")
+
+    def handle(self, *args, **options):
+        targets = [self._parse_target(value) for value in options["target"]] or [("local", "http://127.0.0.1:8000")]
+        paths = options["path"] or DEFAULT_PATHS
+        headers = {"X-SESSION-TOKEN": options["token"]} if options["token"] else {}
+        reports = []
+        for label, base_url in targets:
+            self.stdout.write(
+                f"压测 {label}（{base_url}），{options['concurrency']} 并发，{options['duration']:.0f}s ..."
+            )
+            if options["warmup"] > 0:
+                asyncio.run(self._run(base_url, paths, headers, options, options["warmup"]))
+            reports.append((label, asyncio.run(self._run(base_url, paths, headers, options, options["duration"]))))
+
+        self.stdout.write(
+            f"{'目标':<10}{'路径':<32}{'请求数':>8}{'吞吐(次/秒)':>12}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'错误':>6}"
+        )
+        for label, report in reports:
+            for path in [*paths, "全部"]:
+                latencies = report["latencies"][path]
+                self.stdout.write(
+                    f"{label:<10}{path:<32}{len(latencies):>8}{len(latencies) / report['elapsed']:>12.1f}"
+                    f"{percentile(latencies, 0.5) * 1000:>10.1f}{percentile(latencies, 0.95) * 1000:>10.1f}"
+                    f"{percentile(latencies, 0.99) * 1000:>10.1f}{report['errors'][path]:>6}"
+                )
+            if report["statuses"]:
+                summary = "，".join(f"{status}: {count}" for status, count in sorted(report["statuses"].items()))
+                self.stdout.write(f"{label} 状态码分布：{summary}")
+            for error, count in report["exceptions"].most_common(3):
+                self.stderr.write(f"{label} 异常 {count} 次：{error}")
+
+    def _parse_target(self, value):
+        label, sep, base_url = value.partition("=")
+        if not sep:
+            label, base_url = urlsplit(value).netloc, value
+        return label, base_url
+
+    async def _run(self, base_url, paths, headers, options, duration):
+        latencies = defaultdict(list)
+        errors = Counter()
+        statuses = Counter()
+        exceptions = Counter()
+        deadline = time.perf_counter() + duration
+
+        async def worker(index):
+            client = KeepAliveClient(base_url, headers, options["timeout"])
+            step = index
+            try:
+                while time.perf_counter() < deadline:
+                    path = paths[step % len(paths)]
+                    step += 1
+                    started = time.perf_counter()
+                    try:
+                        status, _ = await client.get(path)
+                    except (
+                        OSError,
+                        asyncio.IncompleteReadError,
+                        asyncio.TimeoutError,
+                        ConnectionClosed,
+                        ValueError,
+                    ) as exc:
+                        exceptions[type(exc).__name__] += 1
+                        errors[path] += 1
+                        errors["全部"] += 1
+                        await client.close()
+                        continue
+                    elapsed = time.perf_counter() - started
+                    statuses[status] += 1
+                    if status >= 300:
+                        errors[path] += 1
+                        errors["全部"] += 1
+                        continue
+                    latencies[path].append(elapsed)
+                    latencies["全部"].append(elapsed)
+            finally:
+                await client.close()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(index) for index in range(max(options["concurrency"], 1))))
+        return {
+            "latencies": latencies,
+            "errors": errors,
+            "statuses": statuses,
+            "exceptions": exceptions,
+            "elapsed": time.perf_counter() - started,
+        }
@@ -0,0 +1,14 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="metricsnapshot",
+            index=models.Index(fields=["key", "captured_at"], name="analytics_metric_key_time_idx"),
+        ),
+    ]
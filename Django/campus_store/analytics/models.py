@@ -9,6 +9,7 @@ class MetricSnapshot(models.Model):
 
     class Meta:
         ordering = ["-captured_at"]
+        indexes = [models.Index(fields=["key", "captured_at"], name="analytics_metric_key_time_idx")]
 
     def __str__(self):
         return f"{self.key} @ {self.captured_at:%Y-%m-%d}"
@@ -0,0 +1,75 @@
+"""
+运营概览：近 7 天销售额、订单数、定制请求与在售商品数。商家只统计自己的数据，管理员看全站。
+结果按商家缓存一小段时间，订单、定制请求、商品写入时删除对应商家与全站的缓存。
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import DecimalField, F, Func, IntegerField, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from campus_store.catalog.models import Product
+from campus_store.commerce.models import Order
+from campus_store.customization.models import WishRequest
+from campus_store.metrics import observe_cache
+
+OVERVIEW_CACHE_KEY = "analytics:overview:v1:{scope}"
+# 7 天窗口随时间滑动，写入之外的变化靠过期时间跟上
+OVERVIEW_TTL = 60
+OVERVIEW_WINDOW = timedelta(days=7)
+OVERVIEW_FIELDS = ("sales_last_7_days", "orders_last_7_days", "custom_requests_last_7_days", "active_products")
+
+User = get_user_model()
+
+
+def _cache_key(merchant_id: int | None) -> str:
+    return OVERVIEW_CACHE_KEY.format(scope="all" if merchant_id is None else merchant_id)
+
+
+def _scalar(queryset, function: str, field: str, output_field):
+    # 聚合函数写成普通 Func，子查询不带 GROUP BY，过滤后的整张表聚合为一行
+    total = Func(F(field), function=function, output_field=output_field)
+    return Coalesce(Subquery(queryset.order_by().values(total=total)), 0, output_field=output_field)
+
+
+def build_overview(merchant_id: int | None = None) -> dict:
+    """
+    四个指标作为标量子查询合并为一条 SELECT，merchant_id 为空时统计全站。
+    结果会写入缓存，和分类导航一样从主库读取，避免失效后又用滞后的副本数据回填。
+    """
+    since = timezone.now() - OVERVIEW_WINDOW
+    scope = {} if merchant_id is None else {"merchant_id": merchant_id}
+    orders = Order.objects.using(DEFAULT_DB_ALIAS).filter(created_at__gte=since, **scope)
+    wishes = WishRequest.objects.using(DEFAULT_DB_ALIAS).filter(created_at__gte=since, **scope)
+    products = Product.objects.using(DEFAULT_DB_ALIAS).filter(is_active=True, **scope)
+    # 外层只是承载子查询的一行；能发起请求说明用户表非空
+    overview = (
+        User.objects.using(DEFAULT_DB_ALIAS)
+        .order_by()
+        .annotate(
+            sales_last_7_days=_scalar(orders, "SUM", "total_amount", DecimalField(max_digits=12, decimal_places=2)),
+            orders_last_7_days=_scalar(orders, "COUNT", "id", IntegerField()),
+            custom_requests_last_7_days=_scalar(wishes, "COUNT", "id", IntegerField()),
+            active_products=_scalar(products, "COUNT", "id", IntegerField()),
+        )
+        .values(*OVERVIEW_FIELDS)
+        .first()
+    ) or dict.fromkeys(OVERVIEW_FIELDS, 0)
+    cache.set(_cache_key(merchant_id), overview, OVERVIEW_TTL)
+    return overview
+
+
+def get_overview(merchant_id: int | None = None) -> dict:
+    overview = cache.get(_cache_key(merchant_id))
+    observe_cache("analytics_overview", overview is not None)
+    if overview is None:
+        overview = build_overview(merchant_id)
+    return overview
+
+
+def invalidate_overview(*merchant_ids) -> None:
+    cache.delete_many([_cache_key(None), *(_cache_key(merchant_id) for merchant_id in merchant_ids if merchant_id)])
@@ -7,3 +7,14 @@ class MetricSerializer(serializers.ModelSerializer):
     class Meta:
         model = MetricSnapshot
         fields = ["id", "key", "value", "captured_at", "metadata"]
+
+
+class MetricBucketSerializer(serializers.Serializer):
+    """
+    降采样后的一个时间桶：captured_at 为桶起点，value 为桶内聚合值。
+    """
+
+    key = serializers.CharField()
+    captured_at = serializers.DateTimeField()
+    value = serializers.DecimalField(max_digits=12, decimal_places=2)
+    samples = serializers.IntegerField()
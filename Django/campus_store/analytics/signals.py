@@ -0,0 +1,36 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from campus_store.catalog.models import Product
+from campus_store.commerce.models import Order
+from campus_store.customization.models import WishRequest
+from campus_store.customization.signals import wishes_claimed
+
+from .overview import invalidate_overview
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+@receiver(post_save, sender=WishRequest)
+@receiver(post_delete, sender=WishRequest)
+def overview_source_changed(sender, instance, **kwargs):
+    invalidate_overview(instance.merchant_id)
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, update_fields=None, **kwargs):
+    # 库存、价格等更新不影响在售商品数
+    if update_fields is None or Product.LISTING_FIELDS.intersection(
+        {sender._meta.get_field(name).attname for name in update_fields}
+    ):
+        invalidate_overview(instance.merchant_id)
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    invalidate_overview(instance.merchant_id)
+
+
+@receiver(wishes_claimed)
+def wishes_claimed_by_merchant(sender, merchant, **kwargs):
+    invalidate_overview(merchant.pk)
@@ -0,0 +1,63 @@
+"""
+业务指标快照：capture_metrics 定时采集，看板读取 MetricSnapshot 而不是直接统计交易表。
+滚动窗口类指标（如 gmv_24h）统计采集时刻之前 window 内的数据，其余为采集时刻的存量。
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from campus_store.accounts.models import SessionToken
+from campus_store.catalog.models import Product
+from campus_store.commerce.models import Order
+from campus_store.customization.models import WishRequest
+from campus_store.wallet.models import Wallet
+
+from .models import MetricSnapshot
+
+METRIC_KEYS = {
+    "gmv_24h": "近 24 小时成交额（不含已取消订单）",
+    "orders_24h": "近 24 小时下单数",
+    "active_products": "在售商品数",
+    "new_wishes_24h": "近 24 小时新增定制请求",
+    "wallet_float": "钱包余额合计",
+    "active_sessions": "未过期的登录会话数",
+}
+
+
+def collect_metrics(now=None, window: timedelta = timedelta(hours=24)) -> dict[str, Decimal]:
+    """
+    每类数据一条聚合查询，返回 {指标: 数值}。
+    """
+    now = now or timezone.now()
+    since = now - window
+    orders = Order.objects.filter(created_at__gte=since, created_at__lt=now).aggregate(
+        gmv=Sum("total_amount", filter=~Q(status=Order.Status.CANCELLED)),
+        count=Count("id"),
+    )
+    return {
+        "gmv_24h": orders["gmv"] or Decimal("0"),
+        "orders_24h": Decimal(orders["count"]),
+        "active_products": Decimal(Product.objects.filter(is_active=True).count()),
+        "new_wishes_24h": Decimal(WishRequest.objects.filter(created_at__gte=since, created_at__lt=now).count()),
+        "wallet_float": Wallet.objects.aggregate(total=Sum("balance"))["total"] or Decimal("0"),
+        "active_sessions": Decimal(SessionToken.objects.filter(is_active=True, expires_at__gt=now).count()),
+    }
+
+
+def capture_snapshots(now=None, window: timedelta = timedelta(hours=24)) -> list[MetricSnapshot]:
+    now = now or timezone.now()
+    metadata = {"window_hours": window.total_seconds() / 3600}
+    return MetricSnapshot.objects.bulk_create(
+        [
+            MetricSnapshot(key=key, value=value, captured_at=now, metadata=metadata)
+            for key, value in collect_metrics(now, window).items()
+        ]
+    )
+
+
+def prune_snapshots(before) -> int:
+    deleted, _ = MetricSnapshot.objects.filter(captured_at__lt=before).delete()
+    return deleted
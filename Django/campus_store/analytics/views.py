@@ -1,55 +1,98 @@
-from datetime import datetime, timedelta
+import os
+from datetime import datetime, timedelta, timezone as dt_timezone
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Count, Sum
+from django.db.models import Avg, Count, DecimalField, Max, Min, Sum
+from django.db.models.functions import Trunc
+from django.http import HttpResponse
 from django.utils import timezone
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from campus_store import metrics
 from campus_store.accounts.permissions import RolePermission
 from campus_store.accounts.models import LoginLog, SessionToken
 from campus_store.catalog.models import Product
 from campus_store.commerce.models import Order
-from campus_store.customization.models import WishRequest
+from campus_store.db import querystats
+from campus_store.db.mixins import QueryBudgetMixin, ReplicaReadMixin
 from campus_store.community.models import Comment
 from campus_store.wallet.models import WalletTransaction
 
+from .filters import MetricSnapshotFilter
+from .overview import get_overview
 from .models import MetricSnapshot
-from .serializers import MetricSerializer
+from .serializers import MetricBucketSerializer, MetricSerializer
 
 User = get_user_model()
 
 
-class MetricViewSet(viewsets.ReadOnlyModelViewSet):
+class MetricPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+METRIC_BUCKETS = ("hour", "day", "week")
+METRIC_AGGREGATES = {"avg": Avg, "max": Max, "min": Min}
+
+
+class MetricViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    `?bucket=hour|day|week` 时按指标与时间桶降采样（`?agg=avg|max|min`，默认 avg），按时间正序返回。
+    时间桶按 UTC 划分：按 TIME_ZONE 截断在 MySQL 上会生成 CONVERT_TZ，服务器未导入时区表时结果为 NULL。
+    """
+
     queryset = MetricSnapshot.objects.all()
     serializer_class = MetricSerializer
     permission_classes = [RolePermission]
     allowed_roles = [User.Role.ADMIN]
+    filterset_class = MetricSnapshotFilter
+    pagination_class = MetricPagination
+
+    def list(self, request, *args, **kwargs):
+        bucket = request.query_params.get("bucket")
+        if not bucket:
+            return super().list(request, *args, **kwargs)
+        aggregate = METRIC_AGGREGATES.get(request.query_params.get("agg", "avg"))
+        if bucket not in METRIC_BUCKETS or aggregate is None:
+            raise ValidationError({"detail": "bucket 仅支持 hour/day/week，agg 仅支持 avg/max/min"})
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .order_by()
+            .annotate(bucket_start=Trunc("captured_at", bucket, tzinfo=dt_timezone.utc))
+            .values("key", "bucket_start")
+            .annotate(
+                value=aggregate("value", output_field=DecimalField(max_digits=12, decimal_places=2)),
+                samples=Count("id"),
+            )
+            .order_by("key", "bucket_start")
+        )
+        rows = [
+            {"key": row["key"], "captured_at": row["bucket_start"], "value": row["value"], "samples": row["samples"]}
+            for row in self.paginate_queryset(queryset)
+        ]
+        return self.get_paginated_response(MetricBucketSerializer(rows, many=True).data)
 
 
 class AnalyticsOverviewView(APIView):
+    """
+    商家只看到自己的订单、定制请求与商品，管理员看到全站；结果由 overview 模块缓存并从主库计算。
+    """
+
     permission_classes = [RolePermission]
     allowed_roles = [User.Role.ADMIN, User.Role.MERCHANT]
 
     def get(self, request):
-        now = timezone.now()
-        week_ago = now - timedelta(days=7)
-        orders = Order.objects.filter(created_at__gte=week_ago)
-        sales = orders.aggregate(total=Sum("total_amount")).get("total") or 0
-        order_count = orders.count()
-        new_custom_requests = WishRequest.objects.filter(created_at__gte=week_ago).count()
-        active_products = Product.objects.filter(is_active=True).count()
-        payload = {
-            "sales_last_7_days": sales,
-            "orders_last_7_days": order_count,
-            "custom_requests_last_7_days": new_custom_requests,
-            "active_products": active_products,
-        }
-        return Response(payload)
+        merchant_id = None if request.user.role == User.Role.ADMIN else request.user.pk
+        return Response(get_overview(merchant_id))
 
 
-class CommerceInsightsView(APIView):
+class CommerceInsightsView(ReplicaReadMixin, APIView):
     permission_classes = [RolePermission]
     allowed_roles = [User.Role.ADMIN]
 
@@ -111,7 +154,7 @@ class CommerceInsightsView(APIView):
         return Response(payload)
 
 
-class UserStatsView(APIView):
+class UserStatsView(QueryBudgetMixin, ReplicaReadMixin, APIView):
     permission_classes = [RolePermission]
     allowed_roles = [User.Role.ADMIN]
 
@@ -137,7 +180,7 @@ class UserStatsView(APIView):
         return Response(data)
 
 
-class UserLogsView(APIView):
+class UserLogsView(ReplicaReadMixin, APIView):
     permission_classes = [RolePermission]
     allowed_roles = [User.Role.ADMIN]
 
@@ -164,3 +207,37 @@ class UserLogsView(APIView):
                 "sessions": list(sessions),
             }
         )
+
+
+class QueryStatsView(APIView):
+    """
+    本进程内各接口的查询数与数据库耗时直方图；DELETE 清空统计。
+    """
+
+    permission_classes = [RolePermission]
+    allowed_roles = [User.Role.ADMIN]
+
+    def get(self, request):
+        return Response(
+            {
+                "pid": os.getpid(),
+                "budget": {"queries": settings.QUERY_BUDGET, "db_ms": settings.QUERY_TIME_BUDGET_MS},
+                "endpoints": querystats.snapshot(),
+            }
+        )
+
+    def delete(self, request):
+        querystats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class PrometheusMetricsView(APIView):
+    """
+    Prometheus 文本格式的请求、查询与缓存指标（多进程部署需配置 METRICS_DIR 才能看到所有 worker）。
+    """
+
+    permission_classes = [RolePermission]
+    allowed_roles = [User.Role.ADMIN]
+
+    def get(self, request):
+        return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
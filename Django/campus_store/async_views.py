@@ -0,0 +1,101 @@
+"""
+只读热点接口的异步版本，设置 DJANGO_ASYNC_VIEWS=1 并以 ASGI 运行时由 urls.py 启用。
+
+沿用现有视图集的查询、过滤、权限、分页与序列化逻辑，只把令牌校验和数据库读取换成异步 ORM，
+等待数据库与客户端时不占用工作线程。序列化器必须只读取已加载的数据（select_related / prefetch）。
+"""
+
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.paginator import InvalidPage
+from rest_framework.exceptions import NotAuthenticated, NotFound, PermissionDenied
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from campus_store.accounts.authentication import SessionTokenAuthentication, aget_token_user
+from campus_store.db.mixins import ReplicaReadMixin
+from campus_store.db.querystats import label_request
+from campus_store.db.routers import replica_aliases, replica_for, reset_read_alias, set_read_alias
+
+
+async def aauthenticate(request):
+    token_value = request.META.get(SessionTokenAuthentication.header_name) or request.COOKIES.get(
+        SessionTokenAuthentication.cookie_name
+    )
+    return await aget_token_user(token_value) or (AnonymousUser(), None)
+
+
+async def apaginate(view, queryset) -> list:
+    """
+    与视图的 PageNumberPagination 行为一致，计数与取数走异步 ORM；之后可直接调用 view.get_paginated_response。
+    """
+    paginator = view.paginator
+    if paginator is None:
+        return [obj async for obj in queryset]
+    request = view.request
+    django_paginator = paginator.django_paginator_class(queryset, paginator.get_page_size(request))
+    # Paginator.count 是 cached_property，预先填入异步计数，page() 不会再同步查询
+    django_paginator.count = await queryset.acount()
+    page_number = paginator.get_page_number(request, django_paginator)
+    try:
+        page = django_paginator.page(page_number)
+    except InvalidPage as exc:
+        raise NotFound(paginator.invalid_page_message.format(page_number=page_number, message=str(exc)))
+    page.object_list = [obj async for obj in page.object_list]
+    paginator.page = page
+    paginator.request = request
+    return page.object_list
+
+
+def async_action(viewset_class, action: str):
+    """
+    把 handler(view, request, *args, **kwargs) 包装为异步 Django 视图：构造视图集实例、异步认证、
+    同步校验权限（不访问数据库），异常交给视图集原有的异常处理。
+    """
+
+    def decorator(handler):
+        @wraps(handler)
+        async def view_func(request, *args, **kwargs):
+            drf_request = Request(request, authenticators=[])
+            view = viewset_class(action=action, request=drf_request, format_kwarg=None, args=args, kwargs=kwargs)
+            view.headers = view.default_response_headers
+            label_request(request, view)
+            try:
+                drf_request.user, drf_request.auth = await aauthenticate(request)
+                try:
+                    view.check_permissions(drf_request)
+                except PermissionDenied:
+                    # 未挂认证类时 DRF 只会抛 PermissionDenied，这里还原为与同步视图一致的未登录错误
+                    if not drf_request.user.is_authenticated:
+                        raise NotAuthenticated
+                    raise
+                if isinstance(view, ReplicaReadMixin) and replica_aliases():
+                    view.read_alias = await sync_to_async(replica_for)(drf_request)
+                # 异步 ORM 在线程中执行查询时会带上当前上下文，读查询同样按选定的副本路由
+                token = set_read_alias(getattr(view, "read_alias", None))
+                try:
+                    response = await handler(view, drf_request, *args, **kwargs)
+                finally:
+                    reset_read_alias(token)
+            except Exception as exc:  # noqa: BLE001
+                response = view.handle_exception(exc)
+            return view.finalize_response(drf_request, response, *args, **kwargs).render()
+
+        return view_func
+
+    return decorator
+
+
+async def list_handler(view, request):
+    queryset = view.filter_queryset(view.get_queryset())
+    page = await apaginate(view, queryset)
+    data = view.get_serializer(page, many=True).data
+    if view.paginator is None:
+        return Response(data)
+    return view.get_paginated_response(data)
+
+
+def async_list_view(viewset_class):
+    return async_action(viewset_class, "list")(list_handler)
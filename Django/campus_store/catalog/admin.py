@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Category, InventoryLog, Product
+from .models import Category, InventoryLog, Product, Tag
 
 
 @admin.register(Category)
@@ -20,3 +20,9 @@ class ProductAdmin(admin.ModelAdmin):
 class InventoryLogAdmin(admin.ModelAdmin):
     list_display = ("product", "change", "created_at", "created_by")
     search_fields = ("product__title",)
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ("name", "created_at")
+    search_fields = ("name",)
@@ -5,3 +5,6 @@ class CatalogConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "campus_store.catalog"
     label = "catalog"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,19 @@
+from rest_framework.filters import BaseFilterBackend
+
+from .tags import filter_by_tags
+
+
+class ProductTagFilter(BaseFilterBackend):
+    """
+    `?tags=a,b` 按标签索引筛选商品；`tags_mode=any` 为任一匹配，默认需全部匹配。
+    """
+
+    tags_param = "tags"
+    mode_param = "tags_mode"
+
+    def filter_queryset(self, request, queryset, view):
+        raw = request.query_params.get(self.tags_param, "")
+        if not raw.strip():
+            return queryset
+        match_all = request.query_params.get(self.mode_param, "all").lower() != "any"
+        return filter_by_tags(queryset, raw.split(","), match_all=match_all)
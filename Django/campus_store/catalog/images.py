@@ -0,0 +1,132 @@
+"""
+商品主图处理：原图按内容哈希存储一次，并派生固定宽度的 WebP/JPEG 版本。
+"""
+
+import base64
+import binascii
+import hashlib
+import io
+import re
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+HERO_IMAGE_DIR = "catalog/hero"
+RENDITION_WIDTHS = (320, 640, 1280)
+RENDITION_FORMATS = {
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+PRIMARY_RENDITION = ("jpeg", 640)
+MAX_HERO_IMAGE_BYTES = 10 * 1024 * 1024
+DATA_URL_PATTERN = re.compile(r"^data:(?P<mime>[\w/+.-]+);base64,(?P<data>.+)$", re.S)
+ORIGINAL_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp", "GIF": "gif", "BMP": "bmp"}
+
+
+def decode_data_url(data_url: str) -> bytes:
+    match = DATA_URL_PATTERN.match(data_url or "")
+    if not match:
+        raise ValueError("invalid data url")
+    try:
+        content = base64.b64decode(match.group("data"), validate=True)
+    except binascii.Error as exc:
+        raise ValueError("invalid base64") from exc
+    if len(content) > MAX_HERO_IMAGE_BYTES:
+        raise ValueError("image too large")
+    return content
+
+
+def open_image(content: bytes) -> Image.Image:
+    try:
+        image = Image.open(io.BytesIO(content))
+        image.load()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as exc:
+        raise ValueError("invalid image") from exc
+    return image
+
+
+def _rendition_widths(original_width: int) -> list[int]:
+    widths = sorted({min(width, original_width) for width in RENDITION_WIDTHS})
+    return widths or [original_width]
+
+
+def _save_once(name: str, payload: bytes) -> str:
+    if default_storage.exists(name):
+        return name
+    return default_storage.save(name, ContentFile(payload))
+
+
+def store_hero_image(content: bytes) -> dict:
+    """
+    保存原图并生成各尺寸版本，返回需要写回 Product 的字段。
+    文件路径由内容哈希决定，因此同一张图只会处理一次，且可长期缓存。
+    """
+    if len(content) > MAX_HERO_IMAGE_BYTES:
+        raise ValueError("image too large")
+    image = open_image(content)
+    key = hashlib.sha256(content).hexdigest()
+    base = f"{HERO_IMAGE_DIR}/{key[:2]}/{key}"
+    extension = ORIGINAL_EXTENSIONS.get(image.format or "", "bin")
+
+    renditions = {"original": _save_once(f"{base}/original.{extension}", content)}
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    for width in _rendition_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.Resampling.LANCZOS) if width != image.width else image
+        for label, (pil_format, suffix, options) in RENDITION_FORMATS.items():
+            frame = resized.convert("RGB") if pil_format == "JPEG" else resized
+            buffer = io.BytesIO()
+            frame.save(buffer, format=pil_format, **options)
+            name = _save_once(f"{base}/w{width}.{suffix}", buffer.getvalue())
+            renditions.setdefault(label, {})[str(width)] = name
+
+    return {"hero_image": "", "hero_image_key": key, "hero_renditions": renditions}
+
+
+def is_rendition_url(value: str) -> bool:
+    return f"{settings.MEDIA_URL}{HERO_IMAGE_DIR}/" in (value or "")
+
+
+def hero_image_fields(value: str) -> dict | None:
+    """
+    将前端提交的 hero_image 转换为模型字段；返回 None 表示保持不变。
+    """
+    value = (value or "").strip()
+    if is_rendition_url(value):
+        return None
+    if value.startswith("data:"):
+        return store_hero_image(decode_data_url(value))
+    return {"hero_image": value, "hero_image_key": "", "hero_renditions": {}}
+
+
+def _absolute(url: str, request=None) -> str:
+    return request.build_absolute_uri(url) if request else url
+
+
+def rendition_urls(product, request=None) -> dict:
+    renditions = product.hero_renditions or {}
+    return {
+        label: {width: _absolute(default_storage.url(name), request) for width, name in sizes.items()}
+        for label, sizes in renditions.items()
+        if isinstance(sizes, dict)
+    }
+
+
+def primary_hero_url(product, request=None) -> str:
+    """
+    列表展示用的主图地址；内联 data URL 永远不会出现在返回结果中。
+    """
+    renditions = product.hero_renditions or {}
+    label, width = PRIMARY_RENDITION
+    sizes = renditions.get(label) or {}
+    if sizes:
+        name = sizes.get(str(width)) or sizes[max(sizes, key=int)]
+        return _absolute(default_storage.url(name), request)
+    if product.hero_image.startswith("data:"):
+        return ""
+    return product.hero_image
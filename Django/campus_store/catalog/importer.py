@@ -0,0 +1,232 @@
+"""
+商家商品批量导入：解析 CSV / NDJSON，按块校验并以 upsert 写入。
+"""
+
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from campus_store.analytics.overview import invalidate_overview
+
+from . import navigation
+from .models import Category, Product, normalize_tags
+from .tags import sync_product_tags
+
+IMPORT_CHUNK_SIZE = 500
+MAX_STORED_ERRORS = 1000
+REQUIRED_UPSERT_FIELDS = ["category", "title", "price", "last_synced_at", "updated_at"]
+OPTIONAL_FIELDS = ["description", "inventory", "allow_customization", "is_active", "hero_image", "tags"]
+TRUE_VALUES = {"1", "true", "yes", "y", "on", "是"}
+FALSE_VALUES = {"0", "false", "no", "n", "off", "否"}
+PRICE_LIMIT = Decimal("99999999.99")
+
+
+def detect_format(filename: str = "", content_type: str = "") -> str | None:
+    filename = (filename or "").lower()
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if filename.endswith(".csv") or content_type in ("text/csv", "application/csv"):
+        return "csv"
+    if filename.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+
+def _decode_lines(lines, failed: list):
+    """
+    逐行解码；无法按 UTF-8 解码的行记下行号并以空行代替，不中断整个导入。
+    """
+    for line_no, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            try:
+                line = line.decode("utf-8-sig")
+            except UnicodeDecodeError:
+                failed.append(line_no)
+                line = "\n"
+        yield line
+
+
+def iter_rows(lines, file_format: str):
+    """
+    将按行迭代的字节流解析为 (行号, 字段字典)；无法解码或解析的行返回 (行号, None)。
+    """
+    failed = []
+    text_lines = _decode_lines(lines, failed)
+    if file_format == "csv":
+        # 解码失败的行被替换为空行，DictReader 会跳过，这里按行号补上错误
+        reader = csv.DictReader(text_lines)
+        for row in reader:
+            while failed and failed[0] < reader.line_num:
+                yield failed.pop(0), None
+            yield reader.line_num, row
+        for line_no in failed:
+            yield line_no, None
+        return
+    for line_no, line in enumerate(text_lines, start=1):
+        if failed and failed[0] == line_no:
+            yield failed.pop(0), None
+            continue
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_no, None
+            continue
+        yield line_no, row if isinstance(row, dict) else None
+
+
+def _text(value) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def _bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    lowered = _text(value).lower()
+    if lowered in TRUE_VALUES:
+        return True
+    if lowered in FALSE_VALUES:
+        return False
+    raise ValueError
+
+
+class ProductImporter:
+    def __init__(self, merchant, chunk_size: int = IMPORT_CHUNK_SIZE):
+        self.merchant = merchant
+        self.chunk_size = chunk_size
+        # 分类 ID 与名称分开查找，名称恰好是另一分类的 ID 时也不会串
+        self.category_ids = {}
+        self.category_names = {}
+        for category_id, name in Category.objects.values_list("id", "name"):
+            self.category_ids[str(category_id)] = category_id
+            self.category_names[name.casefold()] = category_id
+        self.summary = {"total": 0, "created": 0, "updated": 0, "failed": 0}
+
+    def validate(self, row) -> tuple[dict | None, dict]:
+        if row is None:
+            return None, {"row": "无法解析该行"}
+        errors = {}
+        sku = _text(row.get("sku"))
+        title = _text(row.get("title"))
+        if not sku:
+            errors["sku"] = "必填"
+        elif len(sku) > 64:
+            errors["sku"] = "不能超过 64 个字符"
+        if not title:
+            errors["title"] = "必填"
+        elif len(title) > 120:
+            errors["title"] = "不能超过 120 个字符"
+
+        category_ref = _text(row.get("category_id"))
+        if category_ref:
+            category_id = self.category_ids.get(category_ref)
+        else:
+            category_id = self.category_names.get(_text(row.get("category")).casefold())
+        if not category_id:
+            errors["category"] = "分类不存在"
+
+        try:
+            price = Decimal(_text(row.get("price"))).quantize(Decimal("0.01"))
+            if price < 0 or price > PRICE_LIMIT:
+                raise InvalidOperation
+        except (InvalidOperation, ValueError):
+            errors["price"] = "价格无效"
+            price = None
+
+        values = {"sku": sku, "title": title, "category_id": category_id, "price": price}
+        # 行中未提供的可选字段不参与更新，避免覆盖已有数据
+        provided = {field for field in OPTIONAL_FIELDS if _text(row.get(field)) != ""}
+        if "description" in provided:
+            values["description"] = _text(row["description"])
+        if "inventory" in provided:
+            try:
+                values["inventory"] = int(_text(row["inventory"]))
+                if values["inventory"] < 0:
+                    raise ValueError
+            except ValueError:
+                errors["inventory"] = "库存需为非负整数"
+        for field in ("is_active", "allow_customization"):
+            if field in provided:
+                try:
+                    values[field] = _bool(row[field])
+                except ValueError:
+                    errors[field] = "需为布尔值"
+        if "hero_image" in provided:
+            values["hero_image"] = _text(row["hero_image"])
+            if values["hero_image"].startswith("data:"):
+                errors["hero_image"] = "批量导入仅支持图片链接"
+        if "tags" in provided:
+            tags = row["tags"]
+            values["tags"] = normalize_tags(tags.replace("|", ",") if isinstance(tags, str) else tags)
+
+        if errors:
+            return None, errors
+        return values, {}
+
+    def _write(self, chunk: dict[str, dict]) -> None:
+        now = timezone.now()
+        # 按提供的列分组，每组一条 upsert；同一文件的列通常一致，只需一条
+        groups = {}
+        for values in chunk.values():
+            groups.setdefault(tuple(field for field in OPTIONAL_FIELDS if field in values), []).append(values)
+        with transaction.atomic():
+            existing = set(
+                Product.objects.filter(merchant=self.merchant, sku__in=chunk).values_list("sku", flat=True)
+            )
+            for optional_fields, rows in groups.items():
+                conflict_options = {
+                    "update_conflicts": True,
+                    "update_fields": [*REQUIRED_UPSERT_FIELDS, *optional_fields],
+                }
+                if connection.features.supports_update_conflicts_with_target:
+                    conflict_options["unique_fields"] = ["merchant", "sku"]
+                Product.objects.bulk_create(
+                    [Product(merchant=self.merchant, last_synced_at=now, **values) for values in rows],
+                    **conflict_options,
+                )
+            sync_product_tags(Product.objects.filter(merchant=self.merchant, sku__in=chunk).only("id", "tags"))
+        self.summary["updated"] += len(existing)
+        self.summary["created"] += len(chunk) - len(existing)
+
+    def run(self, rows):
+        """
+        逐块处理行数据，按顺序产出每条错误，最后产出汇总。
+        """
+        chunk = {}
+        for line_no, row in rows:
+            self.summary["total"] += 1
+            values, errors = self.validate(row)
+            if errors:
+                self.summary["failed"] += 1
+                yield {"row": line_no, "sku": _text((row or {}).get("sku")), "errors": errors}
+                continue
+            # 同一块中重复的 SKU 以最后一行为准
+            chunk.pop(values["sku"], None)
+            chunk[values["sku"]] = values
+            if len(chunk) >= self.chunk_size:
+                self._write(chunk)
+                chunk = {}
+        if chunk:
+            self._write(chunk)
+        if self.summary["created"] or self.summary["updated"]:
+            navigation.invalidate_navigation()
+            invalidate_overview(self.merchant.pk)
+        yield {"summary": self.summary}
+
+
+def run_import_job(job) -> None:
+    importer = ProductImporter(job.merchant)
+    errors = []
+    with job.file.open("rb") as handle:
+        for event in importer.run(iter_rows(handle, job.file_format)):
+            if "errors" in event and len(errors) < MAX_STORED_ERRORS:
+                errors.append(event)
+    summary = importer.summary
+    job.total_rows = summary["total"]
+    job.created_count = summary["created"]
+    job.updated_count = summary["updated"]
+    job.failed_count = summary["failed"]
+    job.errors = errors
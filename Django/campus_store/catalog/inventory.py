@@ -0,0 +1,96 @@
+"""
+批量库存调整与库存流水结转。
+"""
+
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Sum, Value, When
+from django.utils import timezone
+
+from .models import InventoryLog, Product
+
+UPDATE_CHUNK_SIZE = 500
+
+
+def apply_inventory_deltas(deltas: dict[int, int]) -> None:
+    """
+    以集合更新一次性应用多个商品的库存增量，库存最低为 0。
+    """
+    now = timezone.now()
+    items = [(product_id, delta) for product_id, delta in deltas.items() if delta]
+    for start in range(0, len(items), UPDATE_CHUNK_SIZE):
+        chunk = items[start : start + UPDATE_CHUNK_SIZE]
+        # 逐个商品判断是否会减到负数，而不是对 inventory + delta 取 Greatest：无符号列上先算出的负数会直接报错
+        whens = []
+        for product_id, delta in chunk:
+            if delta < 0:
+                whens.append(When(pk=product_id, inventory__lt=-delta, then=Value(0)))
+            whens.append(When(pk=product_id, then=F("inventory") + delta))
+        Product.objects.filter(pk__in=[product_id for product_id, _ in chunk]).update(
+            inventory=Case(*whens, default=F("inventory"), output_field=IntegerField()),
+            last_synced_at=now,
+            updated_at=now,
+        )
+
+
+def bulk_adjust(items: list[dict], user, note: str = "") -> dict[int, int]:
+    """
+    items 为已校验的 {product_id, change, note}；返回调整后各商品的库存。
+    """
+    deltas = {}
+    for item in items:
+        deltas[item["product_id"]] = deltas.get(item["product_id"], 0) + item["change"]
+    with transaction.atomic():
+        InventoryLog.objects.bulk_create(
+            [
+                InventoryLog(
+                    product_id=item["product_id"],
+                    change=item["change"],
+                    note=item.get("note") or note,
+                    created_by=user,
+                )
+                for item in items
+            ],
+            batch_size=UPDATE_CHUNK_SIZE,
+        )
+        apply_inventory_deltas(deltas)
+    return dict(Product.objects.filter(pk__in=deltas).values_list("id", "inventory"))
+
+
+def compact_inventory_logs(cutoff, batch_size: int = 1000) -> tuple[int, int]:
+    """
+    将 cutoff 之前的流水按商品折叠成一条结转记录，返回 (涉及商品数, 删除行数)。
+    """
+    old_logs = InventoryLog.objects.filter(created_at__lt=cutoff)
+    product_ids = list(
+        old_logs.order_by()
+        .values("product_id")
+        .annotate(rows=Count("id"))
+        .filter(rows__gt=1)
+        .values_list("product_id", flat=True)
+    )
+    note = f"库存流水结转（截至 {timezone.localtime(cutoff):%Y-%m-%d %H:%M}）"
+    compacted = deleted = 0
+    for start in range(0, len(product_ids), batch_size):
+        batch = product_ids[start : start + batch_size]
+        run_started = timezone.now()
+        with transaction.atomic():
+            batch_logs = InventoryLog.objects.filter(product_id__in=batch, created_at__lt=cutoff)
+            totals = list(batch_logs.order_by().values("product_id").annotate(total=Sum("change")))
+            deleted += batch_logs.delete()[0]
+            InventoryLog.objects.bulk_create(
+                [
+                    InventoryLog(
+                        product_id=row["product_id"],
+                        kind=InventoryLog.Kind.CHECKPOINT,
+                        change=row["total"] or 0,
+                        note=note,
+                    )
+                    for row in totals
+                ]
+            )
+            # created_at 为 auto_now_add，写入后再回填为结转时间点
+            InventoryLog.objects.filter(
+                product_id__in=batch, kind=InventoryLog.Kind.CHECKPOINT, created_at__gte=run_started
+            ).update(created_at=cutoff)
+        compacted += len(totals)
+    return compacted, deleted
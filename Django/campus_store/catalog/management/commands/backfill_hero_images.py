@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from campus_store.catalog.images import decode_data_url, store_hero_image
+from campus_store.catalog.models import Product
+
+
+class Command(BaseCommand):
+    help = "将商品 hero_image 中的内联 data URL 转存为媒体文件并生成各尺寸版本"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=0, help="最多处理的商品数量，0 表示不限")
+        parser.add_argument("--dry-run", action="store_true", help="只统计待处理商品，不写入")
+
+    def handle(self, *args, **options):
+        queryset = Product.objects.filter(hero_image__startswith="data:").order_by("pk")
+        if options["dry_run"]:
+            self.stdout.write(f"待转换商品：{queryset.count()}")
+            return
+
+        limit = options["limit"]
+        converted = failed = 0
+        # 只取主键再逐条加载，避免一次把大量 base64 读进内存
+        for pk in queryset.values_list("pk", flat=True).iterator(chunk_size=500):
+            if limit and converted + failed >= limit:
+                break
+            data_url = Product.objects.filter(pk=pk).values_list("hero_image", flat=True).first() or ""
+            try:
+                fields = store_hero_image(decode_data_url(data_url))
+            except ValueError as exc:
+                failed += 1
+                self.stderr.write(f"商品 {pk} 转换失败：{exc}")
+                continue
+            Product.objects.filter(pk=pk, hero_image=data_url).update(**fields)
+            converted += 1
+
+        self.stdout.write(self.style.SUCCESS(f"转换完成：成功 {converted}，失败 {failed}"))
@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from campus_store.catalog.inventory import compact_inventory_logs
+
+
+class Command(BaseCommand):
+    help = "将较早的库存流水按商品折叠为结转记录，控制 InventoryLog 表规模（建议每日定时运行）"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=90, help="保留最近多少天的明细流水")
+        parser.add_argument("--batch-size", type=int, default=1000, help="每个事务处理的商品数")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        products, deleted = compact_inventory_logs(cutoff, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"已结转 {products} 个商品，折叠 {deleted} 条流水"))
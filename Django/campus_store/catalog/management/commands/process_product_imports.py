@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from campus_store.catalog.importer import run_import_job
+from campus_store.catalog.models import ProductImportJob
+
+
+class Command(BaseCommand):
+    help = "处理排队中的商品批量导入任务（适合由 cron / supervisor 常驻运行）"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="持续轮询新任务")
+        parser.add_argument("--interval", type=float, default=5.0, help="轮询间隔（秒）")
+
+    def handle(self, *args, **options):
+        while True:
+            processed = self.process_pending()
+            if not options["loop"]:
+                break
+            if not processed:
+                time.sleep(options["interval"])
+
+    def process_pending(self) -> int:
+        processed = 0
+        for job_id in ProductImportJob.objects.filter(status=ProductImportJob.Status.PENDING).values_list(
+            "pk", flat=True
+        ):
+            # 条件更新认领任务，多个进程同时运行也不会重复处理
+            claimed = ProductImportJob.objects.filter(pk=job_id, status=ProductImportJob.Status.PENDING).update(
+                status=ProductImportJob.Status.RUNNING, started_at=timezone.now()
+            )
+            if not claimed:
+                continue
+            job = ProductImportJob.objects.select_related("merchant").get(pk=job_id)
+            try:
+                run_import_job(job)
+                job.status = ProductImportJob.Status.COMPLETED
+            except Exception as exc:  # noqa: BLE001
+                job.status = ProductImportJob.Status.FAILED
+                job.errors = [*job.errors, {"detail": str(exc)}]
+                self.stderr.write(f"导入任务 {job.pk} 失败：{exc}")
+            job.finished_at = timezone.now()
+            job.save()
+            processed += 1
+            self.stdout.write(f"导入任务 {job.pk}：{job.status}")
+        return processed
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("catalog", "0002_alter_product_hero_image"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="hero_image_key",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="hero_renditions",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
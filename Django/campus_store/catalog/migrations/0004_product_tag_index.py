@@ -0,0 +1,105 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def index_existing_tags(apps, schema_editor):
+    Product = apps.get_model("catalog", "Product")
+    Tag = apps.get_model("catalog", "Tag")
+    ProductTag = apps.get_model("catalog", "ProductTag")
+
+    pairs = set()
+    for product_id, tags in Product.objects.values_list("id", "tags").iterator(chunk_size=1000):
+        if isinstance(tags, str):
+            tags = tags.split(",")
+        if not isinstance(tags, (list, tuple)):
+            continue
+        for value in tags:
+            name = str(value).strip().lower()[:64]
+            if name:
+                pairs.add((product_id, name))
+    if not pairs:
+        return
+    Tag.objects.bulk_create([Tag(name=name) for name in {name for _, name in pairs}], batch_size=500)
+    tag_ids = dict(Tag.objects.values_list("name", "id"))
+    ProductTag.objects.bulk_create(
+        [ProductTag(product_id=product_id, tag_id=tag_ids[name]) for product_id, name in pairs],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("catalog", "0003_product_hero_renditions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=64, unique=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ProductTag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tag_links",
+                        to="catalog.product",
+                    ),
+                ),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="product_links",
+                        to="catalog.tag",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="indexed_tags",
+            field=models.ManyToManyField(
+                blank=True,
+                editable=False,
+                related_name="products",
+                through="catalog.ProductTag",
+                to="catalog.tag",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="producttag",
+            index=models.Index(fields=["tag", "product"], name="catalog_producttag_tag_idx"),
+        ),
+        migrations.AlterUniqueTogether(
+            name="producttag",
+            unique_together={("product", "tag")},
+        ),
+        migrations.RunPython(index_existing_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("catalog", "0005_product_sku_import_jobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="inventorylog",
+            name="kind",
+            field=models.CharField(
+                choices=[("ADJUST", "库存调整"), ("CHECKPOINT", "历史结转")],
+                default="ADJUST",
+                max_length=12,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="inventorylog",
+            index=models.Index(fields=["product", "created_at"], name="catalog_invlog_product_idx"),
+        ),
+    ]
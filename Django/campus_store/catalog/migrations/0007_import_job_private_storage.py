@@ -0,0 +1,19 @@
+import campus_store.catalog.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("catalog", "0006_inventorylog_kind"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="productimportjob",
+            name="file",
+            field=models.FileField(
+                storage=campus_store.catalog.models.import_file_storage,
+                upload_to="catalog/imports/",
+            ),
+        ),
+    ]
@@ -1,7 +1,13 @@
 from django.conf import settings
+from django.core.files.storage import FileSystemStorage
 from django.db import models
 from django.utils import timezone
 
+from campus_store.db.expressions import clamped_add
+
+# 实例加载时未取全上架相关字段（only/defer、按主键构造等），保存时无法得知原来的上架状态
+LISTING_UNKNOWN = object()
+
 
 class Category(models.Model):
     name = models.CharField(max_length=80, unique=True)
@@ -29,6 +35,7 @@ class Product(models.Model):
         related_name="merchant_products",
         on_delete=models.CASCADE,
     )
+    sku = models.CharField(max_length=64, null=True, blank=True, help_text="商家内唯一的商品编码，用于批量导入更新")
     title = models.CharField(max_length=120)
     description = models.TextField(blank=True)
     price = models.DecimalField(max_digits=10, decimal_places=2)
@@ -37,19 +44,123 @@ class Product(models.Model):
     is_active = models.BooleanField(default=True)
     last_synced_at = models.DateTimeField(null=True, blank=True)
     hero_image = models.TextField(blank=True)
+    hero_image_key = models.CharField(max_length=64, blank=True, editable=False)
+    hero_renditions = models.JSONField(default=dict, blank=True, editable=False)
     tags = models.JSONField(default=list, blank=True)
+    indexed_tags = models.ManyToManyField(
+        "Tag", through="ProductTag", related_name="products", blank=True, editable=False
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    LISTING_FIELDS = {"category_id", "merchant_id", "is_active"}
+    _loaded_listing = LISTING_UNKNOWN
+    _loaded_tags = None
+
     class Meta:
         ordering = ["-updated_at"]
+        unique_together = ("merchant", "sku")
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 记录加载时的上架状态，保存时据此增量更新分类导航缓存
+        if cls.LISTING_FIELDS.issubset(field_names):
+            instance._loaded_listing = instance.listing
+        if "tags" in field_names:
+            instance._loaded_tags = normalize_tags(instance.tags)
+        return instance
+
+    @property
+    def listing(self):
+        if not self.is_active:
+            return None
+        return (self.category_id, self.merchant_id)
+
+
+def normalize_tags(values) -> list[str]:
+    if isinstance(values, str):
+        values = values.split(",")
+    if not isinstance(values, (list, tuple)):
+        return []
+    names = []
+    for value in values:
+        name = str(value).strip().lower()[:64]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+class ProductTag(models.Model):
+    """
+    Product.tags 的规范化索引，随商品保存同步，用于按标签筛选和关联推荐。
+    """
+
+    product = models.ForeignKey(Product, related_name="tag_links", on_delete=models.CASCADE)
+    tag = models.ForeignKey(Tag, related_name="product_links", on_delete=models.CASCADE)
+
+    class Meta:
+        unique_together = ("product", "tag")
+        indexes = [models.Index(fields=["tag", "product"], name="catalog_producttag_tag_idx")]
+
+
+def import_file_storage():
+    # 导入文件含商家完整商品目录，存到 PRIVATE_MEDIA_ROOT，不经 /media/ 对外提供
+    return FileSystemStorage(location=settings.PRIVATE_MEDIA_ROOT)
+
+
+class ProductImportJob(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "排队中"
+        RUNNING = "RUNNING", "导入中"
+        COMPLETED = "COMPLETED", "已完成"
+        FAILED = "FAILED", "失败"
+
+    merchant = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="product_import_jobs",
+        on_delete=models.CASCADE,
+    )
+    file = models.FileField(upload_to="catalog/imports/", storage=import_file_storage)
+    file_format = models.CharField(max_length=10)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    total_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"导入任务 #{self.pk} ({self.status})"
+
 
 class InventoryLog(models.Model):
+    class Kind(models.TextChoices):
+        ADJUST = "ADJUST", "库存调整"
+        CHECKPOINT = "CHECKPOINT", "历史结转"
+
     product = models.ForeignKey(Product, related_name="inventory_logs", on_delete=models.CASCADE)
+    kind = models.CharField(max_length=12, choices=Kind.choices, default=Kind.ADJUST)
     change = models.IntegerField()
     note = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -63,8 +174,12 @@ class InventoryLog(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["product", "created_at"], name="catalog_invlog_product_idx")]
 
     def apply(self):
-        self.product.inventory = max(0, self.product.inventory + self.change)
-        self.product.last_synced_at = timezone.now()
-        self.product.save(update_fields=["inventory", "last_synced_at", "updated_at"])
+        now = timezone.now()
+        Product.objects.filter(pk=self.product_id).update(
+            inventory=clamped_add("inventory", self.change),
+            last_synced_at=now,
+            updated_at=now,
+        )
@@ -0,0 +1,143 @@
+"""
+店铺前台分类导航：缓存每个分类的在售商品数及按商家拆分的数量。
+"""
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count
+
+from campus_store.metrics import observe_cache
+
+from .models import LISTING_UNKNOWN, Category, Product
+
+NAVIGATION_CACHE_KEY = "catalog:navigation:v1"
+NAVIGATION_TTL = 10 * 60
+# 增量更新是读-改-写，同一时刻只允许一个写入方；抢不到锁时整体失效，不合并
+NAVIGATION_LOCK_KEY = "catalog:navigation:lock"
+NAVIGATION_STALE_KEY = "catalog:navigation:stale"
+NAVIGATION_LOCK_TTL = 5
+
+
+def _entry(category: dict) -> dict:
+    return {
+        "id": category["id"],
+        "name": category["name"],
+        "description": category["description"],
+        "product_count": 0,
+        "merchants": {},
+    }
+
+
+def build_navigation() -> dict:
+    # 结果会被后续写入增量修改，必须从主库读取，不能用可能滞后的副本做基准
+    navigation = {
+        category["id"]: _entry(category)
+        for category in Category.objects.using(DEFAULT_DB_ALIAS).values("id", "name", "description")
+    }
+    grouped = (
+        Product.objects.using(DEFAULT_DB_ALIAS)
+        .filter(is_active=True)
+        .order_by()
+        .values("category_id", "merchant_id")
+        .annotate(total=Count("id"))
+    )
+    for row in grouped:
+        entry = navigation.get(row["category_id"])
+        if entry is None:
+            continue
+        entry["product_count"] += row["total"]
+        entry["merchants"][row["merchant_id"]] = row["total"]
+    cache.set(NAVIGATION_CACHE_KEY, navigation, NAVIGATION_TTL)
+    return navigation
+
+
+def get_navigation() -> dict:
+    navigation = cache.get(NAVIGATION_CACHE_KEY)
+    observe_cache("catalog_navigation", navigation is not None)
+    if navigation is None:
+        navigation = build_navigation()
+    return navigation
+
+
+def invalidate_navigation() -> None:
+    cache.delete(NAVIGATION_CACHE_KEY)
+
+
+def _modify(change) -> None:
+    """
+    在锁内读-改-写缓存的导航，change 修改了导航时返回 True。锁被占用说明有并发写入，
+    此时标记失效并删除缓存；持锁方写回后看到标记同样删除，下次读取从主库重建。
+    """
+    if not cache.add(NAVIGATION_LOCK_KEY, 1, NAVIGATION_LOCK_TTL):
+        cache.set(NAVIGATION_STALE_KEY, 1, NAVIGATION_LOCK_TTL)
+        invalidate_navigation()
+        return
+    try:
+        navigation = cache.get(NAVIGATION_CACHE_KEY)
+        if navigation is None or not change(navigation):
+            return
+        cache.set(NAVIGATION_CACHE_KEY, navigation, NAVIGATION_TTL)
+        if cache.get(NAVIGATION_STALE_KEY):
+            invalidate_navigation()
+    finally:
+        cache.delete(NAVIGATION_LOCK_KEY)
+
+
+def _bump(navigation: dict, listing, delta: int) -> None:
+    category_id, merchant_id = listing
+    entry = navigation.get(category_id)
+    if entry is None:
+        return
+    entry["product_count"] = max(0, entry["product_count"] + delta)
+    remaining = entry["merchants"].get(merchant_id, 0) + delta
+    if remaining > 0:
+        entry["merchants"][merchant_id] = remaining
+    else:
+        entry["merchants"].pop(merchant_id, None)
+
+
+def move_product(old_listing, new_listing) -> None:
+    """
+    商品上下架或更换分类后调整计数，由事务提交后的回调调用；listing 为 (category_id, merchant_id)
+    或 None（未上架）。old_listing 为 LISTING_UNKNOWN（加载时未取上架字段）时无法计算增量，整体失效。
+    """
+    if old_listing is LISTING_UNKNOWN:
+        invalidate_navigation()
+        return
+    if old_listing == new_listing:
+        return
+
+    def change(navigation):
+        if old_listing is not None:
+            _bump(navigation, old_listing, -1)
+        if new_listing is not None:
+            _bump(navigation, new_listing, 1)
+        return True
+
+    _modify(change)
+
+
+def update_category(category_id: int, name: str, description: str) -> None:
+    def change(navigation):
+        entry = navigation.setdefault(category_id, _entry({"id": category_id, "name": "", "description": ""}))
+        entry["name"] = name
+        entry["description"] = description
+        return True
+
+    _modify(change)
+
+
+def remove_category(category_id: int) -> None:
+    _modify(lambda navigation: navigation.pop(category_id, None) is not None)
+
+
+def category_list(has_products: bool = False, search: str = "") -> list[dict]:
+    terms = [term.casefold() for term in search.replace(",", " ").split()]
+    categories = []
+    for entry in sorted(get_navigation().values(), key=lambda item: item["name"]):
+        if has_products and not entry["product_count"]:
+            continue
+        if terms and not all(term in entry["name"].casefold() for term in terms):
+            continue
+        categories.append(entry)
+    return categories
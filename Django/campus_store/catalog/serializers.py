@@ -1,11 +1,48 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
-from .models import Category, InventoryLog, Product
+from .images import decode_data_url, hero_image_fields, open_image, primary_hero_url, rendition_urls
+from .models import Category, InventoryLog, Product, ProductImportJob
 
 User = get_user_model()
 
 
+class HeroImageField(serializers.Field):
+    """
+    读取时输出主图版本地址；写入时接受 data URL 或外链，交由图片管线处理。
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["source"] = "*"
+        kwargs.setdefault("required", False)
+        super().__init__(**kwargs)
+
+    def to_representation(self, product):
+        return primary_hero_url(product, self.context.get("request"))
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            raise serializers.ValidationError("图片格式不正确")
+        if data.startswith("data:"):
+            try:
+                open_image(decode_data_url(data))
+            except ValueError as exc:
+                if str(exc) == "image too large":
+                    raise serializers.ValidationError("图片不能超过 10MB") from exc
+                raise serializers.ValidationError("图片格式不正确") from exc
+        return {"hero_image": data}
+
+
+class HeroImagesField(serializers.Field):
+    def __init__(self, **kwargs):
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, product):
+        return rendition_urls(product, self.context.get("request"))
+
+
 class CategorySerializer(serializers.ModelSerializer):
     created_by = serializers.StringRelatedField(read_only=True)
 
@@ -26,11 +63,14 @@ class ProductSerializer(serializers.ModelSerializer):
         queryset=Category.objects.all(), source="category", write_only=True
     )
     merchant = serializers.StringRelatedField(read_only=True)
+    hero_image = HeroImageField()
+    hero_images = HeroImagesField()
 
     class Meta:
         model = Product
         fields = [
             "id",
+            "sku",
             "title",
             "description",
             "price",
@@ -38,6 +78,7 @@ class ProductSerializer(serializers.ModelSerializer):
             "allow_customization",
             "is_active",
             "hero_image",
+            "hero_images",
             "tags",
             "category",
             "category_id",
@@ -47,11 +88,58 @@ class ProductSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
 
+    def validate_sku(self, value):
+        value = (value or "").strip() or None
+        if value is None:
+            return None
+        request = self.context.get("request")
+        merchant = self.instance.merchant if self.instance else getattr(request, "user", None)
+        duplicates = Product.objects.filter(merchant=merchant, sku=value)
+        if self.instance:
+            duplicates = duplicates.exclude(pk=self.instance.pk)
+        if duplicates.exists():
+            raise serializers.ValidationError("该商品编码已存在")
+        return value
+
+    def _apply_hero_image(self, validated_data):
+        if "hero_image" not in validated_data:
+            return
+        fields = hero_image_fields(validated_data.pop("hero_image"))
+        if fields is not None:
+            validated_data.update(fields)
+
     def create(self, validated_data):
         request = self.context["request"]
         validated_data["merchant"] = request.user
+        self._apply_hero_image(validated_data)
         return super().create(validated_data)
 
+    def update(self, instance, validated_data):
+        self._apply_hero_image(validated_data)
+        return super().update(instance, validated_data)
+
+
+class ProductImportJobSerializer(serializers.ModelSerializer):
+    merchant = serializers.StringRelatedField(read_only=True)
+
+    class Meta:
+        model = ProductImportJob
+        fields = [
+            "id",
+            "merchant",
+            "file_format",
+            "status",
+            "total_rows",
+            "created_count",
+            "updated_count",
+            "failed_count",
+            "errors",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
 
 class InventoryLogSerializer(serializers.ModelSerializer):
     product = serializers.StringRelatedField(read_only=True)
@@ -61,7 +149,8 @@ class InventoryLogSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = InventoryLog
-        fields = ["id", "product", "product_id", "change", "note", "created_at"]
+        fields = ["id", "product", "product_id", "kind", "change", "note", "created_at"]
+        read_only_fields = ["kind"]
 
     def create(self, validated_data):
         request = self.context["request"]
@@ -69,3 +158,25 @@ class InventoryLogSerializer(serializers.ModelSerializer):
         log = super().create(validated_data)
         log.apply()
         return log
+
+
+class InventoryAdjustmentSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField()
+    change = serializers.IntegerField()
+    note = serializers.CharField(max_length=255, required=False, allow_blank=True)
+
+
+class InventoryBulkAdjustSerializer(serializers.Serializer):
+    items = InventoryAdjustmentSerializer(many=True, allow_empty=False, max_length=5000)
+    note = serializers.CharField(max_length=255, required=False, allow_blank=True, default="")
+
+    def validate_items(self, items):
+        request = self.context["request"]
+        product_ids = {item["product_id"] for item in items}
+        products = Product.objects.filter(pk__in=product_ids)
+        if request.user.role == User.Role.MERCHANT:
+            products = products.filter(merchant=request.user)
+        missing = product_ids - set(products.values_list("id", flat=True))
+        if missing:
+            raise serializers.ValidationError(f"商品不存在或无权操作：{sorted(missing)}")
+        return items
@@ -0,0 +1,43 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import navigation
+from .models import Category, Product, normalize_tags
+from .tags import sync_product_tags
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, created, using, update_fields=None, **kwargs):
+    if update_fields is None or "tags" in update_fields:
+        tags = normalize_tags(instance.tags)
+        if created or tags != instance._loaded_tags:
+            sync_product_tags([instance])
+            instance._loaded_tags = tags
+    if update_fields is not None and not Product.LISTING_FIELDS.intersection(
+        {sender._meta.get_field(name).attname for name in update_fields}
+    ):
+        return
+    old_listing = None if created else instance._loaded_listing
+    new_listing = instance.listing
+    instance._loaded_listing = new_listing
+    # 导航缓存只反映已提交的数据，回滚的修改不调整计数
+    transaction.on_commit(lambda: navigation.move_product(old_listing, new_listing), using=using)
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, using, **kwargs):
+    old_listing = instance._loaded_listing
+    transaction.on_commit(lambda: navigation.move_product(old_listing, None), using=using)
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, using, **kwargs):
+    category_id, name, description = instance.pk, instance.name, instance.description
+    transaction.on_commit(lambda: navigation.update_category(category_id, name, description), using=using)
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, using, **kwargs):
+    category_id = instance.pk
+    transaction.on_commit(lambda: navigation.remove_category(category_id), using=using)
@@ -0,0 +1,75 @@
+"""
+商品标签索引：维护 ProductTag，并提供按标签筛选、标签云与关联商品查询。
+"""
+
+from django.db.models import Count
+
+from .models import ProductTag, Tag, normalize_tags
+
+
+def sync_product_tags(products) -> None:
+    """
+    批量同步商品的标签索引；无论商品数量多少，只产生固定数量的查询。
+    """
+    wanted = {product.pk: set(normalize_tags(product.tags)) for product in products}
+    if not wanted:
+        return
+    names = set().union(*wanted.values())
+    tag_ids = dict(Tag.objects.filter(name__in=names).values_list("name", "id"))
+    missing = names - tag_ids.keys()
+    if missing:
+        Tag.objects.bulk_create([Tag(name=name) for name in missing], ignore_conflicts=True)
+        tag_ids.update(Tag.objects.filter(name__in=missing).values_list("name", "id"))
+
+    desired = {(product_id, tag_ids[name]) for product_id, tag_names in wanted.items() for name in tag_names}
+    current = {
+        (product_id, tag_id): link_id
+        for link_id, product_id, tag_id in ProductTag.objects.filter(product_id__in=wanted).values_list(
+            "id", "product_id", "tag_id"
+        )
+    }
+    stale = [link_id for pair, link_id in current.items() if pair not in desired]
+    if stale:
+        ProductTag.objects.filter(pk__in=stale).delete()
+    new_links = desired - current.keys()
+    if new_links:
+        ProductTag.objects.bulk_create(
+            [ProductTag(product_id=product_id, tag_id=tag_id) for product_id, tag_id in new_links],
+            ignore_conflicts=True,
+        )
+
+
+def filter_by_tags(queryset, names, match_all=True):
+    names = normalize_tags(names)
+    if not names:
+        return queryset
+    links = ProductTag.objects.filter(tag__name__in=names).values("product_id")
+    if match_all:
+        links = links.annotate(matched=Count("tag_id")).filter(matched=len(names))
+    return queryset.filter(pk__in=links.values("product_id"))
+
+
+def tag_cloud(limit=50, **product_filters):
+    product_filters.setdefault("is_active", True)
+    lookups = {f"product_links__product__{key}": value for key, value in product_filters.items()}
+    return list(
+        Tag.objects.filter(**lookups)
+        .values("id", "name")
+        .annotate(count=Count("product_links"))
+        .order_by("-count", "name")[:limit]
+    )
+
+
+def related_product_ids(product_id, limit=8) -> list[tuple[int, int]]:
+    """
+    返回与指定商品共享标签最多的在售商品 (product_id, 共享标签数)。
+    """
+    own_tags = ProductTag.objects.filter(product_id=product_id).values("tag_id")
+    rows = (
+        ProductTag.objects.filter(tag_id__in=own_tags, product__is_active=True)
+        .exclude(product_id=product_id)
+        .values("product_id")
+        .annotate(shared=Count("tag_id"))
+        .order_by("-shared", "-product_id")[:limit]
+    )
+    return [(row["product_id"], row["shared"]) for row in rows]
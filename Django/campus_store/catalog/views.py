@@ -1,10 +1,28 @@
+import json
+import os
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from rest_framework import filters, viewsets
+from django.http import HttpResponse
+from rest_framework import filters, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
 from campus_store.accounts.permissions import RolePermission
+from campus_store.media_views import serve_media
 
-from .models import Category, InventoryLog, Product
-from .serializers import CategorySerializer, InventoryLogSerializer, ProductSerializer
+from .filters import ProductTagFilter
+from .images import HERO_IMAGE_DIR, store_hero_image
+from .importer import ProductImporter, detect_format, iter_rows
+from .inventory import bulk_adjust
+from .models import Category, InventoryLog, Product, ProductImportJob
+from .serializers import (
+    CategorySerializer,
+    InventoryBulkAdjustSerializer,
+    InventoryLogSerializer,
+    ProductImportJobSerializer,
+    ProductSerializer,
+)
 
 User = get_user_model()
 
@@ -18,8 +36,8 @@ class CategoryViewSet(viewsets.ModelViewSet):
 
 class ProductViewSet(viewsets.ModelViewSet):
     serializer_class = ProductSerializer
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["title", "description", "tags"]
+    filter_backends = [ProductTagFilter, filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ["title", "description", "indexed_tags__name"]
     ordering_fields = ["created_at", "price", "inventory"]
     allowed_roles = [User.Role.ADMIN, User.Role.MERCHANT]
     permission_classes = [RolePermission]
@@ -31,6 +49,77 @@ class ProductViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(merchant=user)
         return queryset
 
+    @action(detail=True, methods=["post"], url_path="hero_image")
+    def hero_image(self, request, pk=None):
+        product = self.get_object()
+        uploaded = request.FILES.get("image")
+        if not uploaded:
+            return Response({"detail": "请上传图片文件"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            fields = store_hero_image(uploaded.read())
+        except ValueError as exc:
+            if str(exc) == "image too large":
+                return Response({"detail": "图片不能超过 10MB"}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({"detail": "图片格式不正确"}, status=status.HTTP_400_BAD_REQUEST)
+        for name, value in fields.items():
+            setattr(product, name, value)
+        product.save(update_fields=[*fields, "updated_at"])
+        return Response(self.get_serializer(product).data)
+
+    @action(detail=False, methods=["post"], url_path="bulk_import")
+    def bulk_import(self, request):
+        """
+        批量导入/更新商品（以 sku 为键）。上传 multipart `file`，或直接以 text/csv、
+        application/x-ndjson 作为请求体；导入完成后逐行返回错误（NDJSON），最后一行为汇总。
+        `?background=1` 时仅保存文件并排队，由 process_product_imports 命令处理。
+        """
+        merchant = request.user
+        if request.user.role == User.Role.ADMIN:
+            merchant = User.objects.filter(
+                pk=request.query_params.get("merchant"), role=User.Role.MERCHANT
+            ).first()
+            if not merchant:
+                return Response({"detail": "请通过 merchant 参数指定商家"}, status=status.HTTP_400_BAD_REQUEST)
+
+        content_type = request.content_type or ""
+        if content_type.startswith("multipart/"):
+            uploaded = request.FILES.get("file")
+            if not uploaded:
+                return Response({"detail": "请上传导入文件"}, status=status.HTTP_400_BAD_REQUEST)
+            file_format = request.query_params.get("format") or detect_format(uploaded.name, uploaded.content_type)
+            source = uploaded
+        else:
+            uploaded = None
+            file_format = request.query_params.get("format") or detect_format(content_type=content_type)
+            source = request._request
+        if file_format not in ("csv", "ndjson"):
+            return Response({"detail": "仅支持 CSV 或 NDJSON 格式"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if request.query_params.get("background") == "1":
+            if uploaded is None:
+                return Response({"detail": "后台导入需以文件形式上传"}, status=status.HTTP_400_BAD_REQUEST)
+            job = ProductImportJob.objects.create(merchant=merchant, file=uploaded, file_format=file_format)
+            return Response(ProductImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+        # 在视图内导入完毕再响应，写入与缓存失效仍处于中间件（查询统计、指标、异常处理）之内
+        importer = ProductImporter(merchant)
+        events = importer.run(iter_rows(source, file_format))
+        body = "".join(json.dumps(event, ensure_ascii=False, default=str) + "\n" for event in events)
+        return HttpResponse(body, content_type="application/x-ndjson")
+
+
+class ProductImportJobViewSet(viewsets.ReadOnlyModelViewSet):
+    serializer_class = ProductImportJobSerializer
+    allowed_roles = [User.Role.ADMIN, User.Role.MERCHANT]
+    permission_classes = [RolePermission]
+
+    def get_queryset(self):
+        queryset = ProductImportJob.objects.select_related("merchant")
+        user = self.request.user
+        if user.role == User.Role.MERCHANT:
+            queryset = queryset.filter(merchant=user)
+        return queryset
+
 
 class InventoryLogViewSet(viewsets.ModelViewSet):
     serializer_class = InventoryLogSerializer
@@ -43,3 +132,32 @@ class InventoryLogViewSet(viewsets.ModelViewSet):
         if user.role == User.Role.MERCHANT:
             qs = qs.filter(product__merchant=user)
         return qs
+
+    @action(detail=False, methods=["post"], url_path="bulk_adjust")
+    def bulk_adjust(self, request):
+        serializer = InventoryBulkAdjustSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        inventories = bulk_adjust(
+            serializer.validated_data["items"],
+            user=request.user,
+            note=serializer.validated_data["note"],
+        )
+        return Response(
+            {
+                "applied": len(serializer.validated_data["items"]),
+                "products": [{"id": pk, "inventory": inventory} for pk, inventory in inventories.items()],
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+def hero_rendition_view(request, path):
+    """
+    主图文件按内容哈希命名，内容永不变化，可以让浏览器和 CDN 永久缓存。
+    """
+    return serve_media(
+        request,
+        os.path.join(settings.MEDIA_ROOT, HERO_IMAGE_DIR),
+        path,
+        cache_control="public, max-age=31536000, immutable",
+    )
@@ -7,12 +7,13 @@ from rest_framework.response import Response
 
 from campus_store.accounts.permissions import RolePermission
 from campus_store.catalog.models import Product
+from campus_store.db.mixins import QueryBudgetMixin
 
 from .models import Order, PaymentIntent, Shipment
 from .serializers import OrderSerializer, PaymentIntentSerializer, ShipmentSerializer
 
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(QueryBudgetMixin, viewsets.ModelViewSet):
     serializer_class = OrderSerializer
     permission_classes = [RolePermission]
     allowed_roles = ["CONSUMER", "MERCHANT", "ADMIN"]
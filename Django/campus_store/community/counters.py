@@ -0,0 +1,53 @@
+"""
+帖子互动计数的校对：按真实评论/表态重新计数，修正漂移并重算热度分。
+"""
+
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Comment, Post, Reaction, hot_score
+
+COUNTER_FIELDS = ["comment_count", *Post.REACTION_COUNTERS.values()]
+
+
+def _count(queryset):
+    counted = queryset.filter(post=OuterRef("pk")).order_by().values("post").annotate(total=Count("id"))
+    return Coalesce(Subquery(counted.values("total"), output_field=IntegerField()), Value(0))
+
+
+def actual_counts(queryset):
+    annotations = {"actual_comment_count": _count(Comment.objects.all())}
+    for reaction_type, field in Post.REACTION_COUNTERS.items():
+        annotations[f"actual_{field}"] = _count(Reaction.objects.filter(reaction_type=reaction_type))
+    return queryset.annotate(**annotations)
+
+
+def reconcile_post_counters(batch_size: int = 500, dry_run: bool = False) -> tuple[int, int]:
+    """
+    返回 (检查的帖子数, 修正的帖子数)。按主键分批处理，每批一次读取加一次批量写回。
+    """
+    checked = fixed = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            actual_counts(Post.objects.filter(pk__gt=last_pk).order_by("pk")).only(
+                "id", "created_at", "hot_score", *COUNTER_FIELDS
+            )[:batch_size]
+        )
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        checked += len(batch)
+        changed = []
+        for post in batch:
+            stale = any(getattr(post, field) != getattr(post, f"actual_{field}") for field in COUNTER_FIELDS)
+            for field in COUNTER_FIELDS:
+                setattr(post, field, getattr(post, f"actual_{field}"))
+            score = hot_score(post.created_at, post.engagement)
+            if stale or abs(post.hot_score - score) > 1e-6:
+                post.hot_score = score
+                changed.append(post)
+        fixed += len(changed)
+        if changed and not dry_run:
+            Post.objects.bulk_update(changed, [*COUNTER_FIELDS, "hot_score"])
+    return checked, fixed
@@ -0,0 +1,31 @@
+"""
+社区动态流：按页批量加载帖子的最新评论与当前用户的表态；互动计数直接读取帖子上的计数列。
+"""
+
+from campus_store.queries import group_rows, latest_per_group
+
+from .models import Comment, Reaction
+
+FEED_COMMENT_LIMIT = 3
+
+
+def load_feed(posts, user=None, comment_limit: int = FEED_COMMENT_LIMIT) -> dict:
+    """
+    无论一页有多少帖子、每条帖子有多少评论，都只产生固定数量的查询。
+    """
+    post_ids = [post.pk for post in posts]
+    feed = {"latest_comments": {}, "my_reactions": {}}
+    if not post_ids:
+        return feed
+
+    if comment_limit:
+        latest = latest_per_group(
+            Comment.objects.filter(post_id__in=post_ids).select_related("author"), "post_id", comment_limit
+        )
+        feed["latest_comments"] = group_rows(latest, "post_id")
+
+    if user is not None and user.is_authenticated:
+        feed["my_reactions"] = dict(
+            Reaction.objects.filter(post_id__in=post_ids, author=user).values_list("post_id", "reaction_type")
+        )
+    return feed
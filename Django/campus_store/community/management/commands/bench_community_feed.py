@@ -0,0 +1,120 @@
+import json
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from campus_store.community.counters import reconcile_post_counters
+from campus_store.community.models import Comment, Post, Reaction
+from campus_store.community.serializers import CommentSerializer, ReactionSerializer
+from campus_store.community.views import PostViewSet
+
+User = get_user_model()
+
+
+class LegacyPostSerializer(serializers.ModelSerializer):
+    """
+    旧版动态流：内嵌全部评论与表态，仅用于对比。
+    """
+
+    author = serializers.StringRelatedField()
+    comments = CommentSerializer(many=True)
+    reactions = ReactionSerializer(many=True)
+
+    class Meta:
+        model = Post
+        fields = ["id", "title", "content", "visibility", "author", "comments", "reactions", "created_at"]
+
+
+class Command(BaseCommand):
+    help = "以长尾分布的评论/表态数据对比社区动态流新旧两种返回方式的耗时、查询数与响应体积（数据在事务中回滚）"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=200, help="生成的帖子数")
+        parser.add_argument("--users", type=int, default=300, help="参与互动的用户数")
+        parser.add_argument("--max-comments", type=int, default=5000, help="最热门帖子的评论数")
+        parser.add_argument("--skew", type=float, default=1.1, help="Zipf 分布指数，越大越集中在头部帖子")
+        parser.add_argument("--repeat", type=int, default=5, help="每种方式重复请求次数")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        with transaction.atomic():
+            viewer, posts = self._seed(rng, options)
+            # 最新创建的帖子排名最靠前、互动最多，恰好落在动态流第一页
+            legacy = self._measure(options["repeat"], lambda: self._legacy_page(posts[:20]))
+            feed = self._measure(options["repeat"], lambda: self._feed_page(viewer))
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'方式':<8}{'中位耗时(ms)':>14}{'查询数':>8}{'响应(KB)':>12}")
+        for label, (elapsed, queries, size) in (("旧版", legacy), ("计数版", feed)):
+            self.stdout.write(f"{label:<8}{elapsed * 1000:>14.1f}{queries:>8}{size / 1024:>12.1f}")
+
+    def _seed(self, rng, options):
+        suffix = rng.randrange(10**8)
+        users = User.objects.bulk_create(
+            [
+                User(username=f"bench_feed_{suffix}_{index}", role=User.Role.CONSUMER)
+                for index in range(options["users"])
+            ]
+        )
+        if not users[0].pk:
+            users = list(User.objects.filter(username__startswith=f"bench_feed_{suffix}_").order_by("pk"))
+        author = users[0]
+        Post.objects.bulk_create(
+            [Post(author=author, title=f"帖子 {index}", content="压测内容") for index in range(options["posts"])]
+        )
+        posts = list(Post.objects.filter(author=author).order_by("-pk"))
+
+        reaction_types = [value for value, _ in Reaction.TYPES]
+        for rank, post in enumerate(posts, start=1):
+            weight = 1 / rank ** options["skew"]
+            comment_total = int(options["max_comments"] * weight)
+            Comment.objects.bulk_create(
+                [
+                    Comment(post=post, author=rng.choice(users), message=f"评论 {index}")
+                    for index in range(comment_total)
+                ],
+                batch_size=1000,
+            )
+            reactors = rng.sample(users, min(len(users), int(len(users) * weight)))
+            Reaction.objects.bulk_create(
+                [
+                    Reaction(post=post, author=user, reaction_type=rng.choices(reaction_types, [6, 2, 1])[0])
+                    for user in reactors
+                ],
+                batch_size=1000,
+            )
+        # bulk_create 不经过计数逻辑，统一校对一次
+        reconcile_post_counters()
+        return users[-1], posts
+
+    def _measure(self, repeat, render):
+        timings = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                payload = render()
+                timings.append(time.perf_counter() - started)
+        size = len(json.dumps(payload, ensure_ascii=False, default=str).encode())
+        return statistics.median(timings), len(captured), size
+
+    def _legacy_page(self, posts):
+        queryset = (
+            Post.objects.filter(pk__in=[post.pk for post in posts])
+            .select_related("author")
+            .prefetch_related("comments__author", "reactions__author")
+        )
+        return LegacyPostSerializer(queryset, many=True).data
+
+    def _feed_page(self, viewer):
+        request = APIRequestFactory().get("/api/community/posts/", HTTP_HOST="localhost")
+        force_authenticate(request, user=viewer)
+        response = PostViewSet.as_view({"get": "list"})(request)
+        return response.data
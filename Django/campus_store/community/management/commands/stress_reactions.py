@@ -0,0 +1,70 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from campus_store.community.models import Post, Reaction
+from campus_store.community.reactions import ReactionConflict, toggle_reaction
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "模拟大量用户同时对同一帖子表态，校验表态行数与帖子计数一致（会写入临时数据，结束后清理）"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reactions", type=int, default=1000, help="并发表态的用户数")
+        parser.add_argument("--workers", type=int, default=50, help="并发线程数（每个线程独占一个数据库连接）")
+        parser.add_argument("--type", default="LIKE", choices=list(Post.REACTION_COUNTERS), help="表态类型")
+        parser.add_argument("--keep", action="store_true", help="保留生成的数据以便排查")
+
+    def handle(self, *args, **options):
+        prefix = f"stress_react_{uuid.uuid4().hex[:8]}_"
+        User.objects.bulk_create(
+            [User(username=f"{prefix}{index}", role=User.Role.CONSUMER) for index in range(options["reactions"])]
+        )
+        users = list(User.objects.filter(username__startswith=prefix))
+        post = Post.objects.create(author=users[0], title="并发表态压测", content="stress")
+        reaction_type = options["type"]
+        start = threading.Event()
+        failures = []
+
+        def react(user):
+            start.wait()
+            try:
+                toggle_reaction(post, user, reaction_type)
+            except ReactionConflict:
+                failures.append(user.pk)
+            finally:
+                connection.close()
+
+        try:
+            with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+                futures = [pool.submit(react, user) for user in users]
+                started = time.perf_counter()
+                start.set()
+                errors = [future.exception() for future in futures if future.exception()]
+            elapsed = time.perf_counter() - started
+
+            post.refresh_from_db()
+            rows = Reaction.objects.filter(post=post, reaction_type=reaction_type).count()
+            counter = post.reaction_counts[reaction_type]
+            self.stdout.write(
+                f"耗时 {elapsed:.2f}s，{len(users) / elapsed:.0f} 次/秒；表态行 {rows}，计数 {counter}，"
+                f"冲突 {len(failures)}，异常 {len(errors)}"
+            )
+            for error in errors[:5]:
+                self.stderr.write(repr(error))
+            if errors:
+                raise CommandError(f"{len(errors)} 个请求抛出异常")
+            if rows != counter or rows != len(users) - len(failures):
+                raise CommandError("表态行数与计数不一致")
+            self.stdout.write(self.style.SUCCESS("计数一致"))
+        finally:
+            if not options["keep"]:
+                post.delete()
+                User.objects.filter(username__startswith=prefix).delete()
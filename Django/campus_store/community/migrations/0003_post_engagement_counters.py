@@ -0,0 +1,71 @@
+import math
+from datetime import datetime, timezone
+
+from django.db import migrations, models
+
+COUNTERS = {"LIKE": "like_count", "WOW": "wow_count", "IDEA": "idea_count"}
+HOT_SCORE_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def fill_counters(apps, schema_editor):
+    Post = apps.get_model("community", "Post")
+    Comment = apps.get_model("community", "Comment")
+    Reaction = apps.get_model("community", "Reaction")
+
+    counts = {}
+    for post_id, total in Comment.objects.order_by().values_list("post_id").annotate(total=models.Count("id")):
+        counts.setdefault(post_id, {})["comment_count"] = total
+    grouped = Reaction.objects.order_by().values_list("post_id", "reaction_type").annotate(total=models.Count("id"))
+    for post_id, reaction_type, total in grouped:
+        if reaction_type in COUNTERS:
+            counts.setdefault(post_id, {})[COUNTERS[reaction_type]] = total
+
+    posts = []
+    for post in Post.objects.only("id", "created_at").iterator(chunk_size=1000):
+        values = counts.get(post.pk, {})
+        for field in ["comment_count", *COUNTERS.values()]:
+            setattr(post, field, values.get(field, 0))
+        engagement = post.comment_count * 2 + post.like_count + post.wow_count + post.idea_count
+        age = (post.created_at - HOT_SCORE_EPOCH).total_seconds() / 45000
+        post.hot_score = math.log10(max(engagement, 1)) + age
+        posts.append(post)
+    Post.objects.bulk_update(posts, ["comment_count", *COUNTERS.values(), "hot_score"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("community", "0002_postmedia"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="hot_score",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="idea_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="like_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="wow_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(fields=["-hot_score", "-id"], name="community_post_hot_idx"),
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations, models
+
+COUNTERS = {"LIKE": "like_count", "WOW": "wow_count", "IDEA": "idea_count"}
+
+
+def keep_latest_reaction(apps, schema_editor):
+    Post = apps.get_model("community", "Post")
+    Reaction = apps.get_model("community", "Reaction")
+
+    duplicated = (
+        Reaction.objects.order_by()
+        .values("post_id", "author_id")
+        .annotate(total=models.Count("id"))
+        .filter(total__gt=1)
+    )
+    stale = []
+    post_ids = set()
+    for row in duplicated.iterator():
+        ids = list(
+            Reaction.objects.filter(post_id=row["post_id"], author_id=row["author_id"])
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)
+        )
+        stale.extend(ids[1:])
+        post_ids.add(row["post_id"])
+    for start in range(0, len(stale), 1000):
+        Reaction.objects.filter(pk__in=stale[start : start + 1000]).delete()
+
+    # 删除重复表态后重算受影响帖子的表态计数
+    for post_id in post_ids:
+        counts = dict(
+            Reaction.objects.filter(post_id=post_id)
+            .order_by()
+            .values_list("reaction_type")
+            .annotate(total=models.Count("id"))
+        )
+        Post.objects.filter(pk=post_id).update(
+            **{field: counts.get(reaction_type, 0) for reaction_type, field in COUNTERS.items()}
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("community", "0003_post_engagement_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_reaction, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="reaction",
+            unique_together={("post", "author")},
+        ),
+    ]
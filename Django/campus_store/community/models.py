@@ -1,5 +1,27 @@
+import math
+from datetime import datetime, timezone as dt_timezone
+
 from django.conf import settings
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Greatest, Log
+from django.utils import timezone
+
+from campus_store.db.expressions import clamped_add
+
+HOT_SCORE_EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+# 互动量每增加 10 倍，相当于帖子“年轻” 12.5 小时
+HOT_SCORE_DECAY_SECONDS = 45000
+COMMENT_WEIGHT = 2
+
+
+def hot_score(created_at, engagement: int) -> float:
+    """
+    热度分 = log10(互动量) + 发布时间项；发布时间项只随帖子年龄线性增长，
+    因此分数写入后无需定时衰减，新帖自然排在同等互动的旧帖之前。
+    """
+    age = (created_at - HOT_SCORE_EPOCH).total_seconds() / HOT_SCORE_DECAY_SECONDS
+    return math.log10(max(engagement, 1)) + age
 
 
 class Post(models.Model):
@@ -15,15 +37,58 @@ class Post(models.Model):
     content = models.TextField()
     cover_image = models.URLField(blank=True)
     visibility = models.CharField(max_length=20, choices=Visibility.choices, default=Visibility.PUBLIC)
+    comment_count = models.PositiveIntegerField(default=0)
+    like_count = models.PositiveIntegerField(default=0)
+    wow_count = models.PositiveIntegerField(default=0)
+    idea_count = models.PositiveIntegerField(default=0)
+    hot_score = models.FloatField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    REACTION_COUNTERS = {"LIKE": "like_count", "WOW": "wow_count", "IDEA": "idea_count"}
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-hot_score", "-id"], name="community_post_hot_idx")]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.hot_score:
+            self.hot_score = hot_score(self.created_at or timezone.now(), self.engagement)
+        super().save(*args, **kwargs)
+
+    @property
+    def reaction_counts(self) -> dict:
+        return {reaction_type: getattr(self, field) for reaction_type, field in self.REACTION_COUNTERS.items()}
+
+    @property
+    def engagement(self) -> int:
+        reactions = sum(getattr(self, field) for field in self.REACTION_COUNTERS.values())
+        return self.comment_count * COMMENT_WEIGHT + reactions
+
+    def bump_counters(self, comments: int = 0, reactions: dict | None = None) -> None:
+        """
+        以一条 UPDATE 原子地增减计数，并在同一语句中据此重算热度分。
+        """
+        deltas = {"comment_count": comments}
+        for reaction_type, delta in (reactions or {}).items():
+            deltas[self.REACTION_COUNTERS[reaction_type]] = delta
+        changes = {field: clamped_add(field, delta) for field, delta in deltas.items() if delta}
+        if not changes:
+            return
+        updated = {field: changes.get(field, F(field)) for field in ["comment_count", *self.REACTION_COUNTERS.values()]}
+        engagement = updated["comment_count"] * COMMENT_WEIGHT + sum(
+            (updated[field] for field in self.REACTION_COUNTERS.values()), Value(0)
+        )
+        # hot_score 写在 SET 的最前面并用旧值加增量计算：MySQL 按顺序赋值、后面的列会读到新值，
+        # 其他数据库一律读旧值，两种语义下结果相同
+        Post.objects.filter(pk=self.pk).update(
+            hot_score=Log(10, Greatest(engagement, Value(1))) + Value(hot_score(self.created_at, 0)),
+            **changes,
+        )
+
 
 class PostMedia(models.Model):
     class MediaType(models.TextChoices):
@@ -68,4 +133,4 @@ class Reaction(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        unique_together = ("post", "author", "reaction_type")
+        unique_together = ("post", "author")
@@ -0,0 +1,54 @@
+"""
+帖子表态：每个用户对每个帖子至多一个表态，重复点击同一表态即取消。
+
+每次表态先读出当前表态，再对 Reaction 执行一条带条件的写语句（DELETE / UPDATE / INSERT），
+根据其影响行数用一条 UPDATE 调整帖子计数，共三条语句；并发请求不会重复计数，也无需锁住帖子行。
+不用 INSERT ... ON DUPLICATE KEY UPDATE：MySQL 的 upsert 无法返回切换前的表态，计数无从调整。
+"""
+
+from django.db import IntegrityError, transaction
+
+from .models import Reaction
+
+MAX_ATTEMPTS = 3
+_RETRY = object()
+
+
+class ReactionConflict(Exception):
+    pass
+
+
+def _apply(post, user, reaction_type: str):
+    mine = Reaction.objects.filter(post=post, author=user)
+    previous = mine.values_list("reaction_type", flat=True).first()
+    if previous is None:
+        # 同一用户的并发请求已插入时抛出 IntegrityError，由调用方整体重试
+        Reaction.objects.create(post=post, author=user, reaction_type=reaction_type)
+        post.bump_counters(reactions={reaction_type: 1})
+        return reaction_type
+    if previous == reaction_type:
+        if not mine.filter(reaction_type=reaction_type).delete()[0]:
+            return _RETRY
+        post.bump_counters(reactions={reaction_type: -1})
+        return None
+    if not mine.filter(reaction_type=previous).update(reaction_type=reaction_type):
+        return _RETRY
+    post.bump_counters(reactions={previous: -1, reaction_type: 1})
+    return reaction_type
+
+
+def toggle_reaction(post, user, reaction_type: str) -> str | None:
+    """
+    返回操作后当前用户在该帖子上的表态；取消时返回 None。
+    """
+    for _ in range(MAX_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                result = _apply(post, user, reaction_type)
+        except IntegrityError:
+            # 插入前表态已被同一用户的并发请求写入；事务已整体回滚，重新读取后走切换/取消分支
+            continue
+        if result is not _RETRY:
+            return result
+        # 表态在读取后被其他请求修改或删除，重试
+    raise ReactionConflict
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from .feed import load_feed
 from .models import Comment, Post, Reaction, PostMedia
 
 
@@ -19,10 +20,27 @@ class ReactionSerializer(serializers.ModelSerializer):
         fields = ["id", "author", "reaction_type", "created_at"]
 
 
+def _request_user(context):
+    request = context.get("request")
+    return getattr(request, "user", None)
+
+
+class PostListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        posts = list(data.all() if hasattr(data, "all") else data)
+        self.child.feed = load_feed(posts, _request_user(self.context))
+        return super().to_representation(posts)
+
+
 class PostSerializer(serializers.ModelSerializer):
+    """
+    动态流中的帖子只带互动计数（读取帖子上的计数列）与最新几条评论，完整评论通过 comments 接口分页获取。
+    """
+
     author = serializers.StringRelatedField(read_only=True)
-    comments = CommentSerializer(many=True, read_only=True)
-    reactions = ReactionSerializer(many=True, read_only=True)
+    reaction_counts = serializers.ReadOnlyField()
+    latest_comments = serializers.SerializerMethodField()
+    my_reaction = serializers.SerializerMethodField()
     media_files = serializers.SerializerMethodField()
 
     class Meta:
@@ -34,12 +52,30 @@ class PostSerializer(serializers.ModelSerializer):
             "cover_image",
             "visibility",
             "author",
-            "comments",
-            "reactions",
+            "reaction_counts",
+            "comment_count",
+            "latest_comments",
+            "my_reaction",
             "media_files",
+            "hot_score",
             "created_at",
             "updated_at",
         ]
+        read_only_fields = ["comment_count", "hot_score"]
+        list_serializer_class = PostListSerializer
+
+    def to_representation(self, instance):
+        # 列表由 PostListSerializer 按页统一加载；单个帖子（详情、创建后返回）在此加载
+        if self.parent is None:
+            self.feed = load_feed([instance], _request_user(self.context))
+        return super().to_representation(instance)
+
+    def get_latest_comments(self, obj):
+        comments = self.feed["latest_comments"].get(obj.pk, [])
+        return CommentSerializer(comments, many=True).data
+
+    def get_my_reaction(self, obj):
+        return self.feed["my_reactions"].get(obj.pk)
 
     def get_media_files(self, obj):
         files = getattr(obj, "media_files", None)
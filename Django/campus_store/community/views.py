@@ -1,10 +1,13 @@
-from rest_framework import status, viewsets
+from django.db import transaction
+from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from campus_store.accounts.permissions import RolePermission
+from campus_store.pagination import CommentCursorPagination
 
-from .models import Comment, Post, Reaction
+from .models import Comment, Post
+from .reactions import ReactionConflict, toggle_reaction
 from .serializers import CommentSerializer, PostSerializer, ReactionSerializer
 
 
@@ -12,26 +15,41 @@ class PostViewSet(viewsets.ModelViewSet):
     serializer_class = PostSerializer
     permission_classes = [RolePermission]
     allowed_roles = ["CONSUMER", "MERCHANT", "ADMIN"]
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ["created_at", "hot_score", "comment_count", "like_count"]
 
     def get_queryset(self):
         user = self.request.user
-        qs = Post.objects.prefetch_related("comments", "reactions", "media_files")
+        qs = Post.objects.select_related("author").prefetch_related("media_files")
         if user.role == user.Role.ADMIN:
             return qs
         if user.role == user.Role.MERCHANT:
             return qs.exclude(visibility=Post.Visibility.INTERNAL)
         return qs.filter(visibility=Post.Visibility.PUBLIC)
 
+    @action(detail=True, methods=["get"])
+    def comments(self, request, pk=None):
+        """
+        帖子的完整评论列表，按时间倒序游标分页。
+        """
+        post = self.get_object()
+        paginator = CommentCursorPagination()
+        queryset = Comment.objects.filter(post=post).select_related("author")
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        return paginator.get_paginated_response(CommentSerializer(page, many=True).data)
+
     @action(detail=True, methods=["post"])
     def comment(self, request, pk=None):
         post = self.get_object()
         serializer = CommentSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        comment = Comment.objects.create(
-            post=post,
-            author=request.user,
-            message=serializer.validated_data["message"],
-        )
+        with transaction.atomic():
+            comment = Comment.objects.create(
+                post=post,
+                author=request.user,
+                message=serializer.validated_data["message"],
+            )
+            post.bump_counters(comments=1)
         return Response(CommentSerializer(comment).data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=["post"])
@@ -39,9 +57,9 @@ class PostViewSet(viewsets.ModelViewSet):
         post = self.get_object()
         serializer = ReactionSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        reaction, _ = Reaction.objects.update_or_create(
-            post=post,
-            author=request.user,
-            defaults={"reaction_type": serializer.validated_data["reaction_type"]},
-        )
-        return Response(ReactionSerializer(reaction).data)
+        try:
+            my_reaction = toggle_reaction(post, request.user, serializer.validated_data["reaction_type"])
+        except ReactionConflict:
+            return Response({"detail": "操作过于频繁，请稍后重试"}, status=status.HTTP_409_CONFLICT)
+        post.refresh_from_db(fields=list(Post.REACTION_COUNTERS.values()))
+        return Response({"my_reaction": my_reaction, "reaction_counts": post.reaction_counts})
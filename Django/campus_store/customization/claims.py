@@ -0,0 +1,46 @@
+"""
+商家认领定制请求：以一条条件 UPDATE 完成认领，只有仍处于已提交且未分配状态的请求会被更新，
+并发认领时由数据库行锁决定唯一的赢家，其余请求影响行数为 0，视为冲突。
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import WishRequest, WishTimelineEntry
+from .signals import wishes_claimed
+
+MAX_BATCH_CLAIM = 100
+CLAIM_MESSAGE = "商家已认领该定制请求。"
+
+
+def claim_wishes(merchant, wish_ids) -> tuple[list[int], list[int]]:
+    """
+    返回 (认领成功的 ID, 冲突的 ID)。冲突包括已被认领、状态不可认领或不存在的请求。
+    """
+    wish_ids = list(dict.fromkeys(wish_ids))
+    if not wish_ids:
+        return [], []
+    # 以本次认领时间作为标记，UPDATE 之后据此找出这一条语句实际更新的行（MySQL 没有 RETURNING）
+    claimed_at = timezone.now()
+    with transaction.atomic():
+        updated = WishRequest.objects.filter(
+            pk__in=wish_ids, merchant__isnull=True, status=WishRequest.Status.SUBMITTED
+        ).update(merchant=merchant, status=WishRequest.Status.IN_PROGRESS, claimed_at=claimed_at, updated_at=claimed_at)
+        if updated == len(wish_ids):
+            claimed = wish_ids
+        elif updated:
+            won = set(
+                WishRequest.objects.filter(pk__in=wish_ids, merchant=merchant, claimed_at=claimed_at).values_list(
+                    "pk", flat=True
+                )
+            )
+            claimed = [pk for pk in wish_ids if pk in won]
+        else:
+            claimed = []
+        WishTimelineEntry.objects.bulk_create(
+            [WishTimelineEntry(wish_id=pk, author=merchant, message=CLAIM_MESSAGE) for pk in claimed]
+        )
+        if claimed:
+            wishes_claimed.send(sender=WishRequest, merchant=merchant, wish_ids=claimed)
+    claimed_set = set(claimed)
+    return claimed, [pk for pk in wish_ids if pk not in claimed_set]
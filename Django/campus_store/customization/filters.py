@@ -0,0 +1,18 @@
+import django_filters
+
+from .models import WishRequest
+
+
+class WishRequestFilter(django_filters.FilterSet):
+    """
+    `?budget_min=&budget_max=` 按预算区间、`?due_after=&due_before=` 按期望完成日期筛选。
+    """
+
+    budget_min = django_filters.NumberFilter(field_name="budget", lookup_expr="gte")
+    budget_max = django_filters.NumberFilter(field_name="budget", lookup_expr="lte")
+    due_after = django_filters.DateFilter(field_name="due_date", lookup_expr="gte")
+    due_before = django_filters.DateFilter(field_name="due_date", lookup_expr="lte")
+
+    class Meta:
+        model = WishRequest
+        fields = ["status"]
@@ -0,0 +1,100 @@
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from campus_store.customization.models import WishRequest
+from campus_store.customization.views import OpenWishPagination
+
+User = get_user_model()
+INDEX_NAME = "customization_wish_queue_idx"
+# 各数据库在执行计划中表示额外排序的字样
+SORT_MARKERS = ("TEMP B-TREE", "Using filesort", "Sort Key")
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "在不同数据量下查看商家待认领队列首页的执行计划，确认始终走 customization_wish_queue_idx（数据在事务中回滚）"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scales", default="10000,100000", help="逗号分隔的每轮心愿总数，如 10000,1000000")
+        parser.add_argument("--open-ratio", type=float, default=0.05, help="其中待认领（已提交且未分配）的比例")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        scales = [int(value) for value in options["scales"].split(",") if value.strip()]
+        plans = []
+        for scale in scales:
+            try:
+                with transaction.atomic():
+                    self._seed(scale, options)
+                    plans.append((scale, self._explain()))
+                    raise Rollback
+            except Rollback:
+                pass
+
+        for scale, queries in plans:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"== {scale} 条心愿 =="))
+            for label, plan in queries:
+                self.stdout.write(f"-- {label}\n{plan}")
+        bad = [
+            (scale, label)
+            for scale, queries in plans
+            for label, plan in queries
+            if INDEX_NAME not in plan or any(marker in plan for marker in SORT_MARKERS)
+        ]
+        if bad:
+            raise CommandError(f"以下查询未使用 {INDEX_NAME} 或需要额外排序：{bad}")
+        self.stdout.write(self.style.SUCCESS(f"所有规模下的队列查询均按 {INDEX_NAME} 顺序读取，无额外排序"))
+
+    def _seed(self, scale, options):
+        rng = random.Random(options["seed"])
+        consumer, _ = User.objects.get_or_create(username="explain_wish_consumer", defaults={"role": User.Role.CONSUMER})
+        merchant, _ = User.objects.get_or_create(username="explain_wish_merchant", defaults={"role": User.Role.MERCHANT})
+        statuses = [WishRequest.Status.IN_PROGRESS, WishRequest.Status.COMPLETED, WishRequest.Status.REJECTED]
+        today = date.today()
+        batch = []
+        for index in range(scale):
+            is_open = rng.random() < options["open_ratio"]
+            batch.append(
+                WishRequest(
+                    title=f"心愿 {index}",
+                    description="执行计划测试",
+                    consumer=consumer,
+                    merchant=None if is_open else merchant,
+                    status=WishRequest.Status.SUBMITTED if is_open else rng.choice(statuses),
+                    budget=rng.randint(0, 2000),
+                    due_date=today + timedelta(days=rng.randint(1, 90)),
+                )
+            )
+            if len(batch) >= options["batch_size"]:
+                WishRequest.objects.bulk_create(batch)
+                batch = []
+        WishRequest.objects.bulk_create(batch)
+        # 让优化器基于真实分布选择计划
+        with connection.cursor() as cursor:
+            if connection.vendor == "mysql":
+                cursor.execute(f"ANALYZE TABLE {WishRequest._meta.db_table}")
+            elif connection.vendor in ("sqlite", "postgresql"):
+                cursor.execute(f"ANALYZE {WishRequest._meta.db_table}")
+
+    def _explain(self):
+        open_queue = WishRequest.objects.filter(status=WishRequest.Status.SUBMITTED, merchant__isnull=True)
+        ordering = list(OpenWishPagination.ordering)
+        limit = OpenWishPagination.page_size + 1
+        queries = [
+            ("首页", open_queue.order_by(*ordering)[:limit]),
+            (
+                "预算 200-800、30 天内到期",
+                open_queue.filter(
+                    budget__gte=200, budget__lte=800, due_date__lte=date.today() + timedelta(days=30)
+                ).order_by(*ordering)[:limit],
+            ),
+        ]
+        return [(label, queryset.explain()) for label, queryset in queries]
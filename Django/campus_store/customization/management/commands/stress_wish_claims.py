@@ -0,0 +1,110 @@
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from campus_store.customization.claims import MAX_BATCH_CLAIM, claim_wishes
+from campus_store.customization.models import WishRequest, WishTimelineEntry
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "模拟大量商家同时抢认领同一批定制请求，校验每个请求只被认领一次（会写入临时数据，结束后清理）"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--merchants", type=int, default=100, help="参与抢单的商家数")
+        parser.add_argument("--wishes", type=int, default=1000, help="待认领的请求数")
+        parser.add_argument("--workers", type=int, default=50, help="并发线程数（每个线程独占一个数据库连接）")
+        parser.add_argument(
+            "--batch-size", type=int, default=20, help=f"每次认领的请求数（1 为单个认领，最大 {MAX_BATCH_CLAIM}）"
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keep", action="store_true", help="保留生成的数据以便排查")
+
+    def handle(self, *args, **options):
+        batch_size = min(max(options["batch_size"], 1), MAX_BATCH_CLAIM)
+        prefix = f"stress_claim_{uuid.uuid4().hex[:8]}_"
+        User.objects.bulk_create(
+            [User(username=f"{prefix}consumer", role=User.Role.CONSUMER)]
+            + [User(username=f"{prefix}{index}", role=User.Role.MERCHANT) for index in range(options["merchants"])]
+        )
+        consumer = User.objects.get(username=f"{prefix}consumer")
+        merchants = list(User.objects.filter(username__startswith=prefix, role=User.Role.MERCHANT))
+        WishRequest.objects.bulk_create(
+            [
+                WishRequest(
+                    title=f"{prefix}{index}",
+                    description="并发认领压测",
+                    consumer=consumer,
+                    status=WishRequest.Status.SUBMITTED,
+                )
+                for index in range(options["wishes"])
+            ],
+            batch_size=1000,
+        )
+        wishes = WishRequest.objects.filter(title__startswith=prefix)
+        wish_ids = list(wishes.values_list("pk", flat=True))
+        rng = random.Random(options["seed"])
+        # 每个商家以各自的随机顺序尝试认领全部请求
+        plans = {merchant.pk: rng.sample(wish_ids, len(wish_ids)) for merchant in merchants}
+        start = threading.Event()
+
+        def race(merchant):
+            start.wait()
+            won, lost, statements = [], 0, 0
+            try:
+                order = plans[merchant.pk]
+                for offset in range(0, len(order), batch_size):
+                    claimed, conflicts = claim_wishes(merchant, order[offset : offset + batch_size])
+                    won.extend(claimed)
+                    lost += len(conflicts)
+                    statements += 1
+            finally:
+                connection.close()
+            return merchant.pk, won, lost, statements
+
+        try:
+            with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+                futures = [pool.submit(race, merchant) for merchant in merchants]
+                started = time.perf_counter()
+                start.set()
+                errors = [future.exception() for future in futures if future.exception()]
+            elapsed = time.perf_counter() - started
+            results = [future.result() for future in futures if not future.exception()]
+
+            winners = {}
+            duplicates = 0
+            for merchant_id, won, _, _ in results:
+                for wish_id in won:
+                    duplicates += wish_id in winners
+                    winners[wish_id] = merchant_id
+            stored = dict(wishes.values_list("pk", "merchant_id"))
+            mismatched = sum(1 for wish_id, merchant_id in stored.items() if winners.get(wish_id) != merchant_id)
+            timeline = WishTimelineEntry.objects.filter(wish__in=wishes).count()
+            statements = sum(result[3] for result in results)
+            conflicts = sum(result[2] for result in results)
+            spread = Counter(winners.values())
+
+            self.stdout.write(
+                f"耗时 {elapsed:.2f}s，{statements} 次认领请求（{statements / elapsed:.0f} 次/秒）；"
+                f"认领成功 {len(winners)}/{len(wish_ids)}，冲突 {conflicts}，异常 {len(errors)}；"
+                f"获得请求的商家 {len(spread)} 个，单个商家最多 {max(spread.values(), default=0)} 个"
+            )
+            for error in errors[:5]:
+                self.stderr.write(repr(error))
+            if errors or duplicates or mismatched or len(winners) != len(wish_ids) or timeline != len(wish_ids):
+                raise CommandError(
+                    f"认领结果不一致：重复认领 {duplicates}，与数据库不符 {mismatched}，时间线记录 {timeline}"
+                )
+            self.stdout.write(self.style.SUCCESS("每个请求恰好被一个商家认领"))
+        finally:
+            if not options["keep"]:
+                wishes.delete()
+                User.objects.filter(username__startswith=prefix).delete()
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("customization", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="wishrequest",
+            index=models.Index(
+                fields=["status", "merchant", "created_at"],
+                name="customization_wish_queue_idx",
+            ),
+        ),
+    ]
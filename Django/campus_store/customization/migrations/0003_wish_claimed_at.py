@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("customization", "0002_wish_queue_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="wishrequest",
+            name="claimed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -29,11 +29,16 @@ class WishRequest(models.Model):
     budget = models.DecimalField(max_digits=9, decimal_places=2, default=0)
     due_date = models.DateField(null=True, blank=True)
     admin_notes = models.TextField(blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # 商家待认领队列：status = SUBMITTED AND merchant_id IS NULL ORDER BY created_at DESC
+            models.Index(fields=["status", "merchant", "created_at"], name="customization_wish_queue_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -1,6 +1,7 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from .claims import MAX_BATCH_CLAIM
 from .models import WishRequest, WishTimelineEntry
 
 User = get_user_model()
@@ -17,7 +18,6 @@ class WishTimelineSerializer(serializers.ModelSerializer):
 class WishRequestSerializer(serializers.ModelSerializer):
     consumer = serializers.StringRelatedField(read_only=True)
     merchant = serializers.StringRelatedField(read_only=True)
-    timeline = WishTimelineSerializer(many=True, read_only=True)
 
     class Meta:
         model = WishRequest
@@ -32,11 +32,18 @@ class WishRequestSerializer(serializers.ModelSerializer):
             "budget",
             "due_date",
             "admin_notes",
-            "timeline",
+            "claimed_at",
             "created_at",
             "updated_at",
         ]
+        read_only_fields = ["claimed_at"]
 
     def create(self, validated_data):
         validated_data["consumer"] = self.context["request"].user
         return super().create(validated_data)
+
+
+class WishClaimSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=MAX_BATCH_CLAIM
+    )
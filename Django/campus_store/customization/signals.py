@@ -0,0 +1,4 @@
+from django.dispatch import Signal
+
+# 认领成功后发送，参数 merchant、wish_ids；认领用批量写入，不会触发 WishTimelineEntry 的 post_save
+wishes_claimed = Signal()
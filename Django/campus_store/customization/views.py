@@ -1,49 +1,102 @@
 from django.db.models import Q
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 
 from campus_store.accounts.permissions import RolePermission
 
+from .claims import claim_wishes
+from .filters import WishRequestFilter
 from .models import WishRequest, WishTimelineEntry
-from .serializers import WishRequestSerializer, WishTimelineSerializer
+from .serializers import WishClaimSerializer, WishRequestSerializer, WishTimelineSerializer
+
+
+class OpenWishPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    # 与 customization_wish_queue_idx 的列顺序一致（InnoDB 二级索引隐含主键），翻页不需要额外排序
+    ordering = ("-created_at", "-id")
+
+
+class TimelinePagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("created_at", "id")
 
 
 class WishRequestViewSet(viewsets.ModelViewSet):
     serializer_class = WishRequestSerializer
     permission_classes = [RolePermission]
     allowed_roles = ["CONSUMER", "MERCHANT", "ADMIN"]
+    filterset_class = WishRequestFilter
 
     def get_queryset(self):
         user = self.request.user
-        qs = WishRequest.objects.prefetch_related("timeline", "consumer", "merchant")
+        qs = WishRequest.objects.select_related("consumer", "merchant")
+        if self.action == "open":
+            return qs.filter(status=WishRequest.Status.SUBMITTED, merchant__isnull=True)
         if user.role == user.Role.CONSUMER:
             return qs.filter(consumer=user)
         if user.role == user.Role.MERCHANT:
+            # 列表只列自己负责的请求，待认领的走 open 队列；按主键取单条时仍可访问未认领的请求
+            if self.action == "list":
+                return qs.filter(merchant=user)
             return qs.filter(Q(merchant=user) | Q(merchant__isnull=True))
         return qs
 
     def perform_create(self, serializer):
         serializer.save(status=WishRequest.Status.SUBMITTED)
 
+    @action(detail=False, methods=["get"])
+    def open(self, request):
+        """
+        商家待认领队列：已提交且尚未分配商家，按提交时间倒序游标翻页。
+        """
+        if request.user.role not in (request.user.Role.MERCHANT, request.user.Role.ADMIN):
+            return Response({"detail": "仅商家可查看待认领请求"}, status=status.HTTP_403_FORBIDDEN)
+        paginator = OpenWishPagination()
+        page = paginator.paginate_queryset(self.filter_queryset(self.get_queryset()), request, view=self)
+        return paginator.get_paginated_response(self.get_serializer(page, many=True).data)
+
     @action(detail=True, methods=["post"])
     def assign(self, request, pk=None):
-        wish = self.get_object()
         if request.user.role not in (request.user.Role.MERCHANT, request.user.Role.ADMIN):
             return Response({"detail": "无权认领"}, status=status.HTTP_403_FORBIDDEN)
-        wish.merchant = request.user
-        wish.status = WishRequest.Status.IN_PROGRESS
-        wish.save(update_fields=["merchant", "status", "updated_at"])
-        WishTimelineEntry.objects.create(
-            wish=wish,
-            author=request.user,
-            message="商家已认领该定制请求。",
-        )
-        return Response(WishRequestSerializer(wish, context={"request": request}).data)
+        try:
+            wish_id = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound("定制请求不存在")
+        claimed, _ = claim_wishes(request.user, [wish_id])
+        if not claimed:
+            if not WishRequest.objects.filter(pk=wish_id).exists():
+                raise NotFound("定制请求不存在")
+            return Response({"detail": "该请求已被其他商家认领或当前不可认领"}, status=status.HTTP_409_CONFLICT)
+        wish = self.get_queryset().get(pk=wish_id)
+        return Response(self.get_serializer(wish).data)
 
-    @action(detail=True, methods=["post"])
+    @action(detail=False, methods=["post"])
+    def claim(self, request):
+        """
+        批量认领：请求体 {"ids": [...]}，返回认领成功与冲突的 ID 列表。
+        """
+        if request.user.role not in (request.user.Role.MERCHANT, request.user.Role.ADMIN):
+            return Response({"detail": "无权认领"}, status=status.HTTP_403_FORBIDDEN)
+        serializer = WishClaimSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        claimed, conflicts = claim_wishes(request.user, serializer.validated_data["ids"])
+        return Response({"claimed": claimed, "conflicts": conflicts})
+
+    @action(detail=True, methods=["get", "post"])
     def timeline(self, request, pk=None):
         wish = self.get_object()
+        if request.method == "GET":
+            paginator = TimelinePagination()
+            page = paginator.paginate_queryset(wish.timeline.select_related("author"), request, view=self)
+            return paginator.get_paginated_response(WishTimelineSerializer(page, many=True).data)
         serializer = WishTimelineSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         entry = WishTimelineEntry.objects.create(
@@ -0,0 +1,55 @@
+"""
+带进程内连接池的 MySQL 后端。DATABASES 中以 POOL = {"SIZE", "TIMEOUT", "CHECK_AFTER", "RECYCLE"} 配置，
+CONN_MAX_AGE 保持 0：请求结束时 Django 关闭连接，实际是回滚后归还到池中。
+"""
+
+from django.db.backends.mysql import base as mysql_base
+
+from campus_store.db.pool import ConnectionPool, PoolTimeout, get_pool
+
+Database = mysql_base.Database
+
+
+def _ping(conn) -> bool:
+    try:
+        conn.ping()
+    except Database.Error:
+        return False
+    return True
+
+
+class DatabaseWrapper(mysql_base.DatabaseWrapper):
+    def _get_pool(self, conn_params) -> ConnectionPool:
+        options = self.settings_dict.get("POOL") or {}
+        connect = super().get_new_connection
+
+        return get_pool(
+            self.alias,
+            lambda: ConnectionPool(
+                connect=lambda: connect(conn_params),
+                ping=_ping,
+                size=options.get("SIZE", 10),
+                timeout=options.get("TIMEOUT", 10),
+                check_after=options.get("CHECK_AFTER", 30),
+                recycle=options.get("RECYCLE", 1800),
+            ),
+        )
+
+    def get_new_connection(self, conn_params):
+        self.pool = self._get_pool(conn_params)
+        try:
+            return self.pool.acquire()
+        except PoolTimeout as exc:
+            raise Database.OperationalError(str(exc)) from exc
+
+    def _close(self):
+        if self.connection is None:
+            return
+        # 事务中途被关闭的连接状态不明，直接丢弃；其余回滚未提交的语句后归还
+        reusable = not self.in_atomic_block
+        if reusable:
+            try:
+                self.connection.rollback()
+            except Database.Error:
+                reusable = False
+        self.pool.release(self.connection, reusable=reusable)
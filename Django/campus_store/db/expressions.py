@@ -0,0 +1,15 @@
+"""
+无符号计数列的增减：MySQL 上 PositiveIntegerField 为 INT UNSIGNED，`col + (-n)` 在 GREATEST 之前
+就会越界报错（ERROR 1690），因此用条件判断而不是 Greatest(F(col) + delta, 0) 把结果截到 0。
+"""
+
+from django.db.models import Case, F, Value, When
+
+
+def clamped_add(field: str, delta: int):
+    """
+    F(field) + delta，结果不低于 0。
+    """
+    if delta >= 0:
+        return F(field) + delta
+    return Case(When(**{f"{field}__lt": -delta}, then=Value(0)), default=F(field) + delta)
@@ -0,0 +1,75 @@
+import time
+
+from asgiref.sync import iscoroutinefunction
+from django.utils.decorators import sync_and_async_middleware
+from rest_framework.permissions import SAFE_METHODS
+
+from . import querystats
+from .routers import apin_to_primary, pin_to_primary
+
+
+def _wrote(request, response) -> bool:
+    user = getattr(request, "user", None)
+    return (
+        request.method not in SAFE_METHODS and response.status_code < 400 and user is not None and user.is_authenticated
+    )
+
+
+@sync_and_async_middleware
+def replica_pin_middleware(get_response):
+    """
+    用户写入成功后把其读请求短暂固定在 default（读己之写）。DRF 认证后会把用户回写到 request.user。
+    """
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            response = await get_response(request)
+            if _wrote(request, response):
+                await apin_to_primary(request.user.pk)
+            return response
+
+    else:
+
+        def middleware(request):
+            response = get_response(request)
+            if _wrote(request, response):
+                pin_to_primary(request.user.pk)
+            return response
+
+    return middleware
+
+
+@sync_and_async_middleware
+def query_stats_middleware(get_response):
+    """
+    统计每个请求的查询数与数据库耗时（见 campus_store.db.querystats）。应放在中间件列表最前面，以覆盖其余中间件的查询。
+    """
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            stats, token = querystats.start()
+            request.query_stats = stats
+            started = time.perf_counter()
+            try:
+                response = await get_response(request)
+            finally:
+                querystats.stop(token)
+            querystats.finish(request, response, stats, time.perf_counter() - started)
+            return response
+
+    else:
+
+        def middleware(request):
+            stats, token = querystats.start()
+            request.query_stats = stats
+            started = time.perf_counter()
+            try:
+                response = get_response(request)
+            finally:
+                querystats.stop(token)
+            querystats.finish(request, response, stats, time.perf_counter() - started)
+            return response
+
+    return middleware
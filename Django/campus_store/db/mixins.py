@@ -0,0 +1,45 @@
+from django.db import OperationalError
+
+from .querystats import label_request
+from .routers import mark_unhealthy, replica_for, reset_read_alias, set_read_alias
+
+
+class ReplicaReadMixin:
+    """
+    视图的只读请求在认证、鉴权之后改读副本（见 campus_store.db.routers）。
+    """
+
+    read_alias = None
+
+    def dispatch(self, request, *args, **kwargs):
+        self._read_alias_token = None
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            if self._read_alias_token is not None:
+                reset_read_alias(self._read_alias_token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.read_alias = replica_for(request)
+        if self.read_alias:
+            self._read_alias_token = set_read_alias(self.read_alias)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, OperationalError) and self.read_alias:
+            # 副本中途失联，下一个请求立即退回 default，不必等到下次探测
+            mark_unhealthy(self.read_alias)
+        return super().handle_exception(exc)
+
+
+class QueryBudgetMixin:
+    """
+    让查询统计按“视图名.动作”归类，并可用 query_budget / query_time_budget_ms 覆盖全局预算。
+    """
+
+    query_budget = None
+    query_time_budget_ms = None
+
+    def initial(self, request, *args, **kwargs):
+        label_request(request._request, self)
+        super().initial(request, *args, **kwargs)
@@ -0,0 +1,122 @@
+"""
+进程内数据库连接池：ASGI / 多线程部署下每个请求可能落在不同线程，CONN_MAX_AGE 的线程内长连接无法复用，
+改由池子在请求结束时回收连接、下个请求直接取用，省去 TCP 与认证握手。
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    connect() 创建新连接，ping(conn) 返回连接是否可用。
+    空闲超过 check_after 秒的连接取出前先 ping；存活超过 recycle 秒的连接归还时直接关闭。
+    """
+
+    def __init__(self, connect, ping, size=10, timeout=10.0, check_after=30.0, recycle=1800.0):
+        self.connect = connect
+        self.ping = ping
+        self.size = size
+        self.timeout = timeout
+        self.check_after = check_after
+        self.recycle = recycle
+        self._idle = deque()
+        self._created_at = {}
+        self._pending = 0
+        self._condition = threading.Condition()
+        self.opened = 0
+        self.reused = 0
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._condition:
+                while not self._idle and len(self._created_at) + self._pending >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeout(f"连接池已满（{self.size}），等待 {self.timeout:g}s 仍无空闲连接")
+                    self._condition.wait(remaining)
+                if self._idle:
+                    conn, released_at = self._idle.pop()
+                    self.reused += 1
+                else:
+                    # 先占位，连接在锁外建立
+                    conn = None
+                    self._pending += 1
+            if conn is None:
+                return self._open()
+            if time.monotonic() - released_at < self.check_after or self.ping(conn):
+                return conn
+            self._discard(conn)
+
+    def release(self, conn, reusable=True):
+        with self._condition:
+            created_at = self._created_at.get(id(conn))
+        if not reusable or created_at is None or time.monotonic() - created_at > self.recycle:
+            self._discard(conn)
+            return
+        with self._condition:
+            self._idle.append((conn, time.monotonic()))
+            self._condition.notify()
+
+    def close_all(self):
+        with self._condition:
+            idle, self._idle = list(self._idle), deque()
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def stats(self) -> dict:
+        with self._condition:
+            idle = len(self._idle)
+            total = len(self._created_at)
+        return {"size": self.size, "open": total, "idle": idle, "opened": self.opened, "reused": self.reused}
+
+    def _open(self):
+        conn = None
+        try:
+            conn = self.connect()
+        finally:
+            with self._condition:
+                self._pending -= 1
+                if conn is not None:
+                    self._created_at[id(conn)] = time.monotonic()
+                    self.opened += 1
+                self._condition.notify()
+        return conn
+
+    def _discard(self, conn):
+        with self._condition:
+            self._created_at.pop(id(conn), None)
+            self._condition.notify()
+        try:
+            conn.close()
+        except Exception:  # noqa: BLE001
+            pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, factory) -> ConnectionPool:
+    """
+    按 (进程号, key) 复用连接池；fork 出的子进程不会继承父进程的连接。
+    """
+    key = (os.getpid(), key)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = factory()
+        return pool
+
+
+def all_pools() -> list[ConnectionPool]:
+    pid = os.getpid()
+    with _pools_lock:
+        return [pool for (owner, _), pool in _pools.items() if owner == pid]
@@ -0,0 +1,224 @@
+"""
+按请求统计查询数与数据库耗时：每个数据库连接首次建立时挂上 execute_wrapper，
+查询计入当前请求上下文中的 QueryStats（异步 ORM 在线程中执行时同样带着该上下文）。
+中间件据此输出 Server-Timing、记录超出预算的请求，并按接口汇总直方图（每个进程各自统计）。
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from campus_store.metrics import request_method
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+DB_TIME_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000)
+TOP_FINGERPRINTS = 5
+
+_current = ContextVar("campus_store_query_stats", default=None)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s|\?")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_ROWS = re.compile(r"(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """
+    把字面量与占位符替换为 ?、IN 列表与批量 VALUES 折叠，参数不同的同一条语句得到相同指纹。
+    """
+    normalized = _LITERALS.sub("?", sql)
+    normalized = _IN_LISTS.sub("(...)", normalized)
+    normalized = _VALUES_ROWS.sub(r"\1", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def fingerprint_id(normalized: str) -> str:
+    return hashlib.md5(normalized.encode()).hexdigest()[:12]
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+        self.statement_time = Counter()
+        self.slow = []
+
+    def add(self, sql, duration):
+        normalized = fingerprint(sql)
+        self.count += 1
+        self.duration += duration
+        self.statements[normalized] += 1
+        self.statement_time[normalized] += duration
+        if duration * 1000 >= settings.SLOW_QUERY_MS:
+            self.slow.append((normalized, duration))
+
+    def top(self, limit=TOP_FINGERPRINTS) -> list[dict]:
+        return [
+            {
+                "fingerprint": fingerprint_id(normalized),
+                "count": count,
+                "ms": round(self.statement_time[normalized] * 1000, 2),
+                "sql": normalized,
+            }
+            for normalized, count in self.statements.most_common(limit)
+        ]
+
+
+def _record(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.add(sql, time.perf_counter() - started)
+
+
+def install(sender=None, connection=None, **kwargs):
+    # connection_created 在重连时也会触发，包装函数只挂一次
+    if connection is not None and _record not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record)
+
+
+connection_created.connect(install)
+# 本模块导入前当前线程已建立的连接不会再触发 connection_created
+for _connection in connections.all(initialized_only=True):
+    install(connection=_connection)
+
+
+def start():
+    stats = QueryStats()
+    return stats, _current.set(stats)
+
+
+def stop(token) -> None:
+    _current.reset(token)
+
+
+def label_request(request, view) -> None:
+    """
+    把视图名与视图上声明的预算记到 Django 请求上，供中间件归类与判断是否超出预算。
+    """
+    request.query_endpoint = f"{type(view).__name__}.{getattr(view, 'action', None) or request_method(request).lower()}"
+    request.query_budget = getattr(view, "query_budget", None)
+    request.query_time_budget_ms = getattr(view, "query_time_budget_ms", None)
+
+
+def endpoint_of(request) -> str:
+    label = getattr(request, "query_endpoint", None)
+    if label:
+        return label
+    match = getattr(request, "resolver_match", None)
+    return f"{request_method(request)} {match.route if match else 'unmatched'}"
+
+
+def _histogram(buckets, value):
+    return bisect_left(buckets, value)
+
+
+class EndpointStats:
+    def __init__(self):
+        self.requests = 0
+        self.over_budget = 0
+        self.queries = 0
+        self.db_time = 0.0
+        self.max_queries = 0
+        self.query_histogram = [0] * (len(QUERY_COUNT_BUCKETS) + 1)
+        self.time_histogram = [0] * (len(DB_TIME_BUCKETS_MS) + 1)
+        self.offenders = Counter()
+        self.offender_sql = {}
+
+    def add(self, stats, over_budget):
+        self.requests += 1
+        self.queries += stats.count
+        self.db_time += stats.duration
+        self.max_queries = max(self.max_queries, stats.count)
+        self.query_histogram[_histogram(QUERY_COUNT_BUCKETS, stats.count)] += 1
+        self.time_histogram[_histogram(DB_TIME_BUCKETS_MS, stats.duration * 1000)] += 1
+        if over_budget:
+            self.over_budget += 1
+            for item in stats.top(TOP_FINGERPRINTS):
+                self.offenders[item["fingerprint"]] += item["count"]
+                self.offender_sql[item["fingerprint"]] = item["sql"]
+
+    def as_dict(self, endpoint) -> dict:
+        return {
+            "endpoint": endpoint,
+            "requests": self.requests,
+            "over_budget": self.over_budget,
+            "avg_queries": round(self.queries / self.requests, 2) if self.requests else 0,
+            "max_queries": self.max_queries,
+            "avg_db_ms": round(self.db_time * 1000 / self.requests, 2) if self.requests else 0,
+            "query_histogram": _buckets(QUERY_COUNT_BUCKETS, self.query_histogram),
+            "db_ms_histogram": _buckets(DB_TIME_BUCKETS_MS, self.time_histogram),
+            "top_fingerprints": [
+                {"fingerprint": key, "count": count, "sql": self.offender_sql[key]}
+                for key, count in self.offenders.most_common(TOP_FINGERPRINTS)
+            ],
+        }
+
+
+def _buckets(bounds, counts) -> list[dict]:
+    return [{"le": bound, "count": count} for bound, count in zip([*bounds, "+Inf"], counts)]
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def finish(request, response, stats, elapsed) -> None:
+    """
+    请求结束时调用：写入 Server-Timing、汇总到接口统计，超出预算或有慢查询时记日志。
+    """
+    endpoint = endpoint_of(request)
+    budget = getattr(request, "query_budget", None) or settings.QUERY_BUDGET
+    time_budget = getattr(request, "query_time_budget_ms", None) or settings.QUERY_TIME_BUDGET_MS
+    db_ms = stats.duration * 1000
+    over_budget = stats.count > budget or db_ms > time_budget
+
+    if settings.QUERY_STATS_SERVER_TIMING:
+        response["Server-Timing"] = (
+            f'db;dur={db_ms:.1f};desc="{stats.count} queries", app;dur={max(elapsed * 1000 - db_ms, 0):.1f}'
+        )
+    with _registry_lock:
+        _registry.setdefault(endpoint, EndpointStats()).add(stats, over_budget)
+
+    if over_budget:
+        logger.warning(
+            "%s 超出查询预算：%d 条查询（预算 %d），数据库耗时 %.1fms（预算 %dms），最多的语句：%s",
+            endpoint,
+            stats.count,
+            budget,
+            db_ms,
+            time_budget,
+            "; ".join(f"[{item['count']}x {item['fingerprint']}] {item['sql'][:200]}" for item in stats.top(3)),
+        )
+    for normalized, duration in stats.slow:
+        logger.warning(
+            "%s 慢查询 %.1fms [%s] %s", endpoint, duration * 1000, fingerprint_id(normalized), normalized[:500]
+        )
+
+
+def snapshot() -> list[dict]:
+    with _registry_lock:
+        rows = [stats.as_dict(endpoint) for endpoint, stats in _registry.items()]
+    rows.sort(key=lambda row: (row["over_budget"], row["avg_queries"]), reverse=True)
+    return rows
+
+
+def reset() -> None:
+    with _registry_lock:
+        _registry.clear()
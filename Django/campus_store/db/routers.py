@@ -0,0 +1,103 @@
+"""
+只读副本路由：请求开始时由 ReplicaReadMixin 选定一个健康的副本写入上下文变量，
+该请求内的读查询都走这个副本；写入始终走 default。
+
+用户写入成功后的 READ_YOUR_WRITES_SECONDS 秒内，其读请求固定走 default，避免因复制延迟读不到刚写的数据。
+副本每 REPLICA_HEALTH_INTERVAL 秒探测一次，不可用时自动退回 default。
+"""
+
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+_read_alias = ContextVar("campus_store_read_alias", default=None)
+_health = {}
+_health_lock = threading.Lock()
+
+
+def replica_aliases() -> list[str]:
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def set_read_alias(alias):
+    return _read_alias.set(alias)
+
+
+def reset_read_alias(token) -> None:
+    _read_alias.reset(token)
+
+
+def _pin_key(user_id) -> str:
+    return f"db:pin:{user_id}"
+
+
+def pin_to_primary(user_id) -> None:
+    cache.set(_pin_key(user_id), True, settings.READ_YOUR_WRITES_SECONDS)
+
+
+async def apin_to_primary(user_id) -> None:
+    await cache.aset(_pin_key(user_id), True, settings.READ_YOUR_WRITES_SECONDS)
+
+
+def is_pinned(user) -> bool:
+    return bool(user and user.is_authenticated and cache.get(_pin_key(user.pk)))
+
+
+def mark_unhealthy(alias) -> None:
+    with _health_lock:
+        _health[alias] = (False, time.monotonic())
+
+
+def replica_healthy(alias) -> bool:
+    now = time.monotonic()
+    with _health_lock:
+        healthy, checked_at = _health.get(alias, (True, None))
+    if checked_at is not None and now - checked_at < settings.REPLICA_HEALTH_INTERVAL:
+        return healthy
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute("SELECT 1")
+        healthy = True
+    except DatabaseError:
+        connections[alias].close()
+        healthy = False
+    with _health_lock:
+        _health[alias] = (healthy, now)
+    return healthy
+
+
+def replica_for(request):
+    """
+    返回本次请求应读取的副本别名；写请求、写后固定窗口内或没有可用副本时返回 None（即读 default）。
+    """
+    aliases = replica_aliases()
+    if not aliases or request.method not in SAFE_METHODS or is_pinned(request.user):
+        return None
+    healthy = [alias for alias in aliases if replica_healthy(alias)]
+    return random.choice(healthy) if healthy else None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        # 显式返回 default：否则从副本读出的对象保存时会按其 _state.db 写回副本
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
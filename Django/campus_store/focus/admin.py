@@ -1,12 +1,12 @@
 from django.contrib import admin
 
-from .models import FocusVideo, FocusVideoComment, FocusVideoLike
+from .models import FocusVideo, FocusVideoComment, FocusVideoLike, VideoTranscodeJob
 
 
 @admin.register(FocusVideo)
 class FocusVideoAdmin(admin.ModelAdmin):
-    list_display = ("id", "title", "creator", "status", "like_count", "comment_count", "created_at")
-    list_filter = ("status", "created_at")
+    list_display = ("id", "title", "creator", "status", "processing_status", "like_count", "comment_count", "created_at")
+    list_filter = ("status", "processing_status", "created_at")
     search_fields = ("title", "creator__username")
 
 
@@ -19,3 +19,9 @@ class FocusVideoCommentAdmin(admin.ModelAdmin):
 @admin.register(FocusVideoLike)
 class FocusVideoLikeAdmin(admin.ModelAdmin):
     list_display = ("id", "video", "user", "created_at")
+
+
+@admin.register(VideoTranscodeJob)
+class VideoTranscodeJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "video", "status", "attempts", "created_at", "finished_at")
+    list_filter = ("status",)
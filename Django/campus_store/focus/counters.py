@@ -0,0 +1,45 @@
+"""
+焦点视频计数的校对：按真实点赞/评论重新计数，修正漂移。
+"""
+
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import FocusVideo, FocusVideoComment, FocusVideoLike
+
+COUNTER_SOURCES = {"like_count": FocusVideoLike, "comment_count": FocusVideoComment}
+
+
+def _count(model):
+    counted = model.objects.filter(video=OuterRef("pk")).order_by().values("video").annotate(total=Count("id"))
+    return Coalesce(Subquery(counted.values("total"), output_field=IntegerField()), Value(0))
+
+
+def reconcile_focus_counters(batch_size: int = 500, dry_run: bool = False) -> tuple[int, int]:
+    """
+    返回 (检查的视频数, 修正的视频数)。按主键分批处理，每批一次读取加一次批量写回。
+    """
+    annotations = {f"actual_{field}": _count(model) for field, model in COUNTER_SOURCES.items()}
+    checked = fixed = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            FocusVideo.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .annotate(**annotations)
+            .only("id", *COUNTER_SOURCES)[:batch_size]
+        )
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        checked += len(batch)
+        changed = []
+        for video in batch:
+            if any(getattr(video, field) != getattr(video, f"actual_{field}") for field in COUNTER_SOURCES):
+                for field in COUNTER_SOURCES:
+                    setattr(video, field, getattr(video, f"actual_{field}"))
+                changed.append(video)
+        fixed += len(changed)
+        if changed and not dry_run:
+            FocusVideo.objects.bulk_update(changed, list(COUNTER_SOURCES))
+    return checked, fixed
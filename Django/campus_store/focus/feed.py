@@ -0,0 +1,35 @@
+"""
+焦点视频动态流：按页批量加载当前用户的点赞状态与每个视频的最新评论。
+"""
+
+from campus_store.queries import group_rows, latest_per_group
+
+from .models import FocusVideoComment, FocusVideoLike
+
+COMMENT_PREVIEW_LIMIT = 5
+
+
+def liked_video_ids(user, video_ids) -> set[int]:
+    if not user or not user.is_authenticated or not video_ids:
+        return set()
+    return set(FocusVideoLike.objects.filter(user=user, video_id__in=video_ids).values_list("video_id", flat=True))
+
+
+def comment_previews(video_ids, limit: int = COMMENT_PREVIEW_LIMIT) -> dict:
+    if not video_ids or not limit:
+        return {}
+    latest = latest_per_group(
+        FocusVideoComment.objects.filter(video_id__in=video_ids).select_related("author"), "video_id", limit
+    )
+    return group_rows(latest, "video_id")
+
+
+def load_feed(videos, user=None, with_comments: bool = True) -> dict:
+    """
+    无论一页有多少视频、每个视频有多少点赞和评论，都只产生固定数量的查询。
+    """
+    video_ids = [video.pk for video in videos]
+    return {
+        "liked_video_ids": liked_video_ids(user, video_ids),
+        "comment_previews": comment_previews(video_ids) if with_comments else {},
+    }
@@ -0,0 +1,34 @@
+"""
+焦点视频点赞：一条条件删除或一条插入完成切换，并在同一事务中按影响行数调整计数。
+"""
+
+from django.db import IntegrityError, transaction
+
+from .models import FocusVideoLike
+
+MAX_ATTEMPTS = 3
+
+
+class LikeConflict(Exception):
+    pass
+
+
+def toggle_like(video, user) -> bool:
+    """
+    返回操作后当前用户是否点赞了该视频。
+    """
+    for _ in range(MAX_ATTEMPTS):
+        with transaction.atomic():
+            removed, _ = FocusVideoLike.objects.filter(video=video, user=user).delete()
+            if removed:
+                video.bump_counters(likes=-1)
+                return False
+            try:
+                with transaction.atomic():
+                    FocusVideoLike.objects.create(video=video, user=user)
+            except IntegrityError:
+                # 同一用户的并发请求已插入点赞，重试以走取消分支
+                continue
+            video.bump_counters(likes=1)
+            return True
+    raise LikeConflict
@@ -0,0 +1,91 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from campus_store.focus.models import FocusVideo, FocusVideoComment, FocusVideoLike
+from campus_store.focus.views import FocusVideoViewSet
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "在不同视频数与点赞/评论规模下请求焦点视频动态流，校验查询数固定（数据在事务中回滚）"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--videos", default="5,20", help="逗号分隔的每轮视频数（一页最多 20 个）")
+        parser.add_argument("--scales", default="5,200", help="逗号分隔的每轮每个视频点赞/评论数")
+        parser.add_argument("--repeat", type=int, default=3, help="每轮重复请求次数")
+        parser.add_argument("--without-comments", action="store_true", help="请求时带 with_comments=0，只测点赞相关查询")
+
+    def handle(self, *args, **options):
+        video_counts = [int(value) for value in options["videos"].split(",") if value.strip()]
+        scales = [int(value) for value in options["scales"].split(",") if value.strip()]
+        results = []
+        for video_count, scale in zip(video_counts, scales):
+            try:
+                with transaction.atomic():
+                    viewer = self._seed(video_count, scale)
+                    measured = self._measure(viewer, options["repeat"], options["without_comments"])
+                    results.append((video_count, scale, *measured))
+                    raise Rollback
+            except Rollback:
+                pass
+
+        self.stdout.write(f"{'视频数':>6}{'互动/视频':>10}{'查询数':>8}{'中位耗时(ms)':>14}")
+        for video_count, scale, queries, elapsed in results:
+            self.stdout.write(f"{video_count:>6}{scale:>10}{queries:>8}{elapsed * 1000:>14.1f}")
+        if len({queries for _, _, queries, _ in results}) > 1:
+            raise CommandError("动态流查询数随视频数或互动量变化，存在 N+1 查询")
+        self.stdout.write(self.style.SUCCESS("查询数固定，与视频数和互动量无关"))
+
+    def _seed(self, video_count, scale):
+        prefix = f"bench_focus_{scale}_"
+        User.objects.bulk_create(
+            [User(username=f"{prefix}{index}", role=User.Role.CONSUMER) for index in range(scale + 1)]
+        )
+        users = list(User.objects.filter(username__startswith=prefix).order_by("pk"))
+        viewer, fans = users[0], users[1:]
+        FocusVideo.objects.bulk_create(
+            [
+                FocusVideo(creator=viewer, title=f"视频 {index}", video=f"focus/videos/bench_{index}.mp4")
+                for index in range(video_count)
+            ]
+        )
+        videos = list(FocusVideo.objects.filter(creator=viewer))
+        FocusVideoLike.objects.bulk_create(
+            [FocusVideoLike(user=fan, video=video) for video in videos for fan in fans]
+            + [FocusVideoLike(user=viewer, video=video) for video in videos[::2]],
+            batch_size=1000,
+        )
+        FocusVideoComment.objects.bulk_create(
+            [
+                FocusVideoComment(video=video, author=fan, content=f"评论 {fan.pk}")
+                for video in videos
+                for fan in fans
+            ],
+            batch_size=1000,
+        )
+        return viewer
+
+    def _measure(self, viewer, repeat, without_comments):
+        view = FocusVideoViewSet.as_view({"get": "list"})
+        timings = []
+        for _ in range(repeat):
+            params = {"with_comments": "0"} if without_comments else {}
+            request = APIRequestFactory().get("/api/focus/videos/", params, HTTP_HOST="localhost")
+            force_authenticate(request, user=viewer)
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = view(request)
+                response.render()
+                timings.append(time.perf_counter() - started)
+        return len(captured), statistics.median(timings)
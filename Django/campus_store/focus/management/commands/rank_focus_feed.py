@@ -0,0 +1,31 @@
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+
+from campus_store.focus.ranking import RANKING_TTL, materialize_rankings
+
+
+class Command(BaseCommand):
+    help = "为在架焦点视频打分，把全站及个性化排序列表写入共享缓存（需定时或常驻运行）"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="按 --interval 持续重算")
+        parser.add_argument("--interval", type=float, default=300.0, help="重算间隔（秒），应小于缓存有效期")
+        parser.add_argument("--global-only", action="store_true", help="只计算全站列表，不生成个性化列表")
+
+    def handle(self, *args, **options):
+        if isinstance(caches["default"], LocMemCache):
+            # 进程内缓存只对本命令可见，写入的列表到不了 Web 进程
+            raise CommandError("需要共享缓存：请配置 DJANGO_CACHE_URL（如 redis://127.0.0.1:6379/0）")
+        if options["loop"] and options["interval"] >= RANKING_TTL:
+            self.stderr.write(f"重算间隔不小于缓存有效期 {RANKING_TTL} 秒，列表过期后请求会临时只用全站排序")
+        while True:
+            started = time.perf_counter()
+            version, lists = materialize_rankings(personalized=not options["global_only"])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"排序版本 {version}：写入 {lists} 个列表，耗时 {elapsed:.2f}s")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from campus_store.focus.counters import reconcile_focus_counters
+
+
+class Command(BaseCommand):
+    help = "按真实点赞与评论校对焦点视频计数（建议在低峰期定时运行）"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="每批处理的视频数")
+        parser.add_argument("--dry-run", action="store_true", help="只统计计数有偏差的视频，不写入")
+
+    def handle(self, *args, **options):
+        checked, fixed = reconcile_focus_counters(batch_size=options["batch_size"], dry_run=options["dry_run"])
+        verb = "发现" if options["dry_run"] else "已修正"
+        self.stdout.write(self.style.SUCCESS(f"检查 {checked} 个视频，{verb} {fixed} 个计数偏差"))
@@ -0,0 +1,71 @@
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from campus_store.focus.models import FocusVideo, VideoTranscodeJob
+from campus_store.focus.transcoding import claim_jobs, enqueue_transcode, requeue_stale_jobs, run_transcode_job
+
+
+class Command(BaseCommand):
+    help = "在进程池中处理焦点视频转码任务：生成低码率版本与封面帧（适合由 supervisor 常驻运行）"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=settings.FOCUS_TRANSCODE_WORKERS, help="同时进行的转码任务数"
+        )
+        parser.add_argument("--loop", action="store_true", help="持续轮询新任务")
+        parser.add_argument("--interval", type=float, default=5.0, help="轮询间隔（秒）")
+        parser.add_argument(
+            "--stale-minutes", type=int, default=120, help="RUNNING 超过多少分钟视为进程已崩溃并重新排队"
+        )
+        parser.add_argument("--enqueue-missing", action="store_true", help="先为尚无转码版本的视频补排任务")
+
+    def handle(self, *args, **options):
+        if options["enqueue_missing"]:
+            queued = VideoTranscodeJob.objects.filter(
+                status__in=[VideoTranscodeJob.Status.PENDING, VideoTranscodeJob.Status.RUNNING]
+            ).values("video_id")
+            missing = FocusVideo.objects.filter(renditions={}).exclude(pk__in=queued)
+            queued_count = 0
+            for video in missing.iterator():
+                enqueue_transcode(video)
+                queued_count += 1
+            self.stdout.write(f"已补排 {queued_count} 个视频")
+
+        workers = max(1, options["workers"])
+        # spawn 启动的子进程重新初始化 Django，不会继承父进程的数据库连接
+        connections.close_all()
+        context = multiprocessing.get_context("spawn")
+        running = {}
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=django.setup) as pool:
+            while True:
+                requeue_stale_jobs(options["stale_minutes"])
+                for job_id in claim_jobs(workers - len(running)):
+                    running[pool.submit(run_transcode_job, job_id)] = job_id
+                if not running:
+                    if not options["loop"]:
+                        break
+                    time.sleep(options["interval"])
+                    continue
+                done, _ = wait(running, timeout=options["interval"], return_when=FIRST_COMPLETED)
+                for future in done:
+                    job_id = running.pop(future)
+                    try:
+                        self.stdout.write(f"转码任务 {job_id}：{future.result()}")
+                    except BrokenProcessPool as exc:
+                        # 子进程被杀（如内存不足）后进程池不可再用，任务放回队列并退出，由 supervisor 重启
+                        VideoTranscodeJob.objects.filter(pk__in=[job_id, *running.values()]).update(
+                            status=VideoTranscodeJob.Status.PENDING
+                        )
+                        raise CommandError(f"转码进程异常退出：{exc}") from exc
+                    except Exception as exc:  # noqa: BLE001
+                        VideoTranscodeJob.objects.filter(pk=job_id).update(
+                            status=VideoTranscodeJob.Status.FAILED, error=str(exc)
+                        )
+                        self.stderr.write(f"转码任务 {job_id} 异常：{exc}")
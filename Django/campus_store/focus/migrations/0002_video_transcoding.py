@@ -0,0 +1,99 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("focus", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="focusvideo",
+            name="poster",
+            field=models.ImageField(blank=True, upload_to="focus/posters/"),
+        ),
+        # 已有视频直接标记为就绪（播放原文件），需要转码时用 run_focus_transcoder --enqueue-missing 补排
+        migrations.AddField(
+            model_name="focusvideo",
+            name="processing_status",
+            field=models.CharField(
+                choices=[
+                    ("PENDING", "等待转码"),
+                    ("PROCESSING", "转码中"),
+                    ("READY", "已就绪"),
+                    ("FAILED", "转码失败"),
+                ],
+                default="READY",
+                max_length=20,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="focusvideo",
+            name="processing_status",
+            field=models.CharField(
+                choices=[
+                    ("PENDING", "等待转码"),
+                    ("PROCESSING", "转码中"),
+                    ("READY", "已就绪"),
+                    ("FAILED", "转码失败"),
+                ],
+                default="PENDING",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="focusvideo",
+            name="renditions",
+            field=models.JSONField(blank=True, default=dict, help_text="清晰度 → 相对 MEDIA_ROOT 的文件名"),
+        ),
+        migrations.CreateModel(
+            name="VideoTranscodeJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "排队中"),
+                            ("RUNNING", "处理中"),
+                            ("COMPLETED", "已完成"),
+                            ("FAILED", "失败"),
+                        ],
+                        default="PENDING",
+                        max_length=20,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "video",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="transcode_jobs",
+                        to="focus.focusvideo",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "created_at"],
+                        name="focus_transcode_status_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,12 +1,20 @@
 from django.conf import settings
 from django.db import models
 
+from campus_store.db.expressions import clamped_add
+
 
 class FocusVideo(models.Model):
     class Status(models.TextChoices):
         ACTIVE = "ACTIVE", "正常"
         DISABLED = "DISABLED", "已下架"
 
+    class ProcessingStatus(models.TextChoices):
+        PENDING = "PENDING", "等待转码"
+        PROCESSING = "PROCESSING", "转码中"
+        READY = "READY", "已就绪"
+        FAILED = "FAILED", "转码失败"
+
     creator = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         related_name="focus_videos",
@@ -17,6 +25,11 @@ class FocusVideo(models.Model):
     video = models.FileField(upload_to="focus/videos/")
     cover_image = models.ImageField(upload_to="focus/covers/", blank=True)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.ACTIVE)
+    processing_status = models.CharField(
+        max_length=20, choices=ProcessingStatus.choices, default=ProcessingStatus.PENDING
+    )
+    renditions = models.JSONField(default=dict, blank=True, help_text="清晰度 → 相对 MEDIA_ROOT 的文件名")
+    poster = models.ImageField(upload_to="focus/posters/", blank=True)
     like_count = models.PositiveIntegerField(default=0)
     comment_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -28,6 +41,41 @@ class FocusVideo(models.Model):
     def __str__(self) -> str:
         return f"{self.title} by {self.creator}"
 
+    def bump_counters(self, likes: int = 0, comments: int = 0) -> None:
+        """
+        以 F() 表达式原子地增减计数，需与点赞/评论的写入放在同一事务中。
+        """
+        changes = {}
+        if likes:
+            changes["like_count"] = clamped_add("like_count", likes)
+        if comments:
+            changes["comment_count"] = clamped_add("comment_count", comments)
+        if changes:
+            FocusVideo.objects.filter(pk=self.pk).update(**changes)
+
+
+class VideoTranscodeJob(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "排队中"
+        RUNNING = "RUNNING", "处理中"
+        COMPLETED = "COMPLETED", "已完成"
+        FAILED = "FAILED", "失败"
+
+    video = models.ForeignKey(FocusVideo, related_name="transcode_jobs", on_delete=models.CASCADE)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=["status", "created_at"], name="focus_transcode_status_idx")]
+
+    def __str__(self) -> str:
+        return f"转码任务 #{self.pk} ({self.status})"
+
 
 class FocusVideoLike(models.Model):
     user = models.ForeignKey(
@@ -0,0 +1,194 @@
+"""
+焦点视频动态流排序：由 rank_focus_feed 定期为在架视频打分，把排好序的视频 ID 列表写入共享缓存。
+
+打分 = (1 + 近期点赞/评论 + 少量累计互动) / (发布小时数 + 2) ^ GRAVITY，
+近期有点赞的用户另有一份按其偏好的创作者加权的列表，其余用户读全站列表。
+每次计算生成一个新版本，旧版本在过期前仍可读取，翻页中途重新计算也不会跳页。
+"""
+
+import base64
+import binascii
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from campus_store.metrics import observe_cache
+
+from .models import FocusVideo, FocusVideoComment, FocusVideoLike
+
+RANKING_VERSION_KEY = "focus:ranking:version"
+RANKING_TTL = 30 * 60
+# 列表与上一版本号比当前版本号多保留一段时间，重算期间仍可读取
+RANKING_LAST_VERSION_KEY = "focus:ranking:last-version"
+RANKING_STALE_TTL = RANKING_TTL + 10 * 60
+REBUILD_LOCK_KEY = "focus:ranking:rebuild-lock"
+REBUILD_LOCK_TTL = 60
+GLOBAL_SEGMENT = "global"
+# 还没有任何排序版本（冷启动）时游标使用的版本号，动态流只按发布时间倒序
+RECENCY_VERSION = "0"
+
+MAX_AGE_DAYS = 60
+VELOCITY_WINDOW = timedelta(hours=48)
+AFFINITY_WINDOW = timedelta(days=30)
+LIKE_WEIGHT = 1.0
+COMMENT_WEIGHT = 2.0
+LIFETIME_WEIGHT = 0.1
+GRAVITY = 1.5
+# 某创作者占用户近期点赞的比例为 p 时，该创作者的视频得分乘以 1 + AFFINITY_WEIGHT * p
+AFFINITY_WEIGHT = 3.0
+GLOBAL_LIST_SIZE = 1000
+USER_LIST_SIZE = 300
+
+
+def _segment_key(version: str, segment: str) -> str:
+    return f"focus:ranking:{version}:{segment}"
+
+
+def user_segment(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def _recent_count(model, since):
+    counted = (
+        model.objects.filter(video=OuterRef("pk"), created_at__gte=since)
+        .order_by()
+        .values("video")
+        .annotate(total=Count("id"))
+    )
+    return Coalesce(Subquery(counted.values("total"), output_field=IntegerField()), Value(0))
+
+
+def score_videos(now=None) -> list[tuple[float, int, int]]:
+    """
+    返回 (得分, 视频 ID, 创作者 ID)，按得分从高到低排列。
+    """
+    now = now or timezone.now()
+    since = now - VELOCITY_WINDOW
+    rows = (
+        FocusVideo.objects.filter(status=FocusVideo.Status.ACTIVE, created_at__gte=now - timedelta(days=MAX_AGE_DAYS))
+        .annotate(
+            recent_likes=_recent_count(FocusVideoLike, since),
+            recent_comments=_recent_count(FocusVideoComment, since),
+        )
+        .values_list("pk", "creator_id", "created_at", "like_count", "comment_count", "recent_likes", "recent_comments")
+    )
+    scored = []
+    for pk, creator_id, created_at, likes, comments, recent_likes, recent_comments in rows:
+        engagement = (
+            1
+            + LIKE_WEIGHT * recent_likes
+            + COMMENT_WEIGHT * recent_comments
+            + LIFETIME_WEIGHT * (likes + COMMENT_WEIGHT * comments)
+        )
+        age_hours = max((now - created_at).total_seconds() / 3600, 0)
+        scored.append((engagement / (age_hours + 2) ** GRAVITY, pk, creator_id))
+    scored.sort(key=lambda row: (row[0], row[1]), reverse=True)
+    return scored
+
+
+def creator_affinity(now=None) -> dict[int, dict[int, float]]:
+    """
+    用户 ID → {创作者 ID: 该创作者占用户近期点赞的比例}。
+    """
+    now = now or timezone.now()
+    rows = (
+        FocusVideoLike.objects.filter(created_at__gte=now - AFFINITY_WINDOW)
+        .order_by()
+        .values_list("user_id", "video__creator_id")
+        .annotate(total=Count("id"))
+    )
+    per_user = defaultdict(Counter)
+    for user_id, creator_id, total in rows:
+        per_user[user_id][creator_id] += total
+    return {
+        user_id: {creator_id: total / sum(counts.values()) for creator_id, total in counts.items()}
+        for user_id, counts in per_user.items()
+    }
+
+
+def personalize(scored, affinity: dict[int, float]) -> list[int]:
+    boosted = [(score * (1 + AFFINITY_WEIGHT * affinity.get(creator_id, 0)), pk) for score, pk, creator_id in scored]
+    boosted.sort(reverse=True)
+    return [pk for _, pk in boosted[:USER_LIST_SIZE]]
+
+
+def materialize_rankings(personalized: bool = True, replace: bool = True) -> tuple[str, int]:
+    """
+    计算并写入新版本的排序列表，返回 (版本号, 写入的列表数)。
+    replace=False 时若已有当前版本（如 rank_focus_feed 刚写入的个性化版本）则保留它并返回其版本号。
+    """
+    now = timezone.now()
+    version = str(time.time_ns())
+    scored = score_videos(now)[:GLOBAL_LIST_SIZE]
+    lists = {_segment_key(version, GLOBAL_SEGMENT): [pk for _, pk, _ in scored]}
+    if personalized:
+        for user_id, affinity in creator_affinity(now).items():
+            lists[_segment_key(version, user_segment(user_id))] = personalize(scored, affinity)
+    cache.set_many(lists, RANKING_STALE_TTL)
+    # 列表写完后再切换版本，读取方不会看到半成品
+    if replace:
+        cache.set(RANKING_VERSION_KEY, version, RANKING_TTL)
+    elif not cache.add(RANKING_VERSION_KEY, version, RANKING_TTL):
+        return cache.get(RANKING_VERSION_KEY) or version, len(lists)
+    cache.set(RANKING_LAST_VERSION_KEY, version, RANKING_STALE_TTL)
+    return version, len(lists)
+
+
+def current_version() -> str | None:
+    """
+    当前版本号。缓存为空时只有拿到锁的一个请求临时计算全站列表，其余请求沿用上一版本；
+    冷启动时还没有上一版本，返回 None（动态流按发布时间倒序）。不在这里等待：ASGI 下本函数
+    运行在共享的同步线程中，等待会拖住其他请求。
+    """
+    version = cache.get(RANKING_VERSION_KEY)
+    observe_cache("focus_ranking_version", version is not None)
+    if version is not None:
+        return version
+    if cache.add(REBUILD_LOCK_KEY, 1, REBUILD_LOCK_TTL):
+        try:
+            # 排序任务尚未运行或缓存已过期，只计算全站列表以免阻塞请求太久
+            version, _ = materialize_rankings(personalized=False, replace=False)
+        finally:
+            cache.delete(REBUILD_LOCK_KEY)
+        return version
+    return cache.get(RANKING_LAST_VERSION_KEY)
+
+
+def ranked_ids(user, version: str) -> list[int] | None:
+    """
+    读取指定版本下用户所在分组的列表；版本已过期时返回 None。
+    """
+    keys = [_segment_key(version, GLOBAL_SEGMENT)]
+    if user and user.is_authenticated:
+        keys.insert(0, _segment_key(version, user_segment(user.pk)))
+    found = cache.get_many(keys)
+    observe_cache("focus_ranking", bool(found))
+    for key in keys:
+        if key in found:
+            return found[key]
+    return None
+
+
+def encode_cursor(version: str, offset: int) -> str:
+    return base64.urlsafe_b64encode(f"{version}:{offset}".encode()).decode("ascii")
+
+
+def decode_cursor(value: str | None) -> tuple[str | None, int]:
+    """
+    游标无效时抛出 ValueError。
+    """
+    if not value:
+        return None, 0
+    try:
+        version, offset = base64.urlsafe_b64decode(value.encode("ascii")).decode().split(":")
+        offset = int(offset)
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise ValueError(value) from exc
+    if not version.isdigit() or offset < 0:
+        raise ValueError(value)
+    return version, offset
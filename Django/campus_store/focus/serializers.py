@@ -1,10 +1,15 @@
 from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
 from rest_framework import serializers
 
+from .feed import COMMENT_PREVIEW_LIMIT
 from .models import FocusVideo, FocusVideoComment
 
 User = get_user_model()
 
+# 动态流默认播放的清晰度，依次回退，都没有时播放原文件
+PLAYBACK_PREFERENCE = ["720p", "480p"]
+
 
 class FocusVideoCommentSerializer(serializers.ModelSerializer):
     author = serializers.StringRelatedField(read_only=True)
@@ -18,6 +23,8 @@ class FocusVideoSerializer(serializers.ModelSerializer):
     creator = serializers.StringRelatedField(read_only=True)
     video_url = serializers.SerializerMethodField()
     cover_url = serializers.SerializerMethodField()
+    playback_url = serializers.SerializerMethodField()
+    renditions = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
     comments = serializers.SerializerMethodField()
     video_file = serializers.FileField(write_only=True, source="video")
@@ -33,6 +40,9 @@ class FocusVideoSerializer(serializers.ModelSerializer):
             "creator",
             "video_url",
             "cover_url",
+            "playback_url",
+            "renditions",
+            "processing_status",
             "status",
             "like_count",
             "comment_count",
@@ -47,6 +57,9 @@ class FocusVideoSerializer(serializers.ModelSerializer):
             "creator",
             "video_url",
             "cover_url",
+            "playback_url",
+            "renditions",
+            "processing_status",
             "status",
             "like_count",
             "comment_count",
@@ -64,15 +77,31 @@ class FocusVideoSerializer(serializers.ModelSerializer):
             return obj.video.url
         return ""
 
-    def get_cover_url(self, obj):
+    def _media_url(self, name):
+        url = default_storage.url(name)
         request = self.context.get("request")
-        if obj.cover_image and request:
-            return request.build_absolute_uri(obj.cover_image.url)
-        if obj.cover_image:
-            return obj.cover_image.url
+        return request.build_absolute_uri(url) if request else url
+
+    def get_cover_url(self, obj):
+        # 未上传封面时使用转码时截取的封面帧
+        image = obj.cover_image or obj.poster
+        if image:
+            return self._media_url(image.name)
         return ""
 
+    def get_renditions(self, obj):
+        return {label: self._media_url(name) for label, name in (obj.renditions or {}).items()}
+
+    def get_playback_url(self, obj):
+        for label in PLAYBACK_PREFERENCE:
+            if label in (obj.renditions or {}):
+                return self._media_url(obj.renditions[label])
+        return self.get_video_url(obj)
+
     def get_is_liked(self, obj):
+        liked_ids = self.context.get("liked_video_ids")
+        if liked_ids is not None:
+            return obj.pk in liked_ids
         request = self.context.get("request")
         user = getattr(request, "user", None)
         if not user or not user.is_authenticated:
@@ -80,10 +109,13 @@ class FocusVideoSerializer(serializers.ModelSerializer):
         return obj.likes.filter(user=user).exists()
 
     def get_comments(self, obj):
+        previews = self.context.get("comment_previews")
+        if previews is not None:
+            return FocusVideoCommentSerializer(previews.get(obj.pk, []), many=True).data
         request = self.context.get("request")
         if request and request.query_params.get("with_comments") == "0":
             return []
-        comments = obj.comments.all()[:5]
+        comments = obj.comments.select_related("author")[:COMMENT_PREVIEW_LIMIT]
         return FocusVideoCommentSerializer(comments, many=True).data
 
     def get_can_delete(self, obj):
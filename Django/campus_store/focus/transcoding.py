@@ -0,0 +1,203 @@
+"""
+焦点视频转码：上传后排队，由 run_focus_transcoder 在进程池中调用 ffmpeg 生成低码率版本与封面帧。
+"""
+
+import json
+import os
+import subprocess
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db.models import F
+from django.utils import timezone
+
+from .models import FocusVideo, VideoTranscodeJob
+
+# (清晰度, 目标高度, 视频码率)
+RENDITION_PROFILES = [("480p", 480, 900), ("720p", 720, 2500)]
+RENDITION_DIR = "focus/renditions"
+POSTER_DIR = "focus/posters"
+MAX_ATTEMPTS = 3
+FFMPEG_TIMEOUT = 60 * 60
+
+
+class TranscodeError(RuntimeError):
+    pass
+
+
+def enqueue_transcode(video: FocusVideo) -> VideoTranscodeJob:
+    FocusVideo.objects.filter(pk=video.pk).update(processing_status=FocusVideo.ProcessingStatus.PENDING)
+    video.processing_status = FocusVideo.ProcessingStatus.PENDING
+    return VideoTranscodeJob.objects.create(video=video)
+
+
+def claim_jobs(limit: int) -> list[int]:
+    """
+    以条件更新认领至多 limit 个排队任务，多个转码进程同时运行也不会重复处理。
+    """
+    claimed = []
+    pending = VideoTranscodeJob.objects.filter(status=VideoTranscodeJob.Status.PENDING).values_list("pk", flat=True)
+    for job_id in pending[: limit * 2]:
+        if len(claimed) >= limit:
+            break
+        updated = VideoTranscodeJob.objects.filter(pk=job_id, status=VideoTranscodeJob.Status.PENDING).update(
+            status=VideoTranscodeJob.Status.RUNNING,
+            attempts=F("attempts") + 1,
+            started_at=timezone.now(),
+        )
+        if updated:
+            claimed.append(job_id)
+    return claimed
+
+
+def requeue_stale_jobs(minutes: int) -> int:
+    """
+    进程崩溃会让任务停在 RUNNING，超时后放回队列。
+    """
+    cutoff = timezone.now() - timedelta(minutes=minutes)
+    return VideoTranscodeJob.objects.filter(status=VideoTranscodeJob.Status.RUNNING, started_at__lt=cutoff).update(
+        status=VideoTranscodeJob.Status.PENDING
+    )
+
+
+def _run(command: list[str]) -> str:
+    try:
+        result = subprocess.run(command, check=True, capture_output=True, text=True, timeout=FFMPEG_TIMEOUT)
+    except FileNotFoundError as exc:
+        raise TranscodeError(f"未找到 {command[0]}，请安装 ffmpeg 或配置 FFMPEG_BINARY") from exc
+    except subprocess.CalledProcessError as exc:
+        raise TranscodeError((exc.stderr or "").strip()[-2000:] or f"{command[0]} 退出码 {exc.returncode}") from exc
+    except subprocess.TimeoutExpired as exc:
+        raise TranscodeError("转码超时") from exc
+    return result.stdout
+
+
+def probe_height(path: str) -> int | None:
+    output = _run(
+        [
+            settings.FFPROBE_BINARY,
+            "-v",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "stream=height",
+            "-of",
+            "json",
+            path,
+        ]
+    )
+    streams = json.loads(output or "{}").get("streams") or []
+    return streams[0].get("height") if streams else None
+
+
+def _encode(source: str, name: str, height: int, bitrate: int) -> None:
+    target = default_storage.path(name)
+    partial = f"{target}.part.mp4"
+    _run(
+        [
+            settings.FFMPEG_BINARY,
+            "-y",
+            "-v",
+            "error",
+            "-i",
+            source,
+            "-vf",
+            f"scale=-2:{height}",
+            "-c:v",
+            "libx264",
+            "-preset",
+            "veryfast",
+            "-b:v",
+            f"{bitrate}k",
+            "-maxrate",
+            f"{bitrate}k",
+            "-bufsize",
+            f"{bitrate * 2}k",
+            "-c:a",
+            "aac",
+            "-b:a",
+            "128k",
+            "-movflags",
+            "+faststart",
+            partial,
+        ]
+    )
+    os.replace(partial, target)
+
+
+def _extract_poster(source: str, name: str) -> None:
+    target = default_storage.path(name)
+    partial = f"{target}.part.jpg"
+    # 优先取第 1 秒的画面，避开常见的黑屏首帧；视频不足 1 秒时退回首帧
+    for offset in ("1", "0"):
+        command = [
+            settings.FFMPEG_BINARY,
+            "-y",
+            "-v",
+            "error",
+            "-ss",
+            offset,
+            "-i",
+            source,
+            "-frames:v",
+            "1",
+            "-vf",
+            "scale=640:-2",
+            partial,
+        ]
+        try:
+            _run(command)
+        except TranscodeError:
+            if offset == "0":
+                raise
+            continue
+        if os.path.exists(partial) and os.path.getsize(partial):
+            os.replace(partial, target)
+            return
+    raise TranscodeError("无法提取封面帧")
+
+
+def transcode_video(video: FocusVideo) -> tuple[dict, str]:
+    source = video.video.path
+    height = probe_height(source)
+    # 不生成高于原片的版本，但至少保留最低一档
+    profiles = [profile for profile in RENDITION_PROFILES if not height or profile[1] < height]
+    profiles = profiles or RENDITION_PROFILES[:1]
+    os.makedirs(default_storage.path(f"{RENDITION_DIR}/{video.pk}"), exist_ok=True)
+    os.makedirs(default_storage.path(POSTER_DIR), exist_ok=True)
+
+    renditions = {}
+    for label, target_height, bitrate in profiles:
+        name = f"{RENDITION_DIR}/{video.pk}/{label}.mp4"
+        _encode(source, name, target_height, bitrate)
+        renditions[label] = name
+    poster = f"{POSTER_DIR}/{video.pk}.jpg"
+    _extract_poster(source, poster)
+    return renditions, poster
+
+
+def run_transcode_job(job_id: int) -> str:
+    """
+    在转码进程中执行单个任务，返回任务的最终状态。失败的任务在重试次数内重新排队。
+    """
+    job = VideoTranscodeJob.objects.select_related("video").get(pk=job_id)
+    videos = FocusVideo.objects.filter(pk=job.video_id)
+    videos.update(processing_status=FocusVideo.ProcessingStatus.PROCESSING)
+    try:
+        renditions, poster = transcode_video(job.video)
+    except (TranscodeError, OSError, ValueError) as exc:
+        exhausted = job.attempts >= MAX_ATTEMPTS
+        job.status = VideoTranscodeJob.Status.FAILED if exhausted else VideoTranscodeJob.Status.PENDING
+        job.error = str(exc)
+        videos.update(
+            processing_status=(FocusVideo.ProcessingStatus.FAILED if exhausted else FocusVideo.ProcessingStatus.PENDING)
+        )
+    else:
+        videos.update(renditions=renditions, poster=poster, processing_status=FocusVideo.ProcessingStatus.READY)
+        job.status = VideoTranscodeJob.Status.COMPLETED
+        job.error = ""
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "error", "finished_at"])
+    return job.status
@@ -1,32 +1,57 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 from campus_store.accounts.permissions import RolePermission
+from campus_store.async_views import async_action
+from campus_store.db.mixins import QueryBudgetMixin
+from campus_store.pagination import CommentCursorPagination
 
-from .models import FocusVideo, FocusVideoComment, FocusVideoLike
+from .feed import load_feed
+from .likes import LikeConflict, toggle_like
+from .models import FocusVideo, FocusVideoComment
+from .ranking import RECENCY_VERSION, current_version, decode_cursor, encode_cursor, ranked_ids
 from .serializers import FocusVideoCommentSerializer, FocusVideoSerializer
+from .transcoding import enqueue_transcode
 
 User = get_user_model()
 
 
-class FocusVideoViewSet(viewsets.ModelViewSet):
+FEED_PAGE_SIZE = 10
+FEED_MAX_PAGE_SIZE = 50
+
+
+class FocusVideoViewSet(QueryBudgetMixin, viewsets.ModelViewSet):
     serializer_class = FocusVideoSerializer
     parser_classes = [MultiPartParser, FormParser, JSONParser]
     permission_classes = [RolePermission]
     allowed_roles = [User.Role.ADMIN, User.Role.MERCHANT, User.Role.CONSUMER]
 
     def get_queryset(self):
-        queryset = FocusVideo.objects.select_related("creator").prefetch_related("likes", "comments")
+        queryset = FocusVideo.objects.select_related("creator")
         user = self.request.user
         if not user.is_authenticated or user.role != User.Role.ADMIN:
             queryset = queryset.filter(status=FocusVideo.Status.ACTIVE)
         return queryset
 
+    def get_serializer(self, *args, **kwargs):
+        # 按页一次加载点赞状态与评论预览，序列化时只做字典查找
+        if args and isinstance(args[0], (FocusVideo, list, tuple)):
+            videos = args[0] if kwargs.get("many") else [args[0]]
+            context = kwargs.setdefault("context", self.get_serializer_context())
+            with_comments = self.request.query_params.get("with_comments") != "0"
+            context.update(load_feed(videos, self.request.user, with_comments=with_comments))
+        return super().get_serializer(*args, **kwargs)
+
     def perform_create(self, serializer):
-        serializer.save(creator=self.request.user)
+        video = serializer.save(creator=self.request.user)
+        enqueue_transcode(video)
 
     def destroy(self, request, *args, **kwargs):
         video = self.get_object()
@@ -37,34 +62,85 @@ class FocusVideoViewSet(viewsets.ModelViewSet):
             return Response({"detail": "只能删除自己上传的视频"}, status=status.HTTP_403_FORBIDDEN)
         return super().destroy(request, *args, **kwargs)
 
+    @action(detail=False, methods=["get"])
+    def feed(self, request):
+        """
+        按预先计算的排序列表翻页，列表之后按发布时间倒序接上其余在架视频；游标记录列表版本与偏移量。
+        """
+        version, offset, page_size, page_ids, has_more = self.feed_position(request)
+        by_id = self.get_queryset().filter(status=FocusVideo.Status.ACTIVE).in_bulk(page_ids)
+        videos = [by_id[pk] for pk in page_ids if pk in by_id]
+        return self.feed_response(request, videos, version, offset, page_size, has_more)
+
+    def feed_position(self, request):
+        """
+        返回 (版本号, 偏移量, 每页数量, 本页视频 ID, 是否还有下一页)。排序列表只读取缓存（缓存为空时临时计算全站列表），
+        列表只收录近 MAX_AGE_DAYS 天的前 GLOBAL_LIST_SIZE 个视频，翻过列表后按发布时间倒序查询其余视频。
+        """
+        try:
+            version, offset = decode_cursor(request.query_params.get("cursor"))
+        except ValueError:
+            raise NotFound("游标无效")
+        try:
+            page_size = min(int(request.query_params.get("page_size", FEED_PAGE_SIZE)), FEED_MAX_PAGE_SIZE)
+        except ValueError:
+            page_size = FEED_PAGE_SIZE
+        page_size = max(page_size, 1)
+
+        ids = ranked_ids(request.user, version) if version and version != RECENCY_VERSION else None
+        if ids is None and version != RECENCY_VERSION:
+            # 首页或游标对应的版本已过期：从当前版本的同一位置继续
+            version = current_version()
+            ids = ranked_ids(request.user, version) if version else None
+        if ids is None:
+            # 冷启动还没有排序列表，或按发布时间倒序翻页中途不切换到排序列表，避免重复或跳过
+            version, ids = RECENCY_VERSION, []
+
+        # 多取一个用于判断是否还有下一页
+        page_ids = ids[offset : offset + page_size + 1]
+        if len(page_ids) <= page_size:
+            start = max(offset - len(ids), 0)
+            page_ids += (
+                self.get_queryset()
+                .filter(status=FocusVideo.Status.ACTIVE)
+                .exclude(pk__in=ids)
+                .order_by("-created_at", "-pk")
+                .values_list("pk", flat=True)[start : start + page_size + 1 - len(page_ids)]
+            )
+        return version, offset, page_size, page_ids[:page_size], len(page_ids) > page_size
+
+    def feed_response(self, request, videos, version, offset, page_size, has_more):
+        next_url = None
+        if has_more:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), "cursor", encode_cursor(version, offset + page_size)
+            )
+        serializer = self.get_serializer(videos, many=True)
+        return Response({"next": next_url, "previous": None, "results": serializer.data})
+
     @action(detail=True, methods=["post"])
     def like(self, request, pk=None):
         video = self.get_object()
-        user = request.user
-        like, created = FocusVideoLike.objects.get_or_create(user=user, video=video)
-        if not created:
-            like.delete()
-            video.like_count = max(0, video.like_count - 1)
-            liked = False
-        else:
-            video.like_count = FocusVideoLike.objects.filter(video=video).count()
-            liked = True
-        video.save(update_fields=["like_count"])
+        try:
+            liked = toggle_like(video, request.user)
+        except LikeConflict:
+            return Response({"detail": "操作过于频繁，请稍后重试"}, status=status.HTTP_409_CONFLICT)
+        video.refresh_from_db(fields=["like_count"])
         return Response({"liked": liked, "like_count": video.like_count})
 
     @action(detail=True, methods=["get", "post"], url_path="comments")
     def comments(self, request, pk=None):
         video = self.get_object()
         if request.method == "GET":
-            qs = video.comments.select_related("author")
-            serializer = FocusVideoCommentSerializer(qs, many=True)
-            return Response(serializer.data)
+            paginator = CommentCursorPagination()
+            page = paginator.paginate_queryset(video.comments.select_related("author"), request, view=self)
+            return paginator.get_paginated_response(FocusVideoCommentSerializer(page, many=True).data)
         content = request.data.get("content", "").strip()
         if not content:
             return Response({"detail": "评论内容不能为空"}, status=status.HTTP_400_BAD_REQUEST)
-        comment = FocusVideoComment.objects.create(video=video, author=request.user, content=content)
-        video.comment_count = FocusVideoComment.objects.filter(video=video).count()
-        video.save(update_fields=["comment_count"])
+        with transaction.atomic():
+            comment = FocusVideoComment.objects.create(video=video, author=request.user, content=content)
+            video.bump_counters(comments=1)
         return Response(FocusVideoCommentSerializer(comment).data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=["post"], permission_classes=[RolePermission])
@@ -84,3 +160,15 @@ class FocusVideoViewSet(viewsets.ModelViewSet):
         video.status = FocusVideo.Status.ACTIVE
         video.save(update_fields=["status"])
         return Response({"status": video.status})
+
+
+@async_action(FocusVideoViewSet, "feed")
+async def feed_async(view, request):
+    version, offset, page_size, page_ids, has_more = await sync_to_async(view.feed_position)(request)
+    by_id = {
+        video.pk: video
+        async for video in view.get_queryset().filter(pk__in=page_ids, status=FocusVideo.Status.ACTIVE)
+    }
+    videos = [by_id[pk] for pk in page_ids if pk in by_id]
+    # 点赞状态与评论预览在构造序列化器时按页查询
+    return await sync_to_async(view.feed_response)(request, videos, version, offset, page_size, has_more)
@@ -0,0 +1,195 @@
+"""
+媒体文件下载：支持 Range 分段请求、ETag / Last-Modified 条件请求，
+整文件或分段都以文件句柄交给 WSGI 服务器（gunicorn 等会用 sendfile 零拷贝发送）；
+ASGI 下改为异步迭代分块读取，否则 Django 会把同步文件整个读入内存再发送。
+
+配置 MEDIA_ACCEL_REDIRECT_PREFIX（如 "/protected-media/"）后只返回 X-Accel-Redirect，
+由前置的 nginx 负责实际传输。
+"""
+
+import mimetypes
+import os
+import re
+import stat
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+DEFAULT_CACHE_CONTROL = "public, max-age=86400"
+ASYNC_CHUNK_SIZE = 256 * 1024
+# 文件由用户上传，扩展名不可信：只有图片与视频按原类型内联显示，其余（含可执行脚本的 SVG）一律作为附件下载
+INLINE_TYPE_PREFIXES = ("image/", "video/")
+UNSAFE_INLINE_TYPES = {"image/svg+xml"}
+
+
+class RangeFile:
+    """
+    只暴露文件中 [start, start + length) 的只读视图。保留 fileno()，且底层文件指针已定位到 start，
+    WSGI 服务器可据此配合 Content-Length 调用 sendfile。
+    """
+
+    def __init__(self, handle, start: int, length: int):
+        self.handle = handle
+        self.remaining = length
+        handle.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.handle.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.handle.fileno()
+
+    def tell(self):
+        return self.handle.tell()
+
+    def seekable(self):
+        return False
+
+    def close(self):
+        self.handle.close()
+
+
+async def aiter_file(handle, start: int, length: int):
+    """
+    在线程池中分块读取，读取之间把事件循环让给其他连接。
+    """
+    read = sync_to_async(handle.read, thread_sensitive=False)
+    try:
+        await sync_to_async(handle.seek, thread_sensitive=False)(start)
+        remaining = length
+        while remaining > 0:
+            data = await read(min(ASYNC_CHUNK_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+    finally:
+        handle.close()
+
+
+def parse_range(header: str, size: int):
+    """
+    解析单段 Range，返回 (start, end)（含 end）；无法满足返回 False；不支持的格式（如多段）返回 None 表示按整文件响应。
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0:
+            return False
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _if_range_matches(request, etag: str, mtime: int) -> bool:
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', "W/")):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == mtime
+
+
+def serve_media(request, root: str, path: str, cache_control: str = DEFAULT_CACHE_CONTROL):
+    try:
+        full_path = safe_join(root, path)
+    except SuspiciousFileOperation:
+        raise Http404("文件不存在")
+    try:
+        stat_result = os.stat(full_path)
+    except OSError:
+        raise Http404("文件不存在")
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise Http404("文件不存在")
+
+    size = stat_result.st_size
+    mtime = int(stat_result.st_mtime)
+    etag = f'"{stat_result.st_mtime_ns:x}-{size:x}"'
+    content_type = mimetypes.guess_type(full_path)[0] or ""
+    inline = content_type.startswith(INLINE_TYPE_PREFIXES) and content_type not in UNSAFE_INLINE_TYPES
+    if not inline:
+        content_type = "application/octet-stream"
+
+    response = get_conditional_response(request, etag=etag, last_modified=mtime)
+    if response is None:
+        byte_range = None
+        if (
+            request.method in ("GET", "HEAD")
+            and "HTTP_RANGE" in request.META
+            and _if_range_matches(request, etag, mtime)
+        ):
+            byte_range = parse_range(request.META["HTTP_RANGE"], size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+        else:
+            response = _file_response(
+                full_path, root, path, size, byte_range, content_type, asynchronous=isinstance(request, ASGIRequest)
+            )
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(mtime)
+    response["Cache-Control"] = cache_control
+    response["X-Content-Type-Options"] = "nosniff"
+    if not inline:
+        response["Content-Disposition"] = content_disposition_header(True, os.path.basename(full_path))
+    return response
+
+
+def _file_response(full_path, root, path, size, byte_range, content_type, asynchronous=False):
+    accel_prefix = getattr(settings, "MEDIA_ACCEL_REDIRECT_PREFIX", "")
+    if accel_prefix:
+        # nginx 自行处理 Range 与发送，这里只给出内部路径
+        relative_root = os.path.relpath(root, settings.MEDIA_ROOT).replace(os.sep, "/")
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = f"{accel_prefix.rstrip('/')}/{relative_root}/{path}".replace("/./", "/")
+        return response
+
+    handle = open(full_path, "rb")
+    if asynchronous:
+        start, end = byte_range or (0, size - 1)
+        response = StreamingHttpResponse(
+            aiter_file(handle, start, end - start + 1),
+            status=206 if byte_range else 200,
+            content_type=content_type,
+        )
+        response["Content-Length"] = str(end - start + 1)
+        if byte_range:
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return response
+    if byte_range is None:
+        return FileResponse(handle, content_type=content_type)
+    start, end = byte_range
+    length = end - start + 1
+    response = FileResponse(RangeFile(handle, start, length), status=206, content_type=content_type)
+    response["Content-Length"] = str(length)
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return response
+
+
+def media_view(request, directory, path):
+    """
+    以 MEDIA_ROOT 下的 directory 为根目录提供文件（目录由 URL 路由限定）。
+    """
+    return serve_media(request, os.path.join(settings.MEDIA_ROOT, directory), path)
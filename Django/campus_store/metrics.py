@@ -0,0 +1,253 @@
+"""
+进程内指标：按路由统计请求数、延迟直方图、状态码、每请求查询数与缓存命中，以 Prometheus 文本格式输出。
+
+未设置 METRICS_DIR 时数值只存在本进程内存中；设置后每个进程把数值写入该目录下各自的 mmap 文件，
+导出时汇总目录内所有文件，多 worker 部署也能得到完整的计数。服务启动前应清空该目录。
+"""
+
+import glob
+import mmap
+import os
+import struct
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.utils.decorators import sync_and_async_middleware
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+# 方法名来自客户端，其余方法统一记为 OTHER，避免任意方法名制造无限多的标签组合
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT"})
+
+# 名称 → (类型, 说明, 直方图的桶上界)
+METRICS = {
+    "campus_http_requests_total": ("counter", "按路由、方法与状态码统计的请求数", None),
+    "campus_http_request_duration_seconds": ("histogram", "按路由与方法统计的请求耗时", LATENCY_BUCKETS),
+    "campus_db_queries_per_request": ("histogram", "按路由统计的每请求查询数", QUERY_COUNT_BUCKETS),
+    "campus_db_query_seconds_total": ("counter", "按路由累计的数据库耗时", None),
+    "campus_cache_requests_total": ("counter", "按缓存用途统计的命中（hit）与未命中（miss）次数", None),
+}
+
+
+class _DictStore:
+    def __init__(self):
+        self.values = defaultdict(float)
+
+    def inc(self, key, amount):
+        self.values[key] += amount
+
+    def items(self):
+        return list(self.values.items())
+
+
+class _MmapStore:
+    """
+    文件头 8 字节记录已用长度；每条记录为 int32 键长 + 键（补齐到 8 字节对齐）+ float64 值。
+    先写完整条记录再更新已用长度，读取方不会读到半条记录。
+    """
+
+    INITIAL_SIZE = 1 << 20
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "a+b")
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.truncate(self.INITIAL_SIZE)
+        self._capacity = os.fstat(self._file.fileno()).st_size
+        self._mmap = mmap.mmap(self._file.fileno(), self._capacity)
+        self._positions = {}
+        self._values = {}
+        self._used = struct.unpack_from("i", self._mmap, 0)[0] or 8
+        for key, value, position in _entries(self._mmap, self._used):
+            self._positions[key] = position
+            self._values[key] = value
+        struct.pack_into("i", self._mmap, 0, self._used)
+
+    def inc(self, key, amount):
+        position = self._positions.get(key)
+        if position is None:
+            position = self._append(key)
+        value = self._values[key] = self._values.get(key, 0.0) + amount
+        struct.pack_into("d", self._mmap, position, value)
+
+    def items(self):
+        return list(self._values.items())
+
+    def _append(self, key):
+        encoded = key.encode()
+        padded = len(encoded) + (8 - (4 + len(encoded)) % 8) % 8
+        size = 4 + padded + 8
+        if self._used + size > self._capacity:
+            self._capacity = max(self._capacity * 2, self._used + size)
+            self._mmap.close()
+            self._file.truncate(self._capacity)
+            self._mmap = mmap.mmap(self._file.fileno(), self._capacity)
+        struct.pack_into(f"i{padded}sd", self._mmap, self._used, len(encoded), encoded, 0.0)
+        position = self._used + 4 + padded
+        self._used += size
+        struct.pack_into("i", self._mmap, 0, self._used)
+        self._positions[key] = position
+        return position
+
+
+def _entries(buffer, used):
+    position = 8
+    while position < used:
+        length = struct.unpack_from("i", buffer, position)[0]
+        padded = length + (8 - (4 + length) % 8) % 8
+        key = bytes(buffer[position + 4 : position + 4 + length]).decode()
+        value_position = position + 4 + padded
+        yield key, struct.unpack_from("d", buffer, value_position)[0], value_position
+        position = value_position + 8
+
+
+_lock = threading.Lock()
+_store = None
+_store_pid = None
+
+
+def _get_store():
+    global _store, _store_pid
+    # gunicorn 等预加载后 fork 的 worker 需要各自的文件
+    if _store_pid != os.getpid():
+        directory = settings.METRICS_DIR
+        _store = _MmapStore(os.path.join(directory, f"metrics_{os.getpid()}.db")) if directory else _DictStore()
+        _store_pid = os.getpid()
+    return _store
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _bounds(buckets) -> list[str]:
+    return [*map(repr, buckets), "+Inf"]
+
+
+def _bucket_keys(name, labels, buckets):
+    return [f'{name}_bucket|{labels},le="{bound}"' for bound in _bounds(buckets)]
+
+
+_bucket_cache = {}
+
+
+def _observe(updates, name, labels, value, buckets):
+    keys = _bucket_cache.get((name, labels))
+    if keys is None:
+        keys = _bucket_cache[(name, labels)] = _bucket_keys(name, labels, buckets)
+    # 只记非累计的桶计数，导出时再累加成 Prometheus 的 le 语义
+    updates.append((keys[bisect_left(buckets, value)], 1))
+    updates.append((f"{name}_sum|{labels}", value))
+
+
+def _apply(updates) -> None:
+    with _lock:
+        store = _get_store()
+        for key, amount in updates:
+            store.inc(key, amount)
+
+
+def request_method(request) -> str:
+    return request.method if request.method in HTTP_METHODS else "OTHER"
+
+
+def observe_request(request, response, elapsed) -> None:
+    match = getattr(request, "resolver_match", None)
+    route = match.view_name or match.route if match else "unmatched"
+    route_labels = _labels(route=route)
+    method_labels = _labels(route=route, method=request_method(request))
+    updates = [(f'campus_http_requests_total|{method_labels},status="{response.status_code}"', 1)]
+    _observe(updates, "campus_http_request_duration_seconds", method_labels, elapsed, LATENCY_BUCKETS)
+    stats = getattr(request, "query_stats", None)
+    if stats is not None:
+        _observe(updates, "campus_db_queries_per_request", route_labels, stats.count, QUERY_COUNT_BUCKETS)
+        updates.append((f"campus_db_query_seconds_total|{route_labels}", stats.duration))
+    _apply(updates)
+
+
+def observe_cache(cache_name: str, hit: bool) -> None:
+    _apply([(f'campus_cache_requests_total|cache="{cache_name}",result="{"hit" if hit else "miss"}"', 1)])
+
+
+def collect() -> dict[str, float]:
+    """
+    汇总各进程的数值；未配置 METRICS_DIR 时只有本进程。
+    """
+    if not settings.METRICS_DIR:
+        with _lock:
+            return dict(_get_store().items())
+    totals = defaultdict(float)
+    for path in glob.glob(os.path.join(settings.METRICS_DIR, "metrics_*.db")):
+        with open(path, "rb") as handle:
+            data = handle.read()
+        if len(data) < 8:
+            continue
+        for key, value, _ in _entries(data, struct.unpack_from("i", data, 0)[0]):
+            totals[key] += value
+    return totals
+
+
+def render() -> str:
+    grouped = defaultdict(list)
+    for key, value in collect().items():
+        name, _, labels = key.partition("|")
+        grouped[name].append((labels, value))
+
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            lines.extend(f"{name}{{{labels}}} {_number(value)}" for labels, value in sorted(grouped[name]))
+            continue
+        series = defaultdict(dict)
+        for labels, value in grouped[f"{name}_bucket"]:
+            base, _, bound = labels.rpartition(",le=")
+            series[base][bound.strip('"')] = value
+        sums = dict(grouped[f"{name}_sum"])
+        for base in sorted(series):
+            # 每个标签组合都输出全部桶（含 +Inf），没有观测值的桶沿用前一个累计值
+            cumulative = 0.0
+            for bound in _bounds(buckets):
+                cumulative += series[base].get(bound, 0.0)
+                lines.append(f'{name}_bucket{{{base},le="{bound}"}} {_number(cumulative)}')
+            lines.append(f"{name}_sum{{{base}}} {_number(sums.get(base, 0.0))}")
+            lines.append(f"{name}_count{{{base}}} {_number(cumulative)}")
+    return "\n".join(lines) + "\n"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """
+    记录请求数、耗时与查询数；放在中间件列表最前面，耗时才包含其余中间件。
+    """
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            started = time.perf_counter()
+            response = await get_response(request)
+            observe_request(request, response, time.perf_counter() - started)
+            return response
+
+    else:
+
+        def middleware(request):
+            started = time.perf_counter()
+            response = get_response(request)
+            observe_request(request, response, time.perf_counter() - started)
+            return response
+
+    return middleware
@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CommentCursorPagination(CursorPagination):
+    """
+    评论按时间倒序的游标分页；社区帖子与焦点视频的评论共用。
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
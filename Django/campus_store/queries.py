@@ -0,0 +1,23 @@
+"""
+跨应用复用的查询工具。
+"""
+
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+
+def latest_per_group(queryset, group_field: str, limit: int, order_by=("-created_at", "-id")):
+    """
+    用窗口函数一次取出每组排序靠前的 limit 行，避免对每个父对象单独切片查询。
+    """
+    ranked = queryset.annotate(
+        group_rank=Window(RowNumber(), partition_by=[F(group_field)], order_by=list(order_by))
+    )
+    return ranked.filter(group_rank__lte=limit).order_by(group_field, "group_rank")
+
+
+def group_rows(rows, key: str) -> dict:
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(getattr(row, key), []).append(row)
+    return grouped
@@ -0,0 +1,133 @@
+"""
+按用户投递的事件总线。
+
+默认在进程内分发，只适用于单个 ASGI 进程同时处理写请求与事件流的部署；
+配置 REALTIME_BROKER_URL=redis://host:6379/1（Redis 或兼容协议的 KeyDB、Valkey 等）后，
+所有进程通过 PUBLISH 发布，每个 ASGI 进程用一个模式订阅接收后再分发给本进程的连接。
+"""
+
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+
+CHANNEL_PREFIX = "campus_store:realtime:user:"
+QUEUE_SIZE = 100
+
+
+class Subscription:
+    def __init__(self, broker, user_id: int):
+        self.broker = broker
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    def deliver(self, event: dict) -> None:
+        # 可能在任意线程调用，交给订阅方所在的事件循环入队
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: dict) -> None:
+        if self.queue.full():
+            # 客户端消费太慢：丢弃积压，让其整体刷新一次
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = {"type": "resync", "data": {}}
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float) -> dict | None:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(self, user_id)
+        with self._lock:
+            self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id: int, event: dict) -> None:
+        self.dispatch(user_id, event)
+
+    def dispatch(self, user_id: int, event: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+    def connection_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+class RedisBroker(LocalBroker):
+    def __init__(self, url: str):
+        import redis
+
+        super().__init__()
+        self.url = url
+        self._client = redis.Redis.from_url(url)
+        self._listeners = {}
+
+    def publish(self, user_id: int, event: dict) -> None:
+        self._client.publish(f"{CHANNEL_PREFIX}{user_id}", json.dumps(event, ensure_ascii=False))
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = super().subscribe(user_id)
+        # 每个事件循环只启动一个监听任务
+        listener = self._listeners.get(subscription.loop)
+        if listener is None or listener.done():
+            self._listeners[subscription.loop] = subscription.loop.create_task(self._listen())
+        return subscription
+
+    async def _listen(self) -> None:
+        import redis.asyncio
+
+        while True:
+            client = redis.asyncio.Redis.from_url(self.url)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                    async for message in pubsub.listen():
+                        if message["type"] != "pmessage":
+                            continue
+                        user_id = int(message["channel"].decode().rsplit(":", 1)[1])
+                        self.dispatch(user_id, json.loads(message["data"]))
+            except (OSError, redis.exceptions.ConnectionError):
+                # 连接断开后重连；期间的事件丢失，客户端重连后会收到 ready 并整体刷新
+                await asyncio.sleep(1)
+            finally:
+                await client.aclose()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> LocalBroker:
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                url = getattr(settings, "REALTIME_BROKER_URL", "")
+                _broker = RedisBroker(url) if url else LocalBroker()
+    return _broker
@@ -0,0 +1,30 @@
+"""
+业务代码通过 publish 推送事件；事件在事务提交后才发出，回滚的修改不会通知到客户端。
+"""
+
+import logging
+import time
+
+from django.db import transaction
+
+from .broker import get_broker
+
+logger = logging.getLogger(__name__)
+
+
+def _send(user_ids, event: dict) -> None:
+    broker = get_broker()
+    for user_id in user_ids:
+        try:
+            broker.publish(user_id, event)
+        except Exception:  # noqa: BLE001
+            # 推送失败不影响业务请求，客户端重连后会整体刷新
+            logger.exception("推送实时事件失败：%s", event["type"])
+
+
+def publish(user_ids, event_type: str, data: dict) -> None:
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if not user_ids:
+        return
+    event = {"id": str(time.time_ns()), "type": event_type, "data": data}
+    transaction.on_commit(lambda: _send(user_ids, event))
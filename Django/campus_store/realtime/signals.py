@@ -0,0 +1,60 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from campus_store.commerce.models import Order
+from campus_store.customization.models import WishRequest, WishTimelineEntry
+from campus_store.customization.signals import wishes_claimed
+
+from .events import publish
+
+REFUND_EVENTS = {
+    Order.RefundStatus.REQUESTED: "refund.requested",
+    Order.RefundStatus.APPROVED: "refund.approved",
+    Order.RefundStatus.REJECTED: "refund.rejected",
+}
+
+
+def _order_payload(order: Order) -> dict:
+    return {
+        "order_id": order.pk,
+        "order_number": order.order_number,
+        "status": order.status,
+        "refund_status": order.refund_status,
+    }
+
+
+@receiver(post_save, sender=Order)
+def order_saved(sender, instance, created, update_fields=None, **kwargs):
+    recipients = (instance.consumer_id, instance.merchant_id)
+    if created:
+        publish(recipients, "order.created", _order_payload(instance))
+        return
+    if update_fields is not None and "refund_status" in update_fields:
+        event_type = REFUND_EVENTS.get(instance.refund_status)
+        if event_type:
+            publish(recipients, event_type, _order_payload(instance))
+    if update_fields is None or "status" in update_fields:
+        publish(recipients, "order.status", _order_payload(instance))
+
+
+@receiver(post_save, sender=WishTimelineEntry)
+def wish_timeline_added(sender, instance, created, **kwargs):
+    if not created:
+        return
+    wish = instance.wish
+    recipients = {wish.consumer_id, wish.merchant_id} - {instance.author_id}
+    publish(
+        recipients,
+        "wish.timeline",
+        {"wish_id": wish.pk, "entry_id": instance.pk, "status": wish.status},
+    )
+
+
+@receiver(wishes_claimed)
+def wishes_claimed_notify(sender, merchant, wish_ids, **kwargs):
+    for wish_id, consumer_id in WishRequest.objects.filter(pk__in=wish_ids).values_list("pk", "consumer_id"):
+        publish(
+            [consumer_id],
+            "wish.claimed",
+            {"wish_id": wish_id, "status": WishRequest.Status.IN_PROGRESS, "merchant": str(merchant)},
+        )
@@ -0,0 +1,57 @@
+"""
+Server-Sent Events 事件流：GET /api/realtime/events/，需以 ASGI 方式部署（如 uvicorn campus_store.asgi:application）。
+
+浏览器的 EventSource 无法设置请求头，依靠登录时写入的 X-SESSION-TOKEN Cookie 认证；
+令牌不接受放在查询串中，以免出现在访问日志与代理日志里。
+"""
+
+import json
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+
+from campus_store.accounts.authentication import SessionTokenAuthentication, aget_token_user
+
+from .broker import get_broker
+
+HEARTBEAT_SECONDS = 15
+RETRY_MILLISECONDS = 3000
+
+
+def format_event(event: dict) -> str:
+    data = json.dumps(event.get("data", {}), ensure_ascii=False)
+    lines = [f"event: {event['type']}", f"data: {data}"]
+    if event.get("id"):
+        lines.insert(0, f"id: {event['id']}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def event_stream(request):
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"detail": "实时推送需以 ASGI 方式部署"}, status=501)
+    token_value = (
+        request.META.get(SessionTokenAuthentication.header_name)
+        or request.COOKIES.get(SessionTokenAuthentication.cookie_name)
+    )
+    authenticated = await aget_token_user(token_value)
+    if authenticated is None:
+        return JsonResponse({"detail": "请先登录"}, status=401)
+    user, session_token = authenticated
+
+    async def stream():
+        # 在消费响应的事件循环中订阅，客户端断开时 ASGI 处理器取消本协程，finally 中退订
+        subscription = get_broker().subscribe(user.pk)
+        try:
+            # ready 事件：客户端（重）连上后据此整体刷新一次，弥补断线期间错过的事件
+            yield f"retry: {RETRY_MILLISECONDS}\nevent: ready\ndata: {{}}\n\n"
+            while session_token.expires_at > timezone.now():
+                event = await subscription.get(HEARTBEAT_SECONDS)
+                yield format_event(event) if event else ": ping\n\n"
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
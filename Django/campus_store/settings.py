@@ -32,9 +32,13 @@ INSTALLED_APPS = [
     "campus_store.community",
     "campus_store.focus",
     "campus_store.wallet",
+    "campus_store.uploads",
+    "campus_store.realtime",
 ]
 
 MIDDLEWARE = [
+    "campus_store.metrics.metrics_middleware",
+    "campus_store.db.middleware.query_stats_middleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -43,6 +47,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "campus_store.db.middleware.replica_pin_middleware",
 ]
 
 ROOT_URLCONF = "campus_store.urls"
@@ -64,6 +69,9 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "campus_store.wsgi.application"
+ASGI_APPLICATION = "campus_store.asgi.application"
+# 以 ASGI 运行（uvicorn campus_store.asgi:application）时开启，热点只读接口改用异步视图
+ASYNC_VIEWS = os.getenv("DJANGO_ASYNC_VIEWS", "0") == "1"
 
 USE_SQLITE = os.getenv("DJANGO_USE_SQLITE", "0") == "1"
 if USE_SQLITE:
@@ -86,6 +94,70 @@ else:
                 "charset": "utf8mb4",
                 "init_command": "SET sql_mode='STRICT_TRANS_TABLES'",
             },
+            # 线程内长连接：同一工作线程在 MYSQL_CONN_MAX_AGE 秒内复用连接，取用前先检查是否仍可用。
+            # ASGI 下每个请求的同步调用可能落在不同线程，长连接会逐线程泄漏，默认关闭（改用 MYSQL_POOL_SIZE）
+            "CONN_MAX_AGE": int(os.getenv("MYSQL_CONN_MAX_AGE", "0" if ASYNC_VIEWS else "60")),
+            "CONN_HEALTH_CHECKS": os.getenv("MYSQL_CONN_HEALTH_CHECKS", "1") == "1",
+        }
+    }
+    # ASGI / 多线程部署设置 MYSQL_POOL_SIZE 启用进程内连接池，请求结束时连接归还池中
+    MYSQL_POOL_SIZE = int(os.getenv("MYSQL_POOL_SIZE", "0"))
+    if MYSQL_POOL_SIZE > 0:
+        DATABASES["default"].update(
+            {
+                "ENGINE": "campus_store.db.backends.mysql_pooled",
+                "CONN_MAX_AGE": 0,
+                "POOL": {
+                    "SIZE": MYSQL_POOL_SIZE,
+                    "TIMEOUT": float(os.getenv("MYSQL_POOL_TIMEOUT", "10")),
+                    "CHECK_AFTER": float(os.getenv("MYSQL_POOL_CHECK_AFTER", "30")),
+                    "RECYCLE": float(os.getenv("MYSQL_POOL_RECYCLE", "1800")),
+                },
+            }
+        )
+
+# 只读副本：DJANGO_DB_REPLICAS 为逗号分隔的 MySQL host[:port]（SQLite 模式下为数据库文件路径），
+# 依次注册为 replica1、replica2……，账号与库名同 default。只读视图集与数据分析接口的读查询发往副本
+DATABASE_REPLICAS = []
+for index, target in enumerate(filter(None, map(str.strip, os.getenv("DJANGO_DB_REPLICAS", "").split(","))), 1):
+    replica = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+    if USE_SQLITE:
+        replica["NAME"] = target
+    else:
+        host, _, port = target.partition(":")
+        replica.update({"HOST": host, "PORT": port or replica["PORT"]})
+    DATABASES[f"replica{index}"] = replica
+    DATABASE_REPLICAS.append(f"replica{index}")
+DATABASE_ROUTERS = ["campus_store.db.routers.ReplicaRouter"]
+# 用户写入后在这段时间内读主库，需配合 DJANGO_CACHE_URL 在多进程间共享
+READ_YOUR_WRITES_SECONDS = int(os.getenv("DJANGO_READ_YOUR_WRITES_SECONDS", "5"))
+REPLICA_HEALTH_INTERVAL = float(os.getenv("DJANGO_REPLICA_HEALTH_INTERVAL", "5"))
+
+# 每个请求的查询预算：超出条数或数据库耗时的请求连同最多的 SQL 指纹记入 campus_store.db.querystats 日志
+QUERY_BUDGET = int(os.getenv("DJANGO_QUERY_BUDGET", "30"))
+QUERY_TIME_BUDGET_MS = int(os.getenv("DJANGO_QUERY_TIME_BUDGET_MS", "200"))
+SLOW_QUERY_MS = int(os.getenv("DJANGO_SLOW_QUERY_MS", "100"))
+# Server-Timing 会向客户端暴露数据库耗时，默认关闭，排查性能时再开启
+QUERY_STATS_SERVER_TIMING = os.getenv("DJANGO_SERVER_TIMING", "0") == "1"
+
+# 多 worker 部署时指向一个空目录（启动前清空），各进程的指标写入其中的 mmap 文件后汇总导出
+METRICS_DIR = os.getenv("DJANGO_METRICS_DIR", "")
+
+# 共享缓存：配置 DJANGO_CACHE_URL=redis://host:6379/0 后多个进程共用同一份缓存
+CACHE_URL = os.getenv("DJANGO_CACHE_URL", "")
+if CACHE_URL.startswith(("redis://", "rediss://")):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+            "KEY_PREFIX": "campus_store",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "campus-store",
         }
     }
 
@@ -105,6 +177,18 @@ STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# 不对外提供的上传文件（如商家导入文件），必须位于 MEDIA_ROOT 之外
+PRIVATE_MEDIA_ROOT = os.getenv("DJANGO_PRIVATE_MEDIA_ROOT", str(BASE_DIR / "private"))
+# 由 nginx 等前置代理发送媒体文件时配置为其 internal location，如 /protected-media/
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv("DJANGO_MEDIA_ACCEL_PREFIX", "")
+
+# 实时推送：多进程部署时配置 Redis 兼容的发布订阅，如 redis://127.0.0.1:6379/1；留空则只在进程内分发
+REALTIME_BROKER_URL = os.getenv("REALTIME_BROKER_URL", "")
+
+# 焦点视频转码（run_focus_transcoder）
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+FFPROBE_BINARY = os.getenv("FFPROBE_BINARY", "ffprobe")
+FOCUS_TRANSCODE_WORKERS = int(os.getenv("FOCUS_TRANSCODE_WORKERS", "2"))
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "accounts.User"
@@ -145,7 +229,7 @@ else:
         "http://127.0.0.1:5173",
         "http://localhost:4173",
     ]
-CORS_ALLOW_HEADERS = list(default_headers) + ["x-session-token", "X-SESSION-TOKEN"]
+CORS_ALLOW_HEADERS = list(default_headers) + ["x-session-token", "X-SESSION-TOKEN", "x-chunk-sha256"]
 CSRF_TRUSTED_ORIGINS = [
     "http://localhost:5173",
     "http://127.0.0.1:5173",
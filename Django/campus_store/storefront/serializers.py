@@ -2,11 +2,14 @@ from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
 from campus_store.catalog.models import Category, Product
+from campus_store.catalog.serializers import HeroImageField, HeroImagesField
 
 User = get_user_model()
 
 
 class StorefrontProductBriefSerializer(serializers.ModelSerializer):
+    hero_image = HeroImageField(read_only=True)
+
     class Meta:
         model = Product
         fields = ["id", "title", "price", "hero_image"]
@@ -16,6 +19,8 @@ class StorefrontProductBriefSerializer(serializers.ModelSerializer):
 class StorefrontProductSerializer(serializers.ModelSerializer):
     store = serializers.SerializerMethodField()
     category = serializers.SerializerMethodField()
+    hero_image = HeroImageField(read_only=True)
+    hero_images = HeroImagesField()
 
     class Meta:
         model = Product
@@ -26,6 +31,7 @@ class StorefrontProductSerializer(serializers.ModelSerializer):
             "price",
             "inventory",
             "hero_image",
+            "hero_images",
             "tags",
             "store",
             "category",
@@ -69,7 +75,9 @@ class StorefrontStoreSerializer(serializers.ModelSerializer):
 
 
 class StorefrontCategorySerializer(serializers.ModelSerializer):
+    product_count = serializers.IntegerField(read_only=True, default=0)
+
     class Meta:
         model = Category
-        fields = ["id", "name", "description"]
+        fields = ["id", "name", "description", "product_count"]
         read_only_fields = fields
@@ -6,7 +6,12 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
 from campus_store.accounts.permissions import AuthenticatedOrRedirect
+from campus_store.async_views import async_list_view
+from campus_store.catalog import navigation as category_navigation
+from campus_store.catalog.filters import ProductTagFilter
 from campus_store.catalog.models import Category, Product
+from campus_store.catalog.tags import related_product_ids, tag_cloud
+from campus_store.db.mixins import ReplicaReadMixin
 
 from .serializers import (
     StorefrontCategorySerializer,
@@ -23,7 +28,7 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class StorefrontStoreViewSet(viewsets.ReadOnlyModelViewSet):
+class StorefrontStoreViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = StorefrontStoreSerializer
     permission_classes = [AuthenticatedOrRedirect]
     filter_backends = [filters.SearchFilter]
@@ -59,11 +64,11 @@ class StorefrontStoreViewSet(viewsets.ReadOnlyModelViewSet):
         )
         paginator = StandardResultsSetPagination()
         page = paginator.paginate_queryset(products, request, view=self)
-        serializer = StorefrontProductSerializer(page, many=True)
+        serializer = StorefrontProductSerializer(page, many=True, context=self.get_serializer_context())
         return paginator.get_paginated_response(serializer.data)
 
 
-class StorefrontCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class StorefrontCategoryViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = StorefrontCategorySerializer
     permission_classes = [AuthenticatedOrRedirect]
     filter_backends = [filters.SearchFilter]
@@ -76,12 +81,35 @@ class StorefrontCategoryViewSet(viewsets.ReadOnlyModelViewSet):
             queryset = queryset.filter(products__is_active=True).distinct()
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        categories = category_navigation.category_list(
+            has_products=bool(request.query_params.get("has_products")),
+            search=request.query_params.get(filters.SearchFilter.search_param, ""),
+        )
+        return Response(StorefrontCategorySerializer(categories, many=True).data)
+
+    @action(detail=False, methods=["get"])
+    def navigation(self, request):
+        categories = category_navigation.category_list(has_products=bool(request.query_params.get("has_products")))
+        return Response(
+            [
+                {
+                    **StorefrontCategorySerializer(entry).data,
+                    "merchants": [
+                        {"id": merchant_id, "product_count": count}
+                        for merchant_id, count in sorted(entry["merchants"].items(), key=lambda item: -item[1])
+                    ],
+                }
+                for entry in categories
+            ]
+        )
+
 
-class StorefrontProductViewSet(viewsets.ReadOnlyModelViewSet):
+class StorefrontProductViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = StorefrontProductSerializer
     permission_classes = [AuthenticatedOrRedirect]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["title", "description", "tags"]
+    filter_backends = [ProductTagFilter, filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ["title", "description", "indexed_tags__name"]
     ordering_fields = ["created_at", "price", "inventory"]
     pagination_class = StandardResultsSetPagination
 
@@ -94,3 +122,35 @@ class StorefrontProductViewSet(viewsets.ReadOnlyModelViewSet):
         if category_id:
             queryset = queryset.filter(category_id=category_id)
         return queryset
+
+    @action(detail=False, methods=["get"])
+    def tags(self, request):
+        product_filters = {}
+        if request.query_params.get("store"):
+            product_filters["merchant_id"] = request.query_params["store"]
+        if request.query_params.get("category"):
+            product_filters["category_id"] = request.query_params["category"]
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 50)), 200))
+        except ValueError:
+            limit = 50
+        return Response(tag_cloud(limit=limit, **product_filters))
+
+    @action(detail=True, methods=["get"])
+    def related(self, request, pk=None):
+        product = self.get_object()
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 8)), 50))
+        except ValueError:
+            limit = 8
+        shared = dict(related_product_ids(product.pk, limit=limit))
+        products = Product.objects.select_related("category", "merchant").in_bulk(list(shared))
+        ordered = [products[product_id] for product_id in shared if product_id in products]
+        data = self.get_serializer(ordered, many=True).data
+        for item in data:
+            item["shared_tags"] = shared[item["id"]]
+        return Response(data)
+
+
+store_list_async = async_list_view(StorefrontStoreViewSet)
+product_list_async = async_list_view(StorefrontProductViewSet)
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import ChunkedUpload
+
+
+@admin.register(ChunkedUpload)
+class ChunkedUploadAdmin(admin.ModelAdmin):
+    list_display = ("filename", "owner", "target", "status", "received", "total_size", "created_at")
+    list_filter = ("target", "status")
+    search_fields = ("filename", "owner__username")
@@ -0,0 +1,56 @@
+"""
+上传完成后把文件挂到业务对象上：社区帖子附件或焦点视频。
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from campus_store.community.models import PostMedia
+from campus_store.focus.models import FocusVideo
+from campus_store.focus.transcoding import enqueue_transcode
+
+from .models import ChunkedUpload
+from .storage import ChunkError, finalize, restore
+
+
+def complete_upload(upload_id, user, cover_image=None):
+    """
+    校验并落盘后创建 PostMedia 或 FocusVideo，返回 (upload, 创建的对象)。
+    """
+    name = None
+    try:
+        with transaction.atomic():
+            upload = ChunkedUpload.objects.select_for_update().get(pk=upload_id, owner=user)
+            if upload.status != ChunkedUpload.Status.UPLOADING:
+                raise ChunkError("上传已结束")
+            if upload.received != upload.total_size:
+                raise ChunkError(f"尚未接收完整（{upload.received}/{upload.total_size}）")
+            partial_name = upload.partial_name
+            name = finalize(upload)
+            if upload.target == ChunkedUpload.Target.POST_MEDIA:
+                media_type = (
+                    PostMedia.MediaType.VIDEO if upload.content_type.startswith("video/") else PostMedia.MediaType.IMAGE
+                )
+                result = PostMedia.objects.create(post_id=upload.post_id, file=name, media_type=media_type)
+            else:
+                result = FocusVideo(
+                    creator=user,
+                    title=upload.metadata.get("title", upload.filename),
+                    description=upload.metadata.get("description", ""),
+                    video=name,
+                )
+                if cover_image:
+                    result.cover_image = cover_image
+                result.save()
+                enqueue_transcode(result)
+            upload.status = ChunkedUpload.Status.COMPLETED
+            upload.storage_name = name
+            upload.result_id = result.pk
+            upload.completed_at = timezone.now()
+            upload.save(update_fields=["status", "storage_name", "result_id", "completed_at", "updated_at"])
+    except BaseException:
+        # 文件已改名但事务回滚（帖子已删除、封面无效等）时改回 .part，上传仍可重新完成
+        if name is not None:
+            restore(partial_name, name)
+        raise
+    return upload, result
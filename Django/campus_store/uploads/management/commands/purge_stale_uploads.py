@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from campus_store.uploads.models import ChunkedUpload
+from campus_store.uploads.storage import discard
+
+
+class Command(BaseCommand):
+    help = "清理长时间未继续的分片上传及其 .part 文件（建议每小时定时运行）"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=24, help="超过多少小时没有新分片视为放弃")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options["hours"])
+        stale = ChunkedUpload.objects.filter(status=ChunkedUpload.Status.UPLOADING, updated_at__lt=cutoff)
+        purged = []
+        for upload in stale.iterator():
+            discard(upload)
+            purged.append(upload.pk)
+        ChunkedUpload.objects.filter(pk__in=purged).update(status=ChunkedUpload.Status.ABORTED)
+        self.stdout.write(self.style.SUCCESS(f"已清理 {len(purged)} 个过期上传"))
@@ -0,0 +1,111 @@
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("community", "0004_reaction_one_per_author"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChunkedUpload",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "target",
+                    models.CharField(
+                        choices=[
+                            ("POST_MEDIA", "社区帖子附件"),
+                            ("FOCUS_VIDEO", "焦点视频"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("filename", models.CharField(max_length=255)),
+                ("content_type", models.CharField(blank=True, max_length=120)),
+                ("total_size", models.PositiveBigIntegerField()),
+                ("received", models.PositiveBigIntegerField(default=0)),
+                (
+                    "sha256",
+                    models.CharField(
+                        blank=True,
+                        help_text="客户端声明的整文件 SHA-256，完成时校验",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "storage_name",
+                    models.CharField(
+                        help_text="相对 MEDIA_ROOT 的最终文件名，上传中带 .part 后缀",
+                        max_length=255,
+                    ),
+                ),
+                ("metadata", models.JSONField(blank=True, default=dict)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("UPLOADING", "上传中"),
+                            ("COMPLETED", "已完成"),
+                            ("ABORTED", "已取消"),
+                        ],
+                        default="UPLOADING",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "result_id",
+                    models.PositiveBigIntegerField(
+                        blank=True,
+                        help_text="完成后生成的 PostMedia / FocusVideo 主键",
+                        null=True,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="chunked_uploads",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="chunked_uploads",
+                        to="community.post",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "updated_at"],
+                        name="uploads_status_updated_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("uploads", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chunkedupload",
+            name="chunk_lease",
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="chunkedupload",
+            name="chunk_lease_expires_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
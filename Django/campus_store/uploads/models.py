@@ -0,0 +1,58 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+class ChunkedUpload(models.Model):
+    class Target(models.TextChoices):
+        POST_MEDIA = "POST_MEDIA", "社区帖子附件"
+        FOCUS_VIDEO = "FOCUS_VIDEO", "焦点视频"
+
+    class Status(models.TextChoices):
+        UPLOADING = "UPLOADING", "上传中"
+        COMPLETED = "COMPLETED", "已完成"
+        ABORTED = "ABORTED", "已取消"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="chunked_uploads",
+        on_delete=models.CASCADE,
+    )
+    target = models.CharField(max_length=20, choices=Target.choices)
+    post = models.ForeignKey(
+        "community.Post",
+        null=True,
+        blank=True,
+        related_name="chunked_uploads",
+        on_delete=models.CASCADE,
+    )
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=120, blank=True)
+    total_size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True, help_text="客户端声明的整文件 SHA-256，完成时校验")
+    storage_name = models.CharField(max_length=255, help_text="相对 MEDIA_ROOT 的最终文件名，上传中带 .part 后缀")
+    # 写入分片前先以条件更新占用当前偏移，同一偏移的并发请求只有一个能写文件
+    chunk_lease = models.UUIDField(null=True, blank=True)
+    chunk_lease_expires_at = models.DateTimeField(null=True, blank=True)
+    metadata = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.UPLOADING)
+    result_id = models.PositiveBigIntegerField(
+        null=True, blank=True, help_text="完成后生成的 PostMedia / FocusVideo 主键"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "updated_at"], name="uploads_status_updated_idx")]
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.total_size})"
+
+    @property
+    def partial_name(self) -> str:
+        return f"{self.storage_name}.part"
@@ -0,0 +1,87 @@
+import mimetypes
+import re
+
+from rest_framework import serializers
+
+from campus_store.community.models import Post
+
+from .models import ChunkedUpload
+from .storage import CHUNK_SIZE, MAX_UPLOAD_SIZE, reserve
+
+SHA256_PATTERN = re.compile(r"^[0-9a-fA-F]{64}$")
+
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    post = serializers.PrimaryKeyRelatedField(queryset=Post.objects.all(), required=False, allow_null=True)
+    title = serializers.CharField(max_length=120, required=False, write_only=True)
+    description = serializers.CharField(required=False, allow_blank=True, write_only=True)
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ChunkedUpload
+        fields = [
+            "id",
+            "target",
+            "post",
+            "filename",
+            "content_type",
+            "total_size",
+            "sha256",
+            "title",
+            "description",
+            "received",
+            "status",
+            "chunk_size",
+            "result_id",
+            "created_at",
+            "completed_at",
+        ]
+        read_only_fields = ["received", "status", "result_id", "created_at", "completed_at"]
+
+    def get_chunk_size(self, obj):
+        return CHUNK_SIZE
+
+    def validate_total_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("文件不能为空")
+        if value > MAX_UPLOAD_SIZE:
+            raise serializers.ValidationError(f"文件不能超过 {MAX_UPLOAD_SIZE // (1024 * 1024)}MB")
+        return value
+
+    def validate_sha256(self, value):
+        if value and not SHA256_PATTERN.match(value):
+            raise serializers.ValidationError("SHA-256 格式不正确")
+        return value.lower()
+
+    def validate_content_type(self, value):
+        value = value.split(";")[0].strip().lower()
+        # 落盘时按类型决定扩展名，必须是有标准扩展名的类型；SVG 可内嵌脚本，不接受
+        if value and (not mimetypes.guess_extension(value) or value == "image/svg+xml"):
+            raise serializers.ValidationError("不支持的文件类型")
+        return value
+
+    def validate(self, attrs):
+        user = self.context["request"].user
+        content_type = attrs.get("content_type", "")
+        if attrs["target"] == ChunkedUpload.Target.POST_MEDIA:
+            post = attrs.get("post")
+            if post is None:
+                raise serializers.ValidationError({"post": "请指定帖子"})
+            if post.author_id != user.id:
+                raise serializers.ValidationError({"post": "只能为自己的帖子上传附件"})
+            if not content_type.startswith(("image/", "video/")):
+                raise serializers.ValidationError({"content_type": "仅支持图片或视频"})
+        else:
+            if not attrs.get("title"):
+                raise serializers.ValidationError({"title": "请填写视频标题"})
+            if not content_type.startswith("video/"):
+                raise serializers.ValidationError({"content_type": "仅支持视频文件"})
+            attrs["post"] = None
+        return attrs
+
+    def create(self, validated_data):
+        metadata = {key: validated_data.pop(key) for key in ("title", "description") if key in validated_data}
+        upload = ChunkedUpload(owner=self.context["request"].user, metadata=metadata, **validated_data)
+        reserve(upload)
+        upload.save()
+        return upload
@@ -0,0 +1,109 @@
+"""
+分片上传的文件操作：分片直接写入最终目录下的 .part 文件，完成时校验后原子改名。
+"""
+
+import hashlib
+import mimetypes
+import os
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils.text import get_valid_filename
+
+from .models import ChunkedUpload
+
+UPLOAD_DIRS = {
+    ChunkedUpload.Target.POST_MEDIA: "community_media",
+    ChunkedUpload.Target.FOCUS_VIDEO: "focus/videos",
+}
+CHUNK_SIZE = 8 * 1024 * 1024
+MAX_CHUNK_SIZE = 32 * 1024 * 1024
+MAX_UPLOAD_SIZE = getattr(settings, "CHUNKED_UPLOAD_MAX_SIZE", 4 * 1024 * 1024 * 1024)
+READ_BLOCK_SIZE = 64 * 1024
+
+
+class ChunkError(ValueError):
+    pass
+
+
+def safe_filename(filename: str, content_type: str) -> str:
+    """
+    媒体文件按扩展名决定响应类型，扩展名与声明的类型不一致时换成该类型的标准扩展名，
+    避免声明为图片的上传以 .html 等扩展名落盘。
+    """
+    filename = get_valid_filename(os.path.basename(filename))[-120:] or "upload"
+    if content_type and mimetypes.guess_type(filename)[0] != content_type:
+        stem = os.path.splitext(filename)[0][:100] or "upload"
+        filename = f"{stem}{mimetypes.guess_extension(content_type)}"
+    return filename
+
+
+def reserve(upload: ChunkedUpload) -> None:
+    """
+    为上传分配最终文件名并创建空的 .part 文件；文件名带上传 ID 前缀，并发上传同名文件互不冲突。
+    """
+    filename = safe_filename(upload.filename, upload.content_type)
+    upload.storage_name = f"{UPLOAD_DIRS[upload.target]}/{upload.pk.hex[:12]}_{filename}"
+    path = default_storage.path(upload.partial_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "xb"):
+        pass
+
+
+def write_chunk(upload: ChunkedUpload, stream, offset: int, length: int, sha256: str = "") -> None:
+    """
+    以固定大小的块把请求体写到 offset 处，内存占用与分片大小无关。
+    """
+    digest = hashlib.sha256()
+    remaining = length
+    with open(default_storage.path(upload.partial_name), "r+b") as handle:
+        handle.seek(offset)
+        while remaining:
+            block = stream.read(min(READ_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            handle.write(block)
+            digest.update(block)
+            remaining -= len(block)
+    if remaining:
+        raise ChunkError("分片数据不完整")
+    if sha256 and digest.hexdigest() != sha256.lower():
+        raise ChunkError("分片校验失败")
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def finalize(upload: ChunkedUpload) -> str:
+    """
+    校验大小与 SHA-256 后把 .part 改名为最终文件，返回相对 MEDIA_ROOT 的文件名。
+    """
+    partial = default_storage.path(upload.partial_name)
+    if os.path.getsize(partial) != upload.total_size:
+        raise ChunkError("文件大小与声明不一致")
+    if upload.sha256 and file_sha256(partial) != upload.sha256.lower():
+        raise ChunkError("文件校验失败")
+    name = upload.storage_name
+    if default_storage.exists(name):
+        name = default_storage.get_available_name(name)
+    os.replace(partial, default_storage.path(name))
+    return name
+
+
+def restore(partial_name: str, name: str) -> None:
+    """
+    撤销 finalize 的改名，供事务回滚时调用。
+    """
+    os.replace(default_storage.path(name), default_storage.path(partial_name))
+
+
+def discard(upload: ChunkedUpload) -> None:
+    try:
+        os.remove(default_storage.path(upload.partial_name))
+    except FileNotFoundError:
+        pass
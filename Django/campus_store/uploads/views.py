@@ -0,0 +1,125 @@
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.response import Response
+
+from campus_store.accounts.permissions import RolePermission
+from campus_store.focus.serializers import FocusVideoSerializer
+
+from .attachments import complete_upload
+from .models import ChunkedUpload
+from .serializers import ChunkedUploadSerializer
+from .storage import MAX_CHUNK_SIZE, ChunkError, discard, write_chunk
+
+User = get_user_model()
+
+# 单个分片最大 32MB，租约需覆盖慢速客户端的整次写入
+CHUNK_LEASE_TTL = timedelta(minutes=5)
+
+
+class ChunkedUploadViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    可续传的分片上传：POST 创建上传 → 按顺序 PUT 分片（?offset=）→ POST complete。
+    中断后 GET 详情取 received，从该偏移继续上传即可。
+    """
+
+    serializer_class = ChunkedUploadSerializer
+    parser_classes = [JSONParser, FormParser, MultiPartParser]
+    allowed_roles = [User.Role.ADMIN, User.Role.MERCHANT, User.Role.CONSUMER]
+    permission_classes = [RolePermission]
+
+    def get_queryset(self):
+        return ChunkedUpload.objects.filter(owner=self.request.user)
+
+    @action(detail=True, methods=["put"])
+    def chunk(self, request, pk=None):
+        upload = self.get_object()
+        if upload.status != ChunkedUpload.Status.UPLOADING:
+            return Response({"detail": "上传已结束"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            offset = int(request.query_params.get("offset", ""))
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            return Response({"detail": "请通过 offset 参数指定分片偏移"}, status=status.HTTP_400_BAD_REQUEST)
+        if offset != upload.received:
+            return Response(
+                {"detail": "分片偏移与已接收字节数不一致", "received": upload.received},
+                status=status.HTTP_409_CONFLICT,
+            )
+        if length <= 0 or length > MAX_CHUNK_SIZE or offset + length > upload.total_size:
+            return Response({"detail": "分片大小无效"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 先占用该偏移再写文件：写入期间同一偏移的其他请求得到 409，不会互相覆盖；
+        # 租约过期（写入进程中途退出）后可重新占用
+        lease = uuid.uuid4()
+        now = timezone.now()
+        claimed = (
+            ChunkedUpload.objects.filter(pk=upload.pk, received=offset, status=ChunkedUpload.Status.UPLOADING)
+            .filter(Q(chunk_lease__isnull=True) | Q(chunk_lease_expires_at__lt=now))
+            .update(chunk_lease=lease, chunk_lease_expires_at=now + CHUNK_LEASE_TTL)
+        )
+        if not claimed:
+            upload.refresh_from_db(fields=["received"])
+            return Response(
+                {"detail": "该分片正在由其他请求写入", "received": upload.received},
+                status=status.HTTP_409_CONFLICT,
+            )
+        leased = ChunkedUpload.objects.filter(pk=upload.pk, chunk_lease=lease)
+        # 直接读取原始请求体，不经过 DRF 解析器，避免整个分片被缓存到内存或临时文件
+        try:
+            write_chunk(upload, request._request, offset, length, request.META.get("HTTP_X_CHUNK_SHA256", ""))
+        except ChunkError as exc:
+            leased.update(chunk_lease=None, chunk_lease_expires_at=None)
+            return Response({"detail": str(exc), "received": upload.received}, status=status.HTTP_400_BAD_REQUEST)
+        except BaseException:
+            leased.update(chunk_lease=None, chunk_lease_expires_at=None)
+            raise
+        advanced = leased.filter(status=ChunkedUpload.Status.UPLOADING).update(
+            received=F("received") + length, chunk_lease=None, chunk_lease_expires_at=None, updated_at=timezone.now()
+        )
+        upload.refresh_from_db(fields=["received"])
+        if not advanced:
+            return Response(
+                {"detail": "上传已取消或分片租约已过期", "received": upload.received},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response({"received": upload.received, "total_size": upload.total_size})
+
+    @action(detail=True, methods=["post"])
+    def complete(self, request, pk=None):
+        upload = self.get_object()
+        try:
+            upload, result = complete_upload(upload.pk, request.user, cover_image=request.FILES.get("cover_file"))
+        except ChunkError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        if upload.target == ChunkedUpload.Target.POST_MEDIA:
+            payload = {
+                "id": result.id,
+                "url": result.file.url,
+                "media_type": result.media_type,
+                "name": result.file.name.split("/")[-1],
+            }
+        else:
+            payload = FocusVideoSerializer(result, context=self.get_serializer_context()).data
+        return Response({"upload": self.get_serializer(upload).data, "result": payload}, status=status.HTTP_201_CREATED)
+
+    def destroy(self, request, *args, **kwargs):
+        upload = self.get_object()
+        if upload.status != ChunkedUpload.Status.UPLOADING:
+            return Response({"detail": "上传已结束，无法取消"}, status=status.HTTP_409_CONFLICT)
+        discard(upload)
+        upload.status = ChunkedUpload.Status.ABORTED
+        upload.save(update_fields=["status", "updated_at"])
+        return Response(status=status.HTTP_204_NO_CONTENT)
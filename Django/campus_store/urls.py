@@ -1,9 +1,11 @@
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework import routers
 
+from django.db import DatabaseError, connection
 from django.http import JsonResponse
 from django.utils import timezone
 
@@ -22,18 +24,32 @@ from campus_store.analytics.views import (
     AnalyticsOverviewView,
     CommerceInsightsView,
     MetricViewSet,
+    PrometheusMetricsView,
+    QueryStatsView,
     UserStatsView,
     UserLogsView,
 )
-from campus_store.catalog.views import CategoryViewSet, InventoryLogViewSet, ProductViewSet
+from campus_store.catalog.images import HERO_IMAGE_DIR
+from campus_store.catalog.views import (
+    CategoryViewSet,
+    InventoryLogViewSet,
+    ProductImportJobViewSet,
+    ProductViewSet,
+    hero_rendition_view,
+)
 from campus_store.commerce.views import OrderViewSet
 from campus_store.community.views import PostViewSet
-from campus_store.focus.views import FocusVideoViewSet
+from campus_store.focus.views import FocusVideoViewSet, feed_async
+from campus_store.media_views import media_view
+from campus_store.realtime.views import event_stream
 from campus_store.customization.views import WishRequestViewSet
+from campus_store.uploads.views import ChunkedUploadViewSet
 from campus_store.storefront.views import (
     StorefrontCategoryViewSet,
     StorefrontProductViewSet,
     StorefrontStoreViewSet,
+    product_list_async,
+    store_list_async,
 )
 from campus_store.wallet.views import (
     WalletConfigView,
@@ -52,25 +68,46 @@ router.register(r"accounts/addresses", AddressViewSet, basename="account-address
 router.register(r"catalog/categories", CategoryViewSet, basename="catalog-category")
 router.register(r"catalog/products", ProductViewSet, basename="catalog-product")
 router.register(r"catalog/inventory", InventoryLogViewSet, basename="catalog-inventory")
+router.register(r"catalog/imports", ProductImportJobViewSet, basename="catalog-import")
 router.register(r"commerce/orders", OrderViewSet, basename="commerce-order")
 router.register(r"customization/wishes", WishRequestViewSet, basename="customization-wish")
 router.register(r"analytics/metrics", MetricViewSet, basename="analytics-metric")
 router.register(r"community/posts", PostViewSet, basename="community-post")
 router.register(r"focus/videos", FocusVideoViewSet, basename="focus-video")
+router.register(r"uploads", ChunkedUploadViewSet, basename="chunked-upload")
 router.register(r"storefront/stores", StorefrontStoreViewSet, basename="storefront-store")
 router.register(r"storefront/products", StorefrontProductViewSet, basename="storefront-product")
 router.register(r"storefront/categories", StorefrontCategoryViewSet, basename="storefront-category")
 
-def health_view(request):
+def database_available() -> bool:
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError:
+        return False
+    return True
+
+
+async def health_view(request):
+    database_ok = await sync_to_async(database_available)()
     return JsonResponse(
         {
-            "status": "ok",
+            "status": "ok" if database_ok else "degraded",
+            "database": "ok" if database_ok else "unavailable",
             "version": "1.0.0",
             "timestamp": timezone.now().isoformat(),
-        }
+        },
+        status=200 if database_ok else 503,
     )
 
-urlpatterns = [
+# 异步版本需排在路由表之前，覆盖同一地址的同步视图
+async_urlpatterns = [
+    path("api/storefront/stores/", store_list_async, name="storefront-store-list-async"),
+    path("api/storefront/products/", product_list_async, name="storefront-product-list-async"),
+    path("api/focus/videos/feed/", feed_async, name="focus-video-feed-async"),
+]
+
+urlpatterns = (async_urlpatterns if settings.ASYNC_VIEWS else []) + [
     path("admin/", admin.site.urls),
     path("api/", include(router.urls)),
     path("api/health/", health_view, name="health"),
@@ -84,7 +121,10 @@ urlpatterns = [
     path("api/analytics/commerce-insights/", CommerceInsightsView.as_view(), name="analytics-commerce-insights"),
     path("api/analytics/user-stats/", UserStatsView.as_view(), name="analytics-user-stats"),
     path("api/analytics/user-logs/<int:user_id>/", UserLogsView.as_view(), name="analytics-user-logs"),
+    path("api/analytics/query-stats/", QueryStatsView.as_view(), name="analytics-query-stats"),
+    path("api/analytics/prometheus/", PrometheusMetricsView.as_view(), name="analytics-prometheus"),
     path("api/admin/terminal/", AdminTerminalView.as_view(), name="admin-terminal"),
+    path("api/realtime/events/", event_stream, name="realtime-events"),
     path("api/wallet/", WalletOverviewView.as_view(), name="wallet-overview"),
     path("api/wallet/pay/", WalletPayView.as_view(), name="wallet-pay"),
     path("api/wallet/refund/", WalletRefundView.as_view(), name="wallet-refund"),
@@ -93,4 +133,14 @@ urlpatterns = [
     path("api/wallet/vouchers/generate/", WalletVoucherGenerateView.as_view(), name="wallet-voucher-generate"),
     path("api/wallet/vouchers/", WalletVoucherListView.as_view(), name="wallet-voucher-list"),
     path("api/wallet/vouchers/redeem/", WalletVoucherRedeemView.as_view(), name="wallet-voucher-redeem"),
+    re_path(
+        rf"^{settings.MEDIA_URL.lstrip('/')}{HERO_IMAGE_DIR}/(?P<path>.+)$",
+        hero_rendition_view,
+        name="catalog-hero-rendition",
+    ),
+    re_path(
+        rf"^{settings.MEDIA_URL.lstrip('/')}(?P<directory>focus/videos|focus/renditions|community_media)/(?P<path>.+)$",
+        media_view,
+        name="media-stream",
+    ),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -20,11 +20,23 @@ export const catalogApi = {
   updateCategory: (id, payload) => unwrap(http.put(`catalog/categories/${id}/`, payload)),
   deleteCategory: (id) => unwrap(http.delete(`catalog/categories/${id}/`)),
   updateProduct: (id, payload) => unwrap(http.put(`catalog/products/${id}/`, payload)),
+  importProducts: (file, params = {}) => {
+    const formData = new FormData();
+    formData.append("file", file);
+    return unwrap(
+      http.post("catalog/products/bulk_import/", formData, {
+        params,
+        headers: { "Content-Type": "multipart/form-data" },
+      }),
+    );
+  },
+  importJob: (id) => unwrap(http.get(`catalog/imports/${id}/`)),
 };
 
 export const inventoryApi = {
   logs: () => unwrap(http.get("catalog/inventory/")),
   adjust: (payload) => unwrap(http.post("catalog/inventory/", payload)),
+  bulkAdjust: (payload) => unwrap(http.post("catalog/inventory/bulk_adjust/", payload)),
 };
 
 export const orderApi = {
@@ -52,23 +64,78 @@ export const addressApi = {
 };
 
 export const customizationApi = {
-  list: () => unwrap(http.get("customization/wishes/")),
+  list: (params = {}) => unwrap(http.get("customization/wishes/", { params })),
+  open: (params = {}) => unwrap(http.get("customization/wishes/open/", { params })),
+  timeline: (id, params = {}) => unwrap(http.get(`customization/wishes/${id}/timeline/`, { params })),
   create: (payload) => unwrap(http.post("customization/wishes/", payload)),
   addTimeline: (id, payload) => unwrap(http.post(`customization/wishes/${id}/timeline/`, payload)),
   assign: (id) => unwrap(http.post(`customization/wishes/${id}/assign/`)),
+  claim: (ids) => unwrap(http.post("customization/wishes/claim/", { ids })),
 };
 
 export const analyticsApi = {
   overview: () => unwrap(http.get("analytics/overview/")),
-  metrics: () => unwrap(http.get("analytics/metrics/")),
+  metrics: (params = {}) => unwrap(http.get("analytics/metrics/", { params })),
   commerceInsights: () => unwrap(http.get("analytics/commerce-insights/")),
   userStats: () => unwrap(http.get("analytics/user-stats/")),
   userLogs: (userId) => unwrap(http.get(`analytics/user-logs/${userId}/`)),
 };
 
+const sha256Hex = async (blob) => {
+  if (!globalThis.crypto?.subtle) return "";
+  const digest = await crypto.subtle.digest("SHA-256", await blob.arrayBuffer());
+  return Array.from(new Uint8Array(digest), (byte) => byte.toString(16).padStart(2, "0")).join("");
+};
+
+export const uploadsApi = {
+  init: (payload) => unwrap(http.post("uploads/", payload)),
+  detail: (id) => unwrap(http.get(`uploads/${id}/`)),
+  chunk: (id, offset, blob, headers = {}) =>
+    unwrap(
+      http.put(`uploads/${id}/chunk/`, blob, {
+        params: { offset },
+        headers: { "Content-Type": "application/octet-stream", ...headers },
+      }),
+    ),
+  complete: (id, formData) =>
+    unwrap(
+      http.post(`uploads/${id}/complete/`, formData, {
+        headers: formData ? { "Content-Type": "multipart/form-data" } : {},
+      }),
+    ),
+  abort: (id) => unwrap(http.delete(`uploads/${id}/`)),
+  // 分片上传：每片附带 SHA-256，失败时按服务端已接收的偏移续传
+  upload: async (file, meta, { onProgress, completeForm, maxRetries = 3 } = {}) => {
+    const upload = await uploadsApi.init({
+      ...meta,
+      filename: file.name,
+      content_type: file.type || "application/octet-stream",
+      total_size: file.size,
+    });
+    let offset = upload.received;
+    let retries = 0;
+    while (offset < file.size) {
+      const chunk = file.slice(offset, offset + upload.chunk_size);
+      const digest = await sha256Hex(chunk);
+      try {
+        const res = await uploadsApi.chunk(upload.id, offset, chunk, digest ? { "X-Chunk-SHA256": digest } : {});
+        offset = res.received;
+        retries = 0;
+        onProgress?.(offset / file.size);
+      } catch (err) {
+        retries += 1;
+        if (retries > maxRetries) throw err;
+        const received = err?.response?.data?.received;
+        offset = received ?? (await uploadsApi.detail(upload.id)).received;
+      }
+    }
+    return uploadsApi.complete(upload.id, completeForm);
+  },
+};
+
 export const communityApi = {
-  posts: () => unwrap(http.get("community/posts/")),
-  createPost: (payload) => {
+  posts: (params = {}) => unwrap(http.get("community/posts/", { params })),
+  createPost: async (payload) => {
     const sendFormData = (formData) =>
       unwrap(
         http.post("community/posts/", formData, {
@@ -80,49 +147,39 @@ export const communityApi = {
       return sendFormData(payload);
     }
 
-    const mediaFiles = payload?.media_files || payload?.attachments || [];
-    const hasFiles = Array.isArray(mediaFiles) && mediaFiles.length > 0;
-
-    if (hasFiles) {
-      const formData = new FormData();
-      formData.append("title", payload.title || "");
-      formData.append("content", payload.content || "");
-      formData.append("visibility", payload.visibility || "PUBLIC");
-      mediaFiles.forEach((file) => {
-        if (file) {
-          formData.append("media_files", file);
-        }
-      });
-      return sendFormData(formData);
+    const { media_files, attachments, ...fields } = payload || {};
+    const mediaFiles = (media_files || attachments || []).filter(Boolean);
+    const post = await unwrap(http.post("community/posts/", fields));
+    for (const file of mediaFiles) {
+      await uploadsApi.upload(file, { target: "POST_MEDIA", post: post.id });
     }
-
-    return unwrap(http.post("community/posts/", payload));
+    return mediaFiles.length ? communityApi.post(post.id) : post;
   },
+  post: (id) => unwrap(http.get(`community/posts/${id}/`)),
+  comments: (id, params = {}) => unwrap(http.get(`community/posts/${id}/comments/`, { params })),
   comment: (id, payload) => unwrap(http.post(`community/posts/${id}/comment/`, payload)),
   react: (id, payload) => unwrap(http.post(`community/posts/${id}/react/`, payload)),
 };
 
 export const focusApi = {
   videos: (params = {}) => unwrap(http.get("focus/videos/", { params })),
-  upload: ({ title, description, video_file, cover_file }) => {
-    const formData = new FormData();
-    formData.append("title", title);
-    if (description) {
-      formData.append("description", description);
-    }
-    formData.append("video_file", video_file);
+  feed: (params = {}) => unwrap(http.get("focus/videos/feed/", { params })),
+  upload: async ({ title, description, video_file, cover_file }, onProgress) => {
+    let completeForm;
     if (cover_file) {
-      formData.append("cover_file", cover_file);
+      completeForm = new FormData();
+      completeForm.append("cover_file", cover_file);
     }
-    return unwrap(
-      http.post("focus/videos/", formData, {
-        headers: { "Content-Type": "multipart/form-data" },
-      }),
+    const { result } = await uploadsApi.upload(
+      video_file,
+      { target: "FOCUS_VIDEO", title, description: description || "" },
+      { onProgress, completeForm },
     );
+    return result;
   },
   remove: (id) => unwrap(http.delete(`focus/videos/${id}/`)),
   like: (id) => unwrap(http.post(`focus/videos/${id}/like/`)),
-  comments: (id) => unwrap(http.get(`focus/videos/${id}/comments/`)),
+  comments: (id, params = {}) => unwrap(http.get(`focus/videos/${id}/comments/`, { params })),
   addComment: (id, payload) => unwrap(http.post(`focus/videos/${id}/comments/`, payload)),
   deactivate: (id) => unwrap(http.post(`focus/videos/${id}/deactivate/`)),
   restore: (id) => unwrap(http.post(`focus/videos/${id}/restore/`)),
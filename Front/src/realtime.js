@@ -0,0 +1,53 @@
+import { API_BASE_URL } from "./api/http";
+
+// 所有页面共用一条 SSE 连接：有订阅时建立，最后一个订阅取消后关闭
+const handlers = new Set();
+let source = null;
+let connectedOnce = false;
+
+const EVENT_TYPES = [
+  "order.created",
+  "order.status",
+  "refund.requested",
+  "refund.approved",
+  "refund.rejected",
+  "wish.claimed",
+  "wish.timeline",
+  "resync",
+];
+
+const emit = (type, data) => {
+  handlers.forEach((handler) => handler(type, data));
+};
+
+const connect = () => {
+  const token = localStorage.getItem("sessionToken");
+  if (source || !token || typeof EventSource === "undefined") return;
+  // 令牌不放进查询串（会进访问日志），依靠登录时写入的 HttpOnly Cookie
+  source = new EventSource(new URL("realtime/events/", API_BASE_URL), { withCredentials: true });
+  // 重连后可能错过了断线期间的事件，通知页面整体刷新一次
+  source.addEventListener("ready", () => {
+    if (connectedOnce) emit("resync", {});
+    connectedOnce = true;
+  });
+  EVENT_TYPES.forEach((type) => {
+    source.addEventListener(type, (event) => emit(type, JSON.parse(event.data || "{}")));
+  });
+};
+
+const disconnect = () => {
+  if (source) {
+    source.close();
+    source = null;
+  }
+  connectedOnce = false;
+};
+
+export const subscribe = (handler) => {
+  handlers.add(handler);
+  connect();
+  return () => {
+    handlers.delete(handler);
+    if (!handlers.size) disconnect();
+  };
+};